@@ -0,0 +1,94 @@
+"""
+Benchmark for the compact response format of listings and searches.
+
+Creates a directory of many files and serializes ``list_directory_with_sizes``
+and ``search_files`` responses the way the server does, in the full format
+(pretty-printed ``FileInfo`` objects) and in the compact format with the
+default columns and with only ``name``/``path``. Reports the time per call
+and the size of the JSON text sent to the client.
+
+Usage:
+    python benchmarks/bench_compact.py [--files 20000] [--repeat 3]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.mcp.controller import McpFilesystemController  # noqa: E402
+
+
+def make_files(root: str, files: int) -> None:
+    for i in range(files):
+        with open(os.path.join(root, f"file-{i:06d}.txt"), "wb") as file:
+            file.write(b"x" * (i % 512))
+
+
+def render(result: Dict[str, Any]) -> str:
+    """Response text for a tool result, as the server's call_tool handler."""
+    return result["content"]
+
+
+def measure(
+    controller: McpFilesystemController, tool: str, args: Dict[str, Any], repeat: int
+) -> Tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = render(controller.execute_tool(tool, args))
+        best = min(best, time.perf_counter() - started)
+        size = len(text.encode("utf-8"))
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default=None, help="Directory to work in.")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-", dir=args.dir)
+    try:
+        make_files(root, args.files)
+        controller = McpFilesystemController([root])
+        listing = {"path": root}
+        search = {"path": root, "pattern": "*.txt"}
+        variants: List[Tuple[str, str, Dict[str, Any]]] = [
+            ("list full", "list_directory_with_sizes", listing),
+            (
+                "list compact",
+                "list_directory_with_sizes",
+                {**listing, "format": "compact"},
+            ),
+            (
+                "list compact name",
+                "list_directory_with_sizes",
+                {**listing, "format": "compact", "fields": ["name"]},
+            ),
+            ("search full", "search_files", search),
+            ("search compact", "search_files", {**search, "format": "compact"}),
+            (
+                "search compact path",
+                "search_files",
+                {**search, "format": "compact", "fields": ["path"]},
+            ),
+        ]
+        print(f"{args.files} files in {root}")
+        print(f"{'variant':<24}{'seconds':>10}{'bytes':>14}")
+        for name, tool, tool_args in variants:
+            seconds, size = measure(controller, tool, tool_args, args.repeat)
+            print(f"{name:<24}{seconds:>10.3f}{size:>14,}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark for copy_file on a tree of files.
+
+Compares the round trip agents used before copy_file existed (read each file
+and write it back, which is what read_text_file + write_file amount to,
+minus the JSON transport), ``shutil.copytree`` and ``FilesystemStorage
+.copy_file``, which reflinks or copies in the kernel with a worker pool.
+
+Usage:
+    python benchmarks/bench_copy.py [--files 2000] [--size 65536] [--workers 8]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage  # noqa: E402
+
+
+def make_tree(root: str, files: int, size: int) -> None:
+    for i in range(files):
+        directory = os.path.join(root, f"dir-{i % 32:02d}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file-{i:05d}.bin"), "wb") as file:
+            file.write(os.urandom(size))
+
+
+def round_trip(source: str, destination: str) -> None:
+    for directory, _, names in os.walk(source):
+        target = os.path.join(destination, os.path.relpath(directory, source))
+        os.makedirs(target, exist_ok=True)
+        for name in names:
+            with open(os.path.join(directory, name), "rb") as file:
+                data = file.read()
+            with open(os.path.join(target, name), "wb") as file:
+                file.write(data)
+
+
+def timed(copy: Callable[[str, str], object], source: str, destination: str) -> float:
+    started = time.perf_counter()
+    copy(source, destination)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=65536)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--dir", default=None, help="Directory to copy in.")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-", dir=args.dir)
+    try:
+        source = os.path.join(root, "source")
+        make_tree(source, args.files, args.size)
+        storage = FilesystemStorage([root], copy_workers=args.workers)
+        total = args.files * args.size / 1e6
+        print(f"{args.files} files of {args.size} bytes ({total:.0f} MB) in {root}")
+        print(f"{'variant':<24}{'seconds':>10}{'MB/s':>10}")
+        for name, copy in (
+            ("read + write", round_trip),
+            ("shutil.copytree", shutil.copytree),
+            ("copy_file", storage.copy_file),
+        ):
+            elapsed = timed(copy, source, os.path.join(root, name.replace(" ", "")))
+            print(f"{name:<24}{elapsed:>10.3f}{total / elapsed:>10.0f}")
+        print(f"copy_file methods: {storage._copier.counts}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
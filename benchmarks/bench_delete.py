@@ -0,0 +1,90 @@
+"""
+Benchmark for recursive delete and cross-device move.
+
+Builds a build-output-like tree (many small files in nested directories)
+and deletes it with ``shutil.rmtree`` and with ``remove_tree`` at several
+worker counts. With ``--other-dir`` on a different filesystem it also moves
+the tree there with ``shutil.move`` and with ``FilesystemStorage.move_file``.
+
+Usage:
+    python benchmarks/bench_delete.py [--dirs 200] [--files 100] \
+        [--other-dir /dev/shm]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage  # noqa: E402
+from mcp_filesystem.storage.removal import remove_tree  # noqa: E402
+
+
+def make_tree(root: str, dirs: int, files: int) -> None:
+    for i in range(dirs):
+        directory = os.path.join(root, f"pkg-{i % 16:02d}", f"module-{i:04d}")
+        os.makedirs(directory, exist_ok=True)
+        for j in range(files):
+            with open(os.path.join(directory, f"obj-{j:04d}.o"), "wb") as file:
+                file.write(b"\0" * 512)
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--dir", default=None, help="Directory to work in.")
+    parser.add_argument(
+        "--other-dir", default=None, help="Directory on another filesystem."
+    )
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-", dir=args.dir)
+    other = (
+        tempfile.mkdtemp(prefix="mcp-fs-bench-", dir=args.other_dir)
+        if args.other_dir
+        else None
+    )
+    tree = os.path.join(root, "tree")
+    try:
+        print(f"{args.dirs} directories of {args.files} files in {root}")
+        print(f"{'variant':<28}{'seconds':>10}")
+        variants = [("shutil.rmtree", shutil.rmtree)] + [
+            (
+                f"remove_tree ({workers} workers)",
+                lambda path, workers=workers: remove_tree(path, workers),
+            )
+            for workers in (1, 4, 8, 16)
+        ]
+        for name, delete in variants:
+            make_tree(tree, args.dirs, args.files)
+            print(f"{name:<28}{timed(lambda: delete(tree)):>10.3f}")
+        if other is not None:
+            storage = FilesystemStorage([root, other])
+            target = os.path.join(other, "tree")
+            for name, move in (
+                ("shutil.move", shutil.move),
+                ("move_file", storage.move_file),
+            ):
+                make_tree(tree, args.dirs, args.files)
+                print(f"{name:<28}{timed(lambda: move(tree, target)):>10.3f}")
+                shutil.rmtree(target)
+    finally:
+        shutil.rmtree(root)
+        if other is not None:
+            shutil.rmtree(other)
+
+
+if __name__ == "__main__":
+    main()
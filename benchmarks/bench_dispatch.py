@@ -0,0 +1,87 @@
+"""
+Microbenchmark for the per-call overhead of the tool dispatch layer.
+
+Times small tools (``get_file_info``, ``get_cache_stats``) through
+``McpFilesystemController.execute_tool``, including rendering the response
+text the way the server does, against the storage call alone, and times
+``get_tools`` (one ``list_tools`` request). It also times the JSON Schema
+validation the MCP low-level server can run on each call's arguments.
+
+Usage:
+    python benchmarks/bench_dispatch.py [--calls 20000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import jsonschema
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.mcp.controller import McpFilesystemController  # noqa: E402
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage  # noqa: E402
+
+
+def render(result: Dict[str, Any]) -> str:
+    """Response text for a tool result, as the server's call_tool handler."""
+    return result["content"]
+
+
+def per_call(action: Callable[[], object], calls: int) -> float:
+    """Best of three runs, in microseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(calls):
+            action()
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-")
+    try:
+        path = os.path.join(root, "file.txt")
+        with open(path, "w") as file:
+            file.write("hello\n")
+        storage = FilesystemStorage([root])
+        controller = McpFilesystemController([root], storage=storage)
+        info_args = {"path": path}
+        schema = next(
+            tool["input_schema"]
+            for tool in controller.get_tools()
+            if tool["name"] == "get_file_info"
+        )
+        variants = [
+            ("storage.get_file_info", lambda: storage.get_file_info(path)),
+            (
+                "execute_tool get_file_info",
+                lambda: render(controller.execute_tool("get_file_info", info_args)),
+            ),
+            ("storage.cache_stats", storage.cache_stats),
+            (
+                "execute_tool get_cache_stats",
+                lambda: render(controller.execute_tool("get_cache_stats", {})),
+            ),
+            ("get_tools", controller.get_tools),
+            ("jsonschema.validate", lambda: jsonschema.validate(info_args, schema)),
+        ]
+        print(f"{'variant':<32}{'us/call':>10}")
+        for name, action in variants:
+            calls = args.calls if name != "get_tools" else max(1, args.calls // 100)
+            print(f"{name:<32}{per_call(action, calls):>10.1f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
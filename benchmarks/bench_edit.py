@@ -0,0 +1,97 @@
+"""
+Benchmark for multi-edit edit_file on a large, repetitive file.
+
+Compares the previous implementation (one ``str.replace`` pass over the
+whole text per edit, then ``difflib.unified_diff`` of both versions for the
+preview) with the single-pass engine: ``plan_edits`` + ``apply_replacements``
+to build the result and ``preview_diff`` for the windowed preview.
+
+Usage:
+    python benchmarks/bench_edit.py [--lines 50000] [--edits 200]
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.storage.edits import (  # noqa: E402
+    apply_replacements,
+    plan_edits,
+    preview_diff,
+)
+
+
+def make_text(lines: int) -> str:
+    return "".join(
+        f"    value_{i} = compute(item, index={i % 97})  # repeated line\n"
+        for i in range(lines)
+    )
+
+
+def make_edits(lines: int, count: int) -> List[Dict[str, str]]:
+    step = max(1, lines // count)
+    return [
+        {"old_text": f"value_{i} = compute", "new_text": f"value_{i} = recompute"}
+        for i in range(0, lines, step)[:count]
+    ]
+
+
+def legacy_apply(text: str, edits: List[Dict[str, str]]) -> str:
+    for edit in edits:
+        if edit["old_text"] in text:
+            text = text.replace(edit["old_text"], edit["new_text"])
+    return text
+
+
+def legacy_preview(text: str, edits: List[Dict[str, str]]) -> str:
+    modified = legacy_apply(text, edits)
+    return "".join(
+        difflib.unified_diff(
+            text.splitlines(keepends=True), modified.splitlines(keepends=True)
+        )
+    )
+
+
+def single_pass_apply(text: str, edits: List[Dict[str, str]]) -> str:
+    return apply_replacements(text, plan_edits(text, edits))
+
+
+def single_pass_preview(text: str, edits: List[Dict[str, str]]) -> str:
+    return preview_diff(text, plan_edits(text, edits))
+
+
+def timed(function: Callable[[str, List[Dict[str, str]]], str], *args) -> float:
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    text = make_text(args.lines)
+    edits = make_edits(args.lines, args.edits)
+    # "value_1 = compute" never matches inside "value_10 = compute": unique.
+    assert single_pass_apply(text, edits) == legacy_apply(text, edits)
+    print(f"{len(edits)} edits on {args.lines} lines ({len(text) / 1e6:.1f} MB)")
+    print(f"{'variant':<28}{'apply (s)':>12}{'preview (s)':>14}")
+    for name, apply, preview in (
+        ("str.replace + difflib", legacy_apply, legacy_preview),
+        ("single pass + windowed diff", single_pass_apply, single_pass_preview),
+    ):
+        print(
+            f"{name:<28}{timed(apply, text, edits):>12.3f}"
+            f"{timed(preview, text, edits):>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Syscall and latency benchmark for list_directory / search_files.
+
+Compares the previous implementation (``os.listdir`` + ``os.stat`` +
+``os.path.isdir`` per entry) with the ``os.scandir`` based storage, in full
+and names-only mode.
+
+When ``strace`` is installed every variant runs in a child process under
+``strace -f -c`` and the real stat/getdents counts are reported. Otherwise the
+``os`` functions are wrapped in-process and each call that reaches the kernel
+is counted.
+
+Usage:
+    python benchmarks/bench_listing_syscalls.py [--files 20000]
+"""
+
+import argparse
+import fnmatch
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.mcp.core.entities import FileInfo  # noqa: E402
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage  # noqa: E402
+
+STAT_SYSCALLS = {"stat", "lstat", "fstat", "newfstatat", "statx", "fstatat64"}
+DIR_SYSCALLS = {"getdents", "getdents64"}
+
+
+def legacy_list_directory(path: str) -> list:
+    entries = []
+    for name in os.listdir(path):
+        entry_path = os.path.join(path, name)
+        stats = os.stat(entry_path)
+        entries.append(
+            FileInfo(
+                path=entry_path,
+                name=name,
+                size=stats.st_size,
+                is_directory=os.path.isdir(entry_path),
+                created=stats.st_ctime,
+                modified=stats.st_mtime,
+                permissions=stat.filemode(stats.st_mode),
+            )
+        )
+    return sorted(entries, key=lambda x: (not x.is_directory, x.name.lower()))
+
+
+def legacy_search_files(path: str, pattern: str) -> list:
+    matches = []
+    for root, _, files in os.walk(path):
+        for file in files:
+            if fnmatch.fnmatch(file, pattern):
+                file_path = os.path.join(root, file)
+                stats = os.stat(file_path)
+                matches.append(
+                    FileInfo(
+                        path=file_path,
+                        name=file,
+                        size=stats.st_size,
+                        is_directory=os.path.isdir(file_path),
+                        created=stats.st_ctime,
+                        modified=stats.st_mtime,
+                        permissions=stat.filemode(stats.st_mode),
+                    )
+                )
+    return matches
+
+
+def variants(root: str) -> Dict[str, Callable[[], object]]:
+    storage = FilesystemStorage([root])
+    flat = os.path.join(root, "flat")
+    return {
+        "list (legacy)": lambda: legacy_list_directory(flat),
+        "list (scandir)": lambda: storage.list_directory(flat),
+        "list (names only)": lambda: storage.list_directory(flat, names_only=True),
+        "search (legacy)": lambda: legacy_search_files(root, "*.py"),
+        "search (scandir)": lambda: storage.search_files(root, "*.py", True),
+        "search (names only)": lambda: storage.search_files(
+            root, "*.py", True, names_only=True
+        ),
+    }
+
+
+def make_tree(root: str, files: int) -> None:
+    flat = os.path.join(root, "flat")
+    os.makedirs(flat)
+    for i in range(files):
+        with open(os.path.join(flat, f"file_{i}.py"), "w") as f:
+            f.write("x")
+    for d in range(files // 100):
+        os.makedirs(os.path.join(flat, f"dir_{d}"))
+
+
+class _CountingEntry:
+    """DirEntry proxy counting the calls that need a syscall."""
+
+    def __init__(self, entry: os.DirEntry, counts: Counter):
+        self._entry = entry
+        self._counts = counts
+        self._stat_called = False
+        self.name = entry.name
+        self.path = entry.path
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        if not self._stat_called:
+            self._counts["stat"] += 1
+            self._stat_called = True
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self._entry.is_symlink():
+            self._counts["stat"] += 1
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self._entry.is_symlink():
+            self._counts["stat"] += 1
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+
+class _CountingScandir:
+    def __init__(self, it, counts: Counter):
+        self._it = it
+        self._counts = counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def __iter__(self):
+        for entry in self._it:
+            yield _CountingEntry(entry, self._counts)
+
+    def __next__(self):
+        return _CountingEntry(next(self._it), self._counts)
+
+    def close(self):
+        self._it.close()
+
+
+def count_in_process(func: Callable[[], object]) -> Counter:
+    counts: Counter = Counter()
+    originals = (os.stat, os.listdir, os.scandir, os.path.isdir)
+
+    def counting_stat(*args, **kwargs):
+        counts["stat"] += 1
+        return originals[0](*args, **kwargs)
+
+    def counting_listdir(*args, **kwargs):
+        counts["getdents"] += 1
+        return originals[1](*args, **kwargs)
+
+    def counting_scandir(*args, **kwargs):
+        counts["getdents"] += 1
+        return _CountingScandir(originals[2](*args, **kwargs), counts)
+
+    def counting_isdir(path):
+        counts["stat"] += 1
+        try:
+            return stat.S_ISDIR(originals[0](path).st_mode)
+        except OSError:
+            return False
+
+    os.stat, os.listdir, os.scandir, os.path.isdir = (
+        counting_stat,
+        counting_listdir,
+        counting_scandir,
+        counting_isdir,
+    )
+    try:
+        func()
+    finally:
+        os.stat, os.listdir, os.scandir, os.path.isdir = originals
+    return counts
+
+
+def count_with_strace(root: str, name: str) -> Counter:
+    """Count syscalls of one variant in a child process; ``""`` runs nothing."""
+    code = (
+        "import sys; sys.path.insert(0, %r); "
+        "import bench_listing_syscalls as b; v = b.variants(%r); "
+        "v[%r]() if %r else None"
+        % (os.path.dirname(os.path.abspath(__file__)), root, name, name)
+    )
+    out = subprocess.run(
+        ["strace", "-f", "-c", "-o", "/dev/stderr", sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    counts: Counter = Counter()
+    for line in out.splitlines():
+        fields = line.split()
+        if len(fields) >= 5 and fields[-1] in STAT_SYSCALLS | DIR_SYSCALLS:
+            calls = int(fields[3])
+            counts["stat" if fields[-1] in STAT_SYSCALLS else "getdents"] += calls
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20000)
+    args = parser.parse_args()
+
+    use_strace = shutil.which("strace") is not None
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-")
+    try:
+        make_tree(root, args.files)
+        # Interpreter start-up and imports, subtracted from each strace row.
+        baseline = count_with_strace(root, "") if use_strace else Counter()
+        print(
+            f"{args.files} files, syscalls counted via "
+            f"{'strace' if use_strace else 'instrumented os wrappers'}"
+        )
+        print(f"{'variant':<22}{'stat':>10}{'getdents':>10}{'seconds':>10}")
+        for name, func in variants(root).items():
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            if use_strace:
+                counts = count_with_strace(root, name)
+                counts.subtract(baseline)
+            else:
+                counts = count_in_process(func)
+            print(
+                f"{name:<22}{counts['stat']:>10}{counts['getdents']:>10}"
+                f"{elapsed:>10.3f}"
+            )
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
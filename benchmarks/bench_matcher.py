@@ -0,0 +1,86 @@
+"""
+Microbenchmark for the compiled pattern matcher.
+
+Compares the previous approach (``fnmatch.fnmatch`` called per name and per
+pattern, as ``match_patterns`` and ``search_files`` used to do) with
+``PatternMatcher`` on the same synthetic list of relative paths, and checks
+that both agree on every name-only pattern set.
+
+Usage:
+    python benchmarks/bench_matcher.py [--names 200000]
+"""
+
+import argparse
+import fnmatch
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.utils.matcher import compile_patterns  # noqa: E402
+
+PATTERN_SETS = {
+    "suffix": ["*.py"],
+    "suffixes": ["*.py", "*.pyi", "*.md", "*.toml"],
+    "literals": [".git", "node_modules", ".venv", "__pycache__", "dist"],
+    "mixed": ["test_*.py", "*.md", "[Mm]akefile", "*.c?"],
+    "path": ["src/**/*.py"],
+    "regex": [r"re:^test_\w+\.py$"],
+}
+
+EXTENSIONS = ["py", "pyi", "md", "toml", "txt", "cc", "ch", "json", "js"]
+STEMS = ["main", "test_api", "Makefile", "makefile", "utils", "node_modules", ".git"]
+
+
+def make_paths(count: int) -> List[str]:
+    rng = random.Random(42)
+    paths = []
+    for i in range(count):
+        depth = rng.randint(0, 4)
+        dirs = [rng.choice(["src", "lib", "pkg", "docs"]) for _ in range(depth)]
+        stem = rng.choice(STEMS)
+        name = stem if rng.random() < 0.1 else f"{stem}{i}.{rng.choice(EXTENSIONS)}"
+        paths.append("/".join(dirs + [name]))
+    return paths
+
+
+def legacy(patterns: List[str]) -> Callable[[str, str], bool]:
+    def match(name: str, path: str) -> bool:
+        for pattern in patterns:
+            if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern):
+                return True
+        return False
+
+    return match
+
+
+def timed(func: Callable[[str, str], bool], items: List[tuple]) -> tuple:
+    started = time.perf_counter()
+    hits = [func(name, path) for name, path in items]
+    return time.perf_counter() - started, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--names", type=int, default=200000)
+    args = parser.parse_args()
+
+    items = [(p.rsplit("/", 1)[-1], p) for p in make_paths(args.names)]
+    print(f"{args.names} paths")
+    print(f"{'patterns':<12}{'fnmatch s':>12}{'compiled s':>12}{'speedup':>10}")
+    for label, patterns in PATTERN_SETS.items():
+        old_elapsed, old_hits = timed(legacy(patterns), items)
+        new_elapsed, new_hits = timed(compile_patterns(patterns), items)
+        if label not in ("path", "regex") and old_hits != new_hits:
+            raise SystemExit(f"results differ for {label!r}")
+        print(
+            f"{label:<12}{old_elapsed:>12.3f}{new_elapsed:>12.3f}"
+            f"{old_elapsed / new_elapsed:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Latency and peak-memory benchmark for read_text_file(tail=N).
+
+Writes a synthetic log (2 GiB by default) and reads its last lines with the
+previous implementation (``readlines()`` on the whole file) and with the
+backward block reader. Each variant runs in a fresh child process so its
+peak RSS can be reported on its own.
+
+The legacy variant holds the whole file in memory; it is skipped for files
+larger than ``--legacy-max-mb``.
+
+Usage:
+    python benchmarks/bench_tail.py [--size-mb 2048] [--lines 100]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.storage.readers import read_tail_lines  # noqa: E402
+
+LOG_LINE = "2024-01-01T00:00:00.000Z INFO  request id=%08d status=200 took=12ms ü\n"
+
+
+def legacy_tail(path: str, lines: int) -> str:
+    with open(path, "r", encoding="utf-8") as file:
+        return "".join(file.readlines()[-lines:])
+
+
+def make_log(path: str, size_mb: int) -> None:
+    block = "".join(LOG_LINE % i for i in range(10000)).encode("utf-8")
+    target = size_mb * 1024 * 1024
+    with open(path, "wb") as file:
+        written = 0
+        while written < target:
+            file.write(block)
+            written += len(block)
+
+
+def _child(func: Callable[[str, int], str], path: str, lines: int, queue) -> None:
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    result = func(path, lines)
+    elapsed = time.perf_counter() - started
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak_rss - base_rss) / 1024, len(result)))
+
+
+def run_isolated(
+    func: Callable[[str, int], str], path: str, lines: int
+) -> Tuple[float, float, int]:
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(func, path, lines, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--legacy-max-mb", type=int, default=512)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-")
+    path = os.path.join(root, "service.log")
+    try:
+        make_log(path, args.size_mb)
+        variants: Dict[str, Callable[[str, int], str]] = {
+            "tail (backward blocks)": read_tail_lines
+        }
+        if args.size_mb <= args.legacy_max_mb:
+            variants["tail (readlines)"] = legacy_tail
+        print(f"{os.path.getsize(path)} byte log, last {args.lines} lines")
+        print(f"{'variant':<26}{'seconds':>10}{'peak MiB':>10}{'chars':>10}")
+        for name, func in variants.items():
+            elapsed, peak_mib, chars = run_isolated(func, path, args.lines)
+            print(f"{name:<26}{elapsed:>10.4f}{peak_mib:>10.1f}{chars:>10}")
+        if args.size_mb > args.legacy_max_mb:
+            print(
+                f"tail (readlines) skipped: file exceeds --legacy-max-mb "
+                f"{args.legacy_max_mb}"
+            )
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark for recursive disk usage.
+
+Builds a tree of nested directories and measures how long it takes to find
+the recursive size of every top-level directory: once the way a client
+without ``directory_tree`` has to, calling ``list_directory_with_sizes`` on
+every directory, once with ``os.walk`` plus ``lstat`` (like ``du``), and
+with ``directory_tree`` at several worker counts.
+
+Usage:
+    python benchmarks/bench_tree.py [--dirs 500] [--files 40]
+"""
+
+import argparse
+import functools
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage  # noqa: E402
+
+
+def make_tree(root: str, dirs: int, files: int) -> None:
+    for i in range(dirs):
+        directory = os.path.join(
+            root, f"pkg-{i % 16:02d}", f"group-{i % 5}", f"module-{i:04d}"
+        )
+        os.makedirs(directory, exist_ok=True)
+        for j in range(files):
+            with open(os.path.join(directory, f"file-{j:04d}.dat"), "wb") as file:
+                file.write(b"\0" * (j * 37 % 4096))
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def listing_calls(storage: FilesystemStorage, path: str) -> int:
+    """Recursive size by one list_directory_with_sizes call per directory."""
+    total = 0
+    for info in storage.list_directory_with_sizes(path).entries:
+        if info.is_directory:
+            total += listing_calls(storage, info.path)
+        else:
+            total += info.size or 0
+    return total
+
+
+def walk(path: str) -> int:
+    total = 0
+    for directory, _, names in os.walk(path):
+        for name in names:
+            total += os.lstat(os.path.join(directory, name)).st_size
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dirs", type=int, default=500)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--dir", default=None, help="Directory to work in.")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-", dir=args.dir)
+    try:
+        make_tree(root, args.dirs, args.files)
+        storage = FilesystemStorage([root])
+        print(f"{args.dirs} directories of {args.files} files in {root}")
+        print(f"{'variant':<32}{'seconds':>10}")
+        variants: List[Tuple[str, Callable[[], object]]] = [
+            ("list_directory_with_sizes", lambda: listing_calls(storage, root)),
+            ("os.walk + lstat", lambda: walk(root)),
+        ]
+        for workers in (1, 4, 8, 16):
+            tree_storage = FilesystemStorage([root], read_workers=workers)
+            variants.append(
+                (
+                    f"directory_tree ({workers} workers)",
+                    functools.partial(tree_storage.directory_tree, root),
+                )
+            )
+        for name, action in variants:
+            print(f"{name:<32}{timed(action):>10.3f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
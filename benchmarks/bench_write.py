@@ -0,0 +1,79 @@
+"""
+Throughput benchmark for write_file per durability level.
+
+Several threads rewrite small files through the previous implementation
+(``open(path, "w")``) and through ``AtomicWriter`` at each durability level.
+For the synced levels it also reports how many group commits were needed,
+i.e. how many writes shared one flush on average.
+
+Usage:
+    python benchmarks/bench_write.py [--writes 2000] [--threads 8] [--size 4096]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_filesystem.storage.writer import AtomicWriter, Durability  # noqa: E402
+
+
+def legacy_write(path: str, data: bytes) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(data.decode("utf-8"))
+
+
+def run(
+    write: Callable[[str, bytes], None],
+    root: str,
+    writes: int,
+    threads: int,
+    data: bytes,
+) -> float:
+    paths = [os.path.join(root, f"file-{i % 256:03d}.txt") for i in range(writes)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda path: write(path, data), paths))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--dir", default=None, help="Directory to write in.")
+    args = parser.parse_args()
+
+    data = b"x" * (args.size - 1) + b"\n"
+    root = tempfile.mkdtemp(prefix="mcp-fs-bench-", dir=args.dir)
+    try:
+        print(
+            f"{args.writes} writes of {args.size} bytes, {args.threads} threads, "
+            f"in {root}"
+        )
+        print(f"{'variant':<22}{'seconds':>10}{'writes/s':>12}{'per flush':>11}")
+        elapsed = run(legacy_write, root, args.writes, args.threads, data)
+        rate = args.writes / elapsed
+        print(f"{'open(w) (legacy)':<22}{elapsed:>10.3f}{rate:>12.0f}{'-':>11}")
+        for durability in Durability:
+            writer = AtomicWriter(durability)
+            elapsed = run(writer.write, root, args.writes, args.threads, data)
+            shared = (
+                f"{writer.grouped_writes / writer.groups:.1f}" if writer.groups else "-"
+            )
+            name = f"atomic ({durability.value})"
+            rate = args.writes / elapsed
+            print(f"{name:<22}{elapsed:>10.3f}{rate:>12.0f}{shared:>11}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,25 @@
 import asyncio
 import os
+import time
 from typing import List
 
 import typer
 from typing_extensions import Annotated
 
+from mcp_filesystem.storage.index import FileIndex, default_index_path
+from mcp_filesystem.storage.media import DEFAULT_MAX_MEDIA_BYTES
+from mcp_filesystem.storage.trigram import TrigramIndex
+from mcp_filesystem.storage.writer import Durability
+
 app = typer.Typer(
     name="mcp-filesystem",
     help="MCP server for filesystem operations.",
     add_completion=False,
 )
+index_app = typer.Typer(help="Manage the persistent file-tree index.")
+app.add_typer(index_app, name="index")
+content_index_app = typer.Typer(help="Manage the trigram content-search index.")
+app.add_typer(content_index_app, name="content-index")
 
 
 @app.command()
@@ -21,6 +31,55 @@ def start(
     allowed_dirs: Annotated[
         List[str] | None, typer.Option(help="Allowed directories for operations.")
     ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            min=0, help="Worker threads for tool calls (0 runs them on the event loop)."
+        ),
+    ] = 8,
+    tool_concurrency: Annotated[
+        int, typer.Option(min=0, help="Max concurrent calls per tool (0 = unlimited).")
+    ] = 4,
+    max_pending: Annotated[
+        int,
+        typer.Option(
+            min=0, help="Max pending tool calls before rejecting (0 = unlimited)."
+        ),
+    ] = 64,
+    index: Annotated[
+        bool, typer.Option(help="Serve metadata queries from the file-tree index.")
+    ] = False,
+    index_path: Annotated[
+        str | None,
+        typer.Option(help="Index database location (implies --index)."),
+    ] = None,
+    watch: Annotated[
+        bool,
+        typer.Option(help="Watch allowed directories and invalidate cached metadata."),
+    ] = False,
+    content_index: Annotated[
+        bool, typer.Option(help="Narrow content searches with the trigram index.")
+    ] = False,
+    content_index_path: Annotated[
+        str | None,
+        typer.Option(help="Trigram index location (implies --content-index)."),
+    ] = None,
+    max_media_bytes: Annotated[
+        int, typer.Option(min=1, help="Largest file read_media_file will encode.")
+    ] = DEFAULT_MAX_MEDIA_BYTES,
+    read_cache: Annotated[
+        bool, typer.Option(help="Cache file reads in memory (LRU, mtime-validated).")
+    ] = False,
+    read_cache_mb: Annotated[
+        int, typer.Option(min=1, help="Memory budget of the read cache in MiB.")
+    ] = 64,
+    durability: Annotated[
+        Durability,
+        typer.Option(
+            case_sensitive=False,
+            help="What writes flush: none, data (fdatasync) or full (fsync + dir).",
+        ),
+    ] = Durability.NONE,
 ) -> None:
     """
     Starts the MCP server.
@@ -44,11 +103,36 @@ def start(
 
     print("Starting mcp-filesystem server on stdio (host/port args ignored for MCP)")
     print(f"Allowed directories: {allowed_dirs}")
+    print(f"Tool workers: {workers or 'inline'}")
+    print(f"Write durability: {durability.value}")
+    if index or index_path:
+        index_path = index_path or default_index_path(allowed_dirs)
+        print(f"File-tree index: {index_path}")
+    if content_index or content_index_path:
+        content_index_path = content_index_path or default_index_path(
+            allowed_dirs, "trigram"
+        )
+        print(f"Content index: {content_index_path}")
+    if read_cache:
+        print(f"Read cache: {read_cache_mb} MiB")
 
     try:
         from mcp_filesystem.mcp.server import start_server
 
-        asyncio.run(start_server(allowed_dirs))
+        asyncio.run(
+            start_server(
+                allowed_dirs,
+                workers=workers,
+                tool_concurrency=tool_concurrency or None,
+                max_pending=max_pending or None,
+                index_path=index_path,
+                watch=watch,
+                content_index_path=content_index_path,
+                max_media_bytes=max_media_bytes,
+                read_cache_bytes=read_cache_mb * 1024 * 1024 if read_cache else 0,
+                durability=durability,
+            )
+        )
     except ImportError as e:
         print(f"Error importing MCP server: {e}")
         print("Make sure 'mcp' dependency is installed: poetry install")
@@ -86,6 +170,140 @@ def validate_dirs(
         print("\n✓ All directories are valid.")
 
 
+@index_app.command("build")
+def index_build(
+    allowed_dirs: Annotated[
+        List[str] | None, typer.Option(help="Directories to index.")
+    ] = None,
+    index_path: Annotated[
+        str | None, typer.Option(help="Index database location.")
+    ] = None,
+    full: Annotated[
+        bool, typer.Option(help="Rescan every directory, ignoring stored mtimes.")
+    ] = False,
+) -> None:
+    """
+    Builds or incrementally refreshes the file-tree index.
+    """
+    allowed_dirs = allowed_dirs or [os.getcwd()]
+    file_index = FileIndex(index_path or default_index_path(allowed_dirs), allowed_dirs)
+    try:
+        print(f"Indexing {file_index.roots} into {file_index.db_path}...")
+        counters = file_index.build(full=full)
+        print(
+            f"✓ {counters['scanned_dirs']} directories scanned, "
+            f"{counters['reused_dirs']} unchanged, "
+            f"{counters['removed_dirs']} removed in {counters['seconds']}s"
+        )
+    finally:
+        file_index.close()
+
+
+@index_app.command("status")
+def index_status(
+    allowed_dirs: Annotated[
+        List[str] | None, typer.Option(help="Indexed directories.")
+    ] = None,
+    index_path: Annotated[
+        str | None, typer.Option(help="Index database location.")
+    ] = None,
+) -> None:
+    """
+    Shows what the file-tree index contains.
+    """
+    allowed_dirs = allowed_dirs or [os.getcwd()]
+    index_path = index_path or default_index_path(allowed_dirs)
+    if not os.path.exists(index_path):
+        print(f"✗ No index at {index_path}. Run 'mcp-filesystem index build'.")
+        raise typer.Exit(code=1)
+    file_index = FileIndex(index_path, allowed_dirs)
+    try:
+        status = file_index.status()
+    finally:
+        file_index.close()
+    built_at = (
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(status["built_at"]))
+        if status["built_at"]
+        else "never"
+    )
+    print(f"Index: {status['db_path']} ({status['db_bytes']} bytes)")
+    print(f"Roots: {status['roots']}")
+    print(f"Files: {status['files']}")
+    print(
+        f"Directories: {status['directories']} "
+        f"({status['scanned_directories']} scanned)"
+    )
+    print(f"Last build: {built_at}")
+
+
+@content_index_app.command("build")
+def content_index_build(
+    allowed_dirs: Annotated[
+        List[str] | None, typer.Option(help="Directories to index.")
+    ] = None,
+    index_path: Annotated[
+        str | None, typer.Option(help="Index database location.")
+    ] = None,
+    full: Annotated[
+        bool, typer.Option(help="Re-read every file, ignoring stored mtimes.")
+    ] = False,
+) -> None:
+    """
+    Builds or incrementally refreshes the trigram content index.
+    """
+    allowed_dirs = allowed_dirs or [os.getcwd()]
+    trigram_index = TrigramIndex(
+        index_path or default_index_path(allowed_dirs, "trigram"), allowed_dirs
+    )
+    try:
+        print(f"Indexing {trigram_index.roots} into {trigram_index.db_path}...")
+        counters = trigram_index.build(full=full)
+        print(
+            f"✓ {counters['indexed_files']} files indexed, "
+            f"{counters['reused_files']} unchanged, "
+            f"{counters['removed_files']} removed in {counters['seconds']}s"
+        )
+    finally:
+        trigram_index.close()
+
+
+@content_index_app.command("stats")
+def content_index_stats(
+    allowed_dirs: Annotated[
+        List[str] | None, typer.Option(help="Indexed directories.")
+    ] = None,
+    index_path: Annotated[
+        str | None, typer.Option(help="Index database location.")
+    ] = None,
+) -> None:
+    """
+    Shows what the trigram content index contains.
+    """
+    allowed_dirs = allowed_dirs or [os.getcwd()]
+    index_path = index_path or default_index_path(allowed_dirs, "trigram")
+    if not os.path.exists(index_path):
+        print(f"✗ No index at {index_path}. Run 'mcp-filesystem content-index build'.")
+        raise typer.Exit(code=1)
+    trigram_index = TrigramIndex(index_path, allowed_dirs)
+    try:
+        stats = trigram_index.stats()
+    finally:
+        trigram_index.close()
+    built_at = (
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stats["built_at"]))
+        if stats["built_at"]
+        else "never"
+    )
+    print(f"Index: {stats['db_path']} ({stats['db_bytes']} bytes)")
+    print(f"Roots: {stats['roots']}")
+    print(
+        f"Files: {stats['text_files']} text, {stats['binary_files']} binary, "
+        f"{stats['large_files']} too large to index"
+    )
+    print(f"Trigrams: {stats['trigrams']} distinct, {stats['postings']} postings")
+    print(f"Last build: {built_at}")
+
+
 @app.command()
 def version() -> None:
     """
@@ -1,11 +1,85 @@
+import functools
 import inspect
-import json
-from typing import Any, Callable, Dict, List, Mapping, Type, Union
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    get_type_hints,
+)
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
+from mcp_filesystem.mcp.core.entities import (
+    BatchArgs,
+    BatchItemResult,
+    BatchResult,
+    CompactDirectoryListing,
+    CompactSearchResult,
+    MediaFile,
+)
 from mcp_filesystem.services.filesystem_service import FilesystemService
 from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.storage import StorageInterface
+
+DEFAULT_BATCH_WORKERS = 8
+
+# Ferramentas que não alteram o sistema de arquivos; as demais são tratadas
+# como escrita ao ordenar as operações de um lote.
+READ_ONLY_TOOLS = frozenset(
+    {
+        "directory_tree",
+        "get_cache_stats",
+        "get_file_info",
+        "grep_files",
+        "list_directory",
+        "list_directory_with_sizes",
+        "open_file_stream",
+        "read_file_chunk",
+        "read_media_file",
+        "read_multiple_files",
+        "read_text_file",
+        "search_files",
+    }
+)
+PATH_FIELDS = ("path", "paths", "source", "destination")
+# Resultados serializados sem indentação.
+COMPACT_RESULTS = (CompactDirectoryListing, CompactSearchResult)
+
+
+class _Tool(NamedTuple):
+    """
+    Ferramenta preparada uma única vez, na inicialização do controlador.
+
+    Guarda o modelo que valida os argumentos, as informações anunciadas em
+    list_tools (com o esquema já gerado) e o serializador do tipo de retorno,
+    que gera o JSON diretamente, sem converter o resultado para dicionários.
+    """
+
+    method: Callable[..., Any]
+    model: Optional[Type[BaseModel]]
+    takes_args: bool
+    info: Dict[str, Any]
+    result: TypeAdapter
+
+
+class _BatchStep(NamedTuple):
+    """Operação de um lote, já validada e pronta para executar."""
+
+    position: int
+    tool: str
+    call: Callable[[], Any]
+    paths: Tuple[str, ...]
+    writes: bool
 
 
 class McpFilesystemController:
@@ -14,16 +88,30 @@ class McpFilesystemController:
     ferramentas do serviço de sistema de arquivos.
     """
 
-    def __init__(self, allowed_directories: List[str]):
+    def __init__(
+        self,
+        allowed_directories: List[str],
+        storage: Optional[StorageInterface] = None,
+        batch_workers: int = DEFAULT_BATCH_WORKERS,
+    ):
         """
         Inicializa o controlador, o storage e o serviço.
 
         Args:
             allowed_directories: Lista de diretórios onde operações são permitidas.
+            storage: Storage já configurado; por padrão um FilesystemStorage
+                sobre os diretórios permitidos.
+            batch_workers: Máximo de operações de um lote executadas em paralelo.
         """
-        storage = FilesystemStorage(allowed_directories=allowed_directories)
+        if storage is None:
+            storage = FilesystemStorage(allowed_directories=allowed_directories)
         self.filesystem_service = FilesystemService(storage=storage)
+        self.batch_workers = max(1, batch_workers)
         self.tools = self._discover_tools()
+        self._compiled = {
+            name: self._compile_tool(name, method)
+            for name, method in self.tools.items()
+        }
 
     def _discover_tools(self) -> Mapping[str, Callable[..., Any]]:
         """
@@ -38,49 +126,35 @@ class McpFilesystemController:
         ):
             if not name.startswith("_"):
                 tools[name] = method
+        tools["batch"] = self.batch
         return tools
 
-    def get_tools(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _compile_tool(name: str, method: Callable[..., Any]) -> _Tool:
         """
-        Obtém a lista de ferramentas disponíveis com seus esquemas de entrada.
-
-        Returns:
-            Uma lista de dicionários, cada um representando uma ferramenta.
+        Inspeciona um método de ferramenta e prepara sua validação, seu
+        esquema de entrada e a serialização do seu resultado.
         """
-        tool_list = []
-        for name, method in self.tools.items():
-            input_schema = self._get_input_schema(method)
-            tool_info = {
-                "name": name,
-                "description": inspect.getdoc(method) or "Sem descrição.",
-                "input_schema": input_schema,
-            }
-            tool_list.append(tool_info)
-        return tool_list
+        params = list(inspect.signature(method).parameters.values())
+        model: Optional[Type[BaseModel]] = params[0].annotation if params else None
+        if not inspect.isclass(model) or not issubclass(model, BaseModel):
+            model = None
+        info = {
+            "name": name,
+            "description": inspect.getdoc(method) or "Sem descrição.",
+            "input_schema": model.model_json_schema() if model else None,
+        }
+        return_type = get_type_hints(method).get("return", Any)
+        return _Tool(method, model, bool(params), info, TypeAdapter(return_type))
 
-    def _get_input_schema(
-        self, method: Callable[..., Any]
-    ) -> Union[Dict[str, Any], None]:
+    def get_tools(self) -> List[Dict[str, Any]]:
         """
-        Obtém o esquema de entrada para um método de ferramenta.
-
-        Args:
-            method: O método da ferramenta.
+        Obtém a lista de ferramentas disponíveis com seus esquemas de entrada.
 
         Returns:
-            O esquema de entrada Pydantic como um dicionário, ou None se não houver.
+            Uma lista de dicionários, cada um representando uma ferramenta.
         """
-        sig = inspect.signature(method)
-        if not sig.parameters:
-            return None
-
-        param = next(iter(sig.parameters.values()))
-        model: Type[BaseModel] = param.annotation
-
-        if not inspect.isclass(model) or not issubclass(model, BaseModel):
-            return None
-
-        return model.model_json_schema()
+        return [tool.info for tool in self._compiled.values()]
 
     def execute_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -93,55 +167,181 @@ class McpFilesystemController:
         Returns:
             Um dicionário contendo o resultado da execução ou um erro.
         """
-        if tool_name not in self.tools:
+        tool = self._compiled.get(tool_name)
+        if tool is None:
             return {"error": f"Ferramenta '{tool_name}' não encontrada."}
 
-        method = self.tools[tool_name]
-        sig = inspect.signature(method)
-
         try:
-            if not sig.parameters:
-                result = method()
-            else:
-                param = next(iter(sig.parameters.values()))
-                model: Type[BaseModel] = param.annotation
-
-                if not inspect.isclass(model) or not issubclass(model, BaseModel):
-                    result = method(**args)
-                else:
-                    validated_args = model(**args)
-                    result = method(validated_args)
-
-            if isinstance(result, str):
-                return {"content": result}
-            return {"result": self._serialize_result(result)}
-
+            call, _ = self._prepare_call(tool_name, args)
+            return self._wrap_result(tool, call())
         except ValidationError as e:
             return {"error": f"Erro de validação: {e}", "tool": tool_name}
         except Exception as e:
             return {"error": str(e), "tool": tool_name}
 
-    def _serialize_result(self, result: Any) -> Any:
+    def _prepare_call(
+        self, tool_name: str, args: Dict[str, Any]
+    ) -> Tuple[Callable[[], Any], Optional[BaseModel]]:
         """
-        Serializa o resultado da execução de uma ferramenta para um formato
-        compatível com JSON.
-
-        Args:
-            result: O resultado da execução da ferramenta.
+        Valida os argumentos de uma ferramenta sem executá-la.
 
         Returns:
-            O resultado serializado.
+            Uma função sem argumentos que executa a ferramenta e o modelo
+            Pydantic validado, se a ferramenta usar um.
+
+        Raises:
+            ValidationError: Se os argumentos forem inválidos.
+        """
+        tool = self._compiled[tool_name]
+        if tool.model is None:
+            if not tool.takes_args:
+                return tool.method, None
+            return functools.partial(tool.method, **args), None
+        validated_args = tool.model.model_validate(args)
+        return functools.partial(tool.method, validated_args), validated_args
+
+    @staticmethod
+    def _wrap_result(tool: _Tool, result: Any) -> Dict[str, Any]:
+        """
+        Empacota o resultado de uma ferramenta; modelos viram o texto JSON da
+        resposta, indentado exceto nos resultados compactos.
+        """
+        if isinstance(result, str):
+            return {"content": result}
+        if isinstance(result, MediaFile):
+            return {"media": result.model_dump()}
+        indent = None if isinstance(result, COMPACT_RESULTS) else 2
+        return {"content": tool.result.dump_json(result, indent=indent).decode()}
+
+    def batch(self, args: BatchArgs) -> BatchResult:
         """
-        if isinstance(result, (str, int, float, bool, type(None))):
-            return result
-        if isinstance(result, (list, tuple)):
-            return [self._serialize_result(item) for item in result]
-        if isinstance(result, dict):
-            return {key: self._serialize_result(value) for key, value in result.items()}
-        if isinstance(result, BaseModel):
-            return result.dict()
+        Executa várias operações do filesystem numa única chamada.
 
+        Todas as operações são validadas antes de qualquer execução. As que
+        usam caminhos sobrepostos, com ao menos uma alterando arquivos, rodam
+        na ordem do lote; as demais rodam em paralelo. Com stop_on_error,
+        nenhuma operação é iniciada depois da primeira falha.
+        """
+        steps: List[_BatchStep] = []
+        problems: List[str] = []
+        for index, item in enumerate(args.items):
+            if item.tool == "batch":
+                problems.append(f"item {index}: lotes não podem ser aninhados")
+                continue
+            if item.tool not in self.tools:
+                problems.append(
+                    f"item {index}: ferramenta '{item.tool}' não encontrada"
+                )
+                continue
+            try:
+                call, validated = self._prepare_call(item.tool, item.args)
+            except ValidationError as e:
+                problems.append(f"item {index} ({item.tool}): {e}")
+                continue
+            paths, writes = self._footprint(item.tool, validated)
+            steps.append(_BatchStep(index, item.tool, call, paths, writes))
+        if problems:
+            raise ValueError(
+                "Lote inválido, nenhuma operação foi executada:\n" + "\n".join(problems)
+            )
+        return self._run_batch(steps, args.stop_on_error)
+
+    @staticmethod
+    def _footprint(
+        tool_name: str, validated: Optional[BaseModel]
+    ) -> Tuple[Tuple[str, ...], bool]:
+        """Caminhos usados por uma operação e se ela altera o filesystem."""
+        paths: List[str] = []
+        for field in PATH_FIELDS:
+            value = getattr(validated, field, None)
+            if isinstance(value, str):
+                paths.append(value)
+            elif isinstance(value, list):
+                paths.extend(value)
+        writes = tool_name not in READ_ONLY_TOOLS and not getattr(
+            validated, "dry_run", False
+        )
+        return tuple(os.path.abspath(p) for p in paths), writes
+
+    @staticmethod
+    def _conflicts(first: _BatchStep, second: _BatchStep) -> bool:
+        """
+        Indica se duas operações precisam rodar na ordem do lote.
+
+        Uma escrita sem caminho conhecido conflita com todas as operações.
+        """
+        if not (first.writes or second.writes):
+            return False
+        if (first.writes and not first.paths) or (second.writes and not second.paths):
+            return True
+        return any(
+            a == b
+            or b.startswith(a.rstrip(os.sep) + os.sep)
+            or a.startswith(b.rstrip(os.sep) + os.sep)
+            for a in first.paths
+            for b in second.paths
+        )
+
+    def _run_batch(self, steps: List[_BatchStep], stop_on_error: bool) -> BatchResult:
+        waiting: Dict[int, Set[int]] = {}
+        dependents: Dict[int, List[int]] = defaultdict(list)
+        for step in steps:
+            waiting[step.position] = set()
+            for earlier in steps[: step.position]:
+                if self._conflicts(earlier, step):
+                    waiting[step.position].add(earlier.position)
+                    dependents[earlier.position].append(step.position)
+
+        results: Dict[int, BatchItemResult] = {}
+        ready = [step.position for step in steps if not waiting[step.position]]
+        stopped = False
+        workers = min(self.batch_workers, len(steps))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            running: Dict[Future, int] = {}
+            while True:
+                if not stopped:
+                    for index in ready:
+                        running[pool.submit(self._run_step, steps[index])] = index
+                ready = []
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=running.__getitem__):
+                    index = running.pop(future)
+                    results[index] = future.result()
+                    if stop_on_error and results[index].status == "error":
+                        stopped = True
+                    for later in dependents[index]:
+                        waiting[later].discard(index)
+                        if not waiting[later]:
+                            ready.append(later)
+                ready.sort()
+
+        ordered = [
+            results.get(step.position)
+            or BatchItemResult(
+                index=step.position,
+                tool=step.tool,
+                status="skipped",
+                error="Não executada: uma operação anterior falhou",
+            )
+            for step in steps
+        ]
+        return BatchResult(
+            results=ordered,
+            succeeded=sum(r.status == "ok" for r in ordered),
+            failed=sum(r.status == "error" for r in ordered),
+            skipped=sum(r.status == "skipped" for r in ordered),
+        )
+
+    def _run_step(self, step: _BatchStep) -> BatchItemResult:
         try:
-            return json.dumps(result)
-        except TypeError:
-            return str(result)
+            result = step.call()
+        except Exception as e:
+            return BatchItemResult(
+                index=step.position, tool=step.tool, status="error", error=str(e)
+            )
+        # Serializado junto com o lote, pelo tipo de cada resultado.
+        return BatchItemResult(
+            index=step.position, tool=step.tool, status="ok", result=result
+        )
@@ -5,22 +5,52 @@ Contains the fundamental entities and data models.
 """
 
 from mcp_filesystem.mcp.core.entities import (
+    AbortFileUploadArgs,
+    AppendFileArgs,
+    BatchArgs,
+    BatchItem,
+    BatchItemResult,
+    BatchResult,
+    CacheStats,
+    CloseFileStreamArgs,
+    CommitFileUploadArgs,
+    CompactDirectoryListing,
+    CompactSearchResult,
+    CopyFileArgs,
+    CopyResult,
     CreateDirectoryArgs,
     DeleteFileArgs,
     DirectoryListing,
+    DirectoryPageArgs,
+    DirectoryTree,
+    DirectoryTreeArgs,
     EditFileArgs,
     EditOperation,
+    EntryFormatArgs,
     FileInfo,
+    FileStream,
+    FileUpload,
+    GetCacheStatsArgs,
     GetFileInfoArgs,
+    GrepFilesArgs,
+    GrepMatch,
+    GrepResult,
     ListDirectoryArgs,
     ListDirectoryWithSizesArgs,
+    MediaFile,
     MoveFileArgs,
+    OpenFileStreamArgs,
+    OpenFileUploadArgs,
+    ReadFileChunkArgs,
     ReadMediaFileArgs,
     ReadMultipleFilesArgs,
     ReadTextFileArgs,
     SearchFilesArgs,
     SearchResult,
+    TreeFile,
+    TreeNode,
     WriteFileArgs,
+    WriteFileChunkArgs,
 )
 
 __all__ = [
@@ -34,10 +64,40 @@ __all__ = [
     "ListDirectoryArgs",
     "ListDirectoryWithSizesArgs",
     "GetFileInfoArgs",
+    "DirectoryTreeArgs",
+    "DirectoryTree",
+    "TreeNode",
+    "TreeFile",
     "SearchFilesArgs",
     "MoveFileArgs",
+    "CopyFileArgs",
+    "CopyResult",
     "DeleteFileArgs",
     "FileInfo",
     "DirectoryListing",
     "SearchResult",
+    "CompactDirectoryListing",
+    "CompactSearchResult",
+    "DirectoryPageArgs",
+    "EntryFormatArgs",
+    "GrepFilesArgs",
+    "GrepMatch",
+    "GrepResult",
+    "OpenFileStreamArgs",
+    "ReadFileChunkArgs",
+    "CloseFileStreamArgs",
+    "FileStream",
+    "MediaFile",
+    "CacheStats",
+    "GetCacheStatsArgs",
+    "AppendFileArgs",
+    "OpenFileUploadArgs",
+    "WriteFileChunkArgs",
+    "CommitFileUploadArgs",
+    "AbortFileUploadArgs",
+    "FileUpload",
+    "BatchItem",
+    "BatchArgs",
+    "BatchItemResult",
+    "BatchResult",
 ]
@@ -5,9 +5,9 @@ Este módulo contém todas as classes Pydantic que definem os argumentos
 e estruturas de dados utilizadas pelas ferramentas do MCP filesystem.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class ReadTextFileArgs(BaseModel):
@@ -21,18 +21,104 @@ class ReadTextFileArgs(BaseModel):
         None,
         description="Se fornecido, retorna apenas as primeiras N linhas do arquivo",
     )
+    offset: Optional[int] = Field(
+        None, ge=0, description="Posição em bytes a partir da qual ler"
+    )
+    length: Optional[int] = Field(
+        None, ge=0, description="Quantidade de bytes a ler a partir de offset"
+    )
+    start_line: Optional[int] = Field(
+        None, ge=1, description="Primeira linha a retornar (a partir de 1)"
+    )
+    end_line: Optional[int] = Field(
+        None, ge=1, description="Última linha a retornar (inclusiva)"
+    )
+
+    @model_validator(mode="after")
+    def _check_ranges(self) -> "ReadTextFileArgs":
+        modes = [
+            name
+            for name, active in (
+                ("head/tail", self.head is not None or self.tail is not None),
+                ("offset/length", self.offset is not None or self.length is not None),
+                (
+                    "start_line/end_line",
+                    self.start_line is not None or self.end_line is not None,
+                ),
+            )
+            if active
+        ]
+        if len(modes) > 1:
+            raise ValueError(
+                f"Use apenas um modo de leitura por vez: {', '.join(modes)}"
+            )
+        if (
+            self.start_line is not None
+            and self.end_line is not None
+            and self.end_line < self.start_line
+        ):
+            raise ValueError("end_line deve ser maior ou igual a start_line")
+        return self
 
 
 class ReadMediaFileArgs(BaseModel):
     """Argumentos para leitura de arquivo de mídia."""
 
     path: str = Field(..., description="Caminho para o arquivo de mídia")
+    max_bytes: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Tamanho máximo aceito em bytes (padrão: limite do servidor)",
+    )
+    max_dimension: Optional[int] = Field(
+        None,
+        ge=16,
+        description=(
+            "Reduz imagens maiores que N pixels no maior lado antes de codificar "
+            "(requer Pillow)"
+        ),
+    )
+
+
+class OpenFileStreamArgs(BaseModel):
+    """Argumentos para abrir a leitura de um arquivo grande em blocos."""
+
+    path: str = Field(..., description="Caminho para o arquivo a ser lido")
+    chunk_size: int = Field(
+        1024 * 1024,
+        ge=4096,
+        le=16 * 1024 * 1024,
+        description="Tamanho de cada bloco em bytes",
+    )
+
+
+class ReadFileChunkArgs(BaseModel):
+    """Argumentos para ler um bloco de um stream de arquivo."""
+
+    handle: str = Field(..., description="Handle retornado por open_file_stream")
+    index: int = Field(..., ge=0, description="Índice do bloco (a partir de 0)")
+
+
+class CloseFileStreamArgs(BaseModel):
+    """Argumentos para fechar um stream de arquivo."""
+
+    handle: str = Field(..., description="Handle retornado por open_file_stream")
 
 
 class ReadMultipleFilesArgs(BaseModel):
     """Argumentos para leitura de múltiplos arquivos."""
 
     paths: List[str] = Field(..., description="Lista de caminhos para arquivos")
+    max_file_bytes: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Limite de bytes por arquivo; o excedente é truncado com um marcador",
+    )
+    max_total_bytes: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Orçamento total de bytes para todos os arquivos, na ordem informada",
+    )
 
 
 class WriteFileArgs(BaseModel):
@@ -42,11 +128,73 @@ class WriteFileArgs(BaseModel):
     content: str = Field(..., description="Conteúdo a ser escrito no arquivo")
 
 
+class AppendFileArgs(BaseModel):
+    """Argumentos para acrescentar conteúdo ao fim de um arquivo."""
+
+    path: str = Field(..., description="Caminho do arquivo; é criado se não existir")
+    content: str = Field(..., description="Conteúdo a acrescentar ao fim do arquivo")
+
+
+class OpenFileUploadArgs(BaseModel):
+    """Argumentos para iniciar a escrita de um arquivo em blocos."""
+
+    path: str = Field(
+        ..., description="Caminho onde o arquivo será criado/sobrescrito no commit"
+    )
+
+
+class WriteFileChunkArgs(BaseModel):
+    """Argumentos para enviar um bloco de um upload."""
+
+    handle: str = Field(..., description="Handle retornado por open_file_upload")
+    content: str = Field(..., description="Conteúdo do bloco")
+    index: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Índice esperado do bloco (a partir de 0); se informado, "
+        "blocos repetidos ou fora de ordem são rejeitados",
+    )
+
+
+class CommitFileUploadArgs(BaseModel):
+    """Argumentos para concluir um upload."""
+
+    handle: str = Field(..., description="Handle retornado por open_file_upload")
+    expected_bytes: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Se informado, o commit falha se o total recebido for diferente",
+    )
+
+
+class AbortFileUploadArgs(BaseModel):
+    """Argumentos para descartar um upload."""
+
+    handle: str = Field(..., description="Handle retornado por open_file_upload")
+
+
 class EditOperation(BaseModel):
     """Define uma operação de edição no arquivo."""
 
-    old_text: str = Field(..., description="Texto a ser procurado e substituído")
+    old_text: str = Field(
+        ..., min_length=1, description="Texto a ser procurado e substituído"
+    )
     new_text: str = Field(..., description="Texto que substituirá o texto antigo")
+    occurrence: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Qual ocorrência substituir (1 = primeira), contada no trecho "
+        "selecionado; sem ela o texto precisa ser único",
+    )
+    start_line: Optional[int] = Field(
+        None, ge=1, description="Procura o texto a partir desta linha (inclusive)"
+    )
+    end_line: Optional[int] = Field(
+        None, ge=1, description="Procura o texto até esta linha (inclusive)"
+    )
+    replace_all: bool = Field(
+        False, description="Substitui todas as ocorrências no trecho selecionado"
+    )
 
 
 class EditFileArgs(BaseModel):
@@ -55,6 +203,61 @@ class EditFileArgs(BaseModel):
     path: str = Field(..., description="Caminho para o arquivo a ser editado")
     edits: List[EditOperation] = Field(..., description="Lista de operações de edição")
     dry_run: bool = Field(False, description="Visualiza as alterações sem aplicar")
+    max_diff_hunks: int = Field(
+        50, ge=1, description="Máximo de trechos (hunks) exibidos no dry-run"
+    )
+
+
+SortMode = Literal["default", "name", "size", "modified", "none"]
+ResponseFormat = Literal["full", "compact"]
+FileInfoField = Literal[
+    "path", "name", "size", "is_directory", "created", "modified", "permissions"
+]
+
+
+class EntryFormatArgs(BaseModel):
+    """Campos comuns do formato de resposta de listagens e buscas."""
+
+    format: ResponseFormat = Field(
+        "full",
+        description=(
+            "full: um objeto por entrada; compact: uma lista por coluna, caminhos "
+            "relativos ao diretório base e JSON sem indentação"
+        ),
+    )
+    fields: Optional[List[FileInfoField]] = Field(
+        None,
+        min_length=1,
+        description=(
+            "Colunas do formato compact (padrão: nome ou caminho, is_directory, "
+            "size e modified); sem size, created, modified e permissions as "
+            "entradas não são consultadas com stat"
+        ),
+    )
+
+
+class DirectoryPageArgs(EntryFormatArgs):
+    """Campos comuns de paginação e ordenação das listagens de diretório."""
+
+    limit: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Máximo de itens por página; habilita a paginação com cursor",
+    )
+    cursor: Optional[str] = Field(
+        None, description="Cursor retornado em next_cursor pela página anterior"
+    )
+    sort: SortMode = Field(
+        "default",
+        description=(
+            "Ordenação: default (diretórios primeiro, por nome), name, size, "
+            "modified ou none (ordem do diretório, sem ordenar)"
+        ),
+    )
+    filter: Optional[str] = Field(
+        None,
+        description="Padrão (glob, re: ou negado com !) aplicado ao nome das entradas",
+    )
 
 
 class CreateDirectoryArgs(BaseModel):
@@ -63,30 +266,129 @@ class CreateDirectoryArgs(BaseModel):
     path: str = Field(..., description="Caminho do diretório a ser criado")
 
 
-class ListDirectoryArgs(BaseModel):
+class ListDirectoryArgs(DirectoryPageArgs):
     """Argumentos para listagem de diretório."""
 
     path: str = Field(..., description="Caminho do diretório a ser listado")
+    names_only: bool = Field(
+        False,
+        description="Retorna apenas nomes e tipos, sem consultar tamanhos e datas",
+    )
 
 
-class ListDirectoryWithSizesArgs(BaseModel):
+class ListDirectoryWithSizesArgs(DirectoryPageArgs):
     """Argumentos para listagem de diretório com tamanhos."""
 
     path: str = Field(..., description="Caminho do diretório a ser listado")
 
 
+class DirectoryTreeArgs(BaseModel):
+    """Argumentos para a árvore de diretórios com uso de disco."""
+
+    path: str = Field(..., description="Diretório raiz da árvore")
+    max_depth: int = Field(
+        2,
+        ge=0,
+        description="Níveis de subdiretórios listados; os totais sempre incluem a "
+        "subárvore inteira",
+    )
+    include_files: bool = Field(
+        False, description="Listar também arquivos, não só diretórios"
+    )
+    max_entries: int = Field(
+        50,
+        ge=1,
+        description="Máximo de itens listados por diretório, dos maiores para os "
+        "menores; os demais entram em omitted",
+    )
+    exclude: List[str] = Field(
+        default_factory=list,
+        description="Padrões (glob ou re:) de nomes ou caminhos relativos a ignorar",
+    )
+    timeout: Optional[float] = Field(
+        None, gt=0, description="Tempo máximo da varredura em segundos"
+    )
+
+
 class GetFileInfoArgs(BaseModel):
     """Argumentos para obter informações de arquivo."""
 
     path: str = Field(..., description="Caminho do arquivo/diretório")
 
 
-class SearchFilesArgs(BaseModel):
+class SearchFilesArgs(EntryFormatArgs):
     """Argumentos para busca de arquivos."""
 
-    pattern: str = Field(..., description="Padrão de busca (glob ou regex)")
+    pattern: str = Field(
+        ...,
+        description=(
+            "Padrão de busca: glob (ex.: *.py; ** atravessa diretórios, como em "
+            "src/**/*.py) ou regex com prefixo re: (ex.: re:^test_.*\\.py$); "
+            "prefixo ! nega o padrão. Padrões com / comparam o caminho relativo"
+        ),
+    )
     path: str = Field(".", description="Diretório base para busca")
     recursive: bool = Field(True, description="Busca recursiva em subdiretórios")
+    names_only: bool = Field(
+        False,
+        description="Retorna apenas caminhos e nomes, sem consultar tamanhos e datas",
+    )
+    max_results: Optional[int] = Field(
+        None, ge=1, description="Interrompe a busca ao atingir N resultados"
+    )
+    max_depth: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Profundidade máxima de subdiretórios (0 = só o diretório base)",
+    )
+    exclude: List[str] = Field(
+        default_factory=list,
+        description=(
+            "Padrões (glob ou re:) de nomes ou caminhos relativos a ignorar; "
+            "diretórios correspondentes não são percorridos "
+            "(ex.: .git, node_modules, .venv)"
+        ),
+    )
+    timeout: Optional[float] = Field(
+        None, gt=0, description="Tempo máximo da busca em segundos"
+    )
+    content: Optional[str] = Field(
+        None,
+        description="Retorna apenas arquivos cujo conteúdo contém este texto",
+    )
+
+
+class GrepFilesArgs(BaseModel):
+    """Argumentos para busca no conteúdo de arquivos."""
+
+    pattern: str = Field(..., description="Texto ou expressão regular a procurar")
+    path: str = Field(".", description="Diretório base (ou arquivo) da busca")
+    regex: bool = Field(False, description="Interpreta o padrão como expressão regular")
+    ignore_case: bool = Field(
+        False, description="Ignora maiúsculas/minúsculas (apenas ASCII)"
+    )
+    include: Optional[str] = Field(
+        None,
+        description="Padrão de arquivos a examinar (mesma sintaxe de search_files)",
+    )
+    exclude: List[str] = Field(
+        default_factory=list,
+        description="Padrões de nomes ou caminhos relativos a ignorar",
+    )
+    context_lines: int = Field(
+        0, ge=0, le=20, description="Linhas de contexto antes e depois de cada linha"
+    )
+    max_results: Optional[int] = Field(
+        100, ge=1, description="Interrompe a busca ao atingir N linhas encontradas"
+    )
+    max_depth: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Profundidade máxima de subdiretórios (0 = só o diretório base)",
+    )
+    timeout: Optional[float] = Field(
+        None, gt=0, description="Tempo máximo da busca em segundos"
+    )
 
 
 class MoveFileArgs(BaseModel):
@@ -96,6 +398,22 @@ class MoveFileArgs(BaseModel):
     destination: str = Field(..., description="Caminho destino")
 
 
+class CopyFileArgs(BaseModel):
+    """Argumentos para copiar arquivo ou diretório."""
+
+    source: str = Field(..., description="Arquivo ou diretório a copiar")
+    destination: str = Field(
+        ...,
+        description="Caminho da cópia; se for um diretório existente, a cópia "
+        "é criada dentro dele",
+    )
+    overwrite: bool = Field(
+        False,
+        description="Substituir arquivos existentes (em diretórios, mescla com o "
+        "destino)",
+    )
+
+
 class DeleteFileArgs(BaseModel):
     """Argumentos para deletar arquivo ou diretório."""
 
@@ -110,11 +428,13 @@ class FileInfo(BaseModel):
 
     path: str = Field(..., description="Caminho completo")
     name: str = Field(..., description="Nome do arquivo/diretório")
-    size: int = Field(..., description="Tamanho em bytes")
+    size: Optional[int] = Field(
+        ..., description="Tamanho em bytes (None no modo somente nomes)"
+    )
     is_directory: bool = Field(..., description="Se é um diretório")
-    created: float = Field(..., description="Timestamp de criação")
-    modified: float = Field(..., description="Timestamp de modificação")
-    permissions: str = Field(..., description="Permissões do arquivo")
+    created: Optional[float] = Field(..., description="Timestamp de criação")
+    modified: Optional[float] = Field(..., description="Timestamp de modificação")
+    permissions: Optional[str] = Field(..., description="Permissões do arquivo")
 
 
 class DirectoryListing(BaseModel):
@@ -123,6 +443,9 @@ class DirectoryListing(BaseModel):
     path: str = Field(..., description="Caminho do diretório listado")
     entries: List[FileInfo] = Field(..., description="Lista de arquivos e diretórios")
     total_count: int = Field(..., description="Total de itens")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor da próxima página, se houver mais itens"
+    )
 
 
 class SearchResult(BaseModel):
@@ -132,6 +455,200 @@ class SearchResult(BaseModel):
     base_path: str = Field(..., description="Diretório base da busca")
     matches: List[FileInfo] = Field(..., description="Arquivos encontrados")
     total_matches: int = Field(..., description="Total de arquivos encontrados")
+    truncated: bool = Field(
+        False, description="Se a busca foi interrompida antes de terminar"
+    )
+    truncated_reason: Optional[Literal["max_results", "timeout"]] = Field(
+        None, description="Limite que interrompeu a busca"
+    )
+
+
+class CompactDirectoryListing(BaseModel):
+    """Listagem de diretório no formato compact, com uma lista por coluna."""
+
+    path: str = Field(..., description="Caminho do diretório listado")
+    columns: Dict[str, List[Any]] = Field(
+        ..., description="Valores de cada campo, na ordem das entradas"
+    )
+    total_count: int = Field(..., description="Total de itens")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor da próxima página, se houver mais itens"
+    )
+
+
+class CompactSearchResult(BaseModel):
+    """Resultado de uma busca no formato compact, com uma lista por coluna."""
+
+    query: str = Field(..., description="Padrão de busca utilizado")
+    base_path: str = Field(..., description="Diretório base da busca")
+    columns: Dict[str, List[Any]] = Field(
+        ...,
+        description="Valores de cada campo, na ordem dos arquivos encontrados; "
+        "caminhos relativos ao diretório base",
+    )
+    total_matches: int = Field(..., description="Total de arquivos encontrados")
+    truncated: bool = Field(
+        False, description="Se a busca foi interrompida antes de terminar"
+    )
+    truncated_reason: Optional[Literal["max_results", "timeout"]] = Field(
+        None, description="Limite que interrompeu a busca"
+    )
+
+
+class TreeFile(BaseModel):
+    """Arquivo listado numa árvore de diretórios."""
+
+    name: str = Field(..., description="Nome do arquivo")
+    size: int = Field(..., description="Tamanho em bytes")
+    disk_usage: int = Field(..., description="Espaço alocado em disco, em bytes")
+    hardlink: bool = Field(
+        default=False,
+        description="Outro link físico do mesmo arquivo já foi contado; este não "
+        "entra nos totais",
+    )
+
+
+class TreeNode(BaseModel):
+    """Diretório de uma árvore, com totais recursivos."""
+
+    name: str = Field(..., description="Nome do diretório")
+    size: int = Field(..., description="Soma dos tamanhos dos arquivos, em bytes")
+    disk_usage: int = Field(..., description="Espaço alocado pela subárvore, em bytes")
+    files: int = Field(..., description="Arquivos na subárvore")
+    directories: int = Field(..., description="Subdiretórios na subárvore")
+    children: Optional[List[Union["TreeNode", TreeFile]]] = Field(
+        None, description="Itens listados; ausente além de max_depth"
+    )
+    omitted: int = Field(0, description="Itens não listados por max_entries")
+
+
+class DirectoryTree(BaseModel):
+    """Árvore de diretórios com uso de disco."""
+
+    path: str = Field(..., description="Diretório raiz")
+    root: TreeNode = Field(..., description="Árvore a partir da raiz")
+    hardlinks_skipped: int = Field(
+        0, description="Links físicos repetidos, contados uma só vez"
+    )
+    truncated: bool = Field(
+        False, description="Se a varredura foi interrompida pelo timeout"
+    )
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="Caminhos que não puderam ser lidos"
+    )
+
+
+class GrepMatch(BaseModel):
+    """Uma linha que corresponde à busca de conteúdo."""
+
+    path: str = Field(..., description="Caminho do arquivo")
+    line_number: int = Field(..., description="Número da linha (a partir de 1)")
+    byte_offset: int = Field(
+        ..., description="Posição em bytes do início da correspondência no arquivo"
+    )
+    line: str = Field(..., description="Conteúdo da linha")
+    before: List[str] = Field(
+        default_factory=list, description="Linhas de contexto anteriores"
+    )
+    after: List[str] = Field(
+        default_factory=list, description="Linhas de contexto posteriores"
+    )
+
+
+class GrepResult(BaseModel):
+    """Resultado de uma busca no conteúdo de arquivos."""
+
+    query: str = Field(..., description="Padrão de busca utilizado")
+    base_path: str = Field(..., description="Diretório base da busca")
+    matches: List[GrepMatch] = Field(..., description="Linhas encontradas")
+    total_matches: int = Field(..., description="Total de linhas encontradas")
+    files_scanned: int = Field(..., description="Arquivos examinados")
+    truncated: bool = Field(
+        False, description="Se a busca foi interrompida antes de terminar"
+    )
+    truncated_reason: Optional[Literal["max_results", "timeout"]] = Field(
+        None, description="Limite que interrompeu a busca"
+    )
+
+
+class GetCacheStatsArgs(BaseModel):
+    """Argumentos para consulta dos contadores do cache de leitura."""
+
+
+class FileUpload(BaseModel):
+    """Upload de um arquivo em blocos."""
+
+    handle: str = Field(..., description="Identificador do upload")
+    path: str = Field(..., description="Caminho do arquivo de destino")
+    bytes_written: int = Field(..., description="Bytes recebidos até agora")
+    chunks: int = Field(..., description="Blocos recebidos até agora")
+    committed: bool = Field(False, description="Se o arquivo já foi gravado no destino")
+
+
+class CopyResult(BaseModel):
+    """Resultado de uma cópia feita no servidor."""
+
+    source: str = Field(..., description="Caminho copiado")
+    destination: str = Field(..., description="Caminho da cópia")
+    files: int = Field(default=0, description="Arquivos copiados")
+    directories: int = Field(default=0, description="Diretórios criados")
+    symlinks: int = Field(default=0, description="Links simbólicos recriados")
+    bytes: int = Field(default=0, description="Bytes copiados")
+    methods: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Arquivos por método de cópia (clone, copy_file_range, "
+        "sendfile, read_write)",
+    )
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="Erros por caminho de origem"
+    )
+
+
+class CacheStats(BaseModel):
+    """Contadores do cache de leitura de arquivos."""
+
+    enabled: bool = Field(..., description="Se o cache de leitura está ativo")
+    entries: int = Field(default=0, description="Arquivos em cache")
+    bytes: int = Field(
+        default=0, description="Memória ocupada pelas entradas, em bytes"
+    )
+    max_bytes: int = Field(
+        default=0, description="Orçamento de memória do cache, em bytes"
+    )
+    hits: int = Field(default=0, description="Leituras servidas pelo cache")
+    misses: int = Field(default=0, description="Leituras que foram ao disco")
+    evictions: int = Field(
+        default=0, description="Entradas descartadas por falta de espaço"
+    )
+    invalidations: int = Field(
+        default=0, description="Entradas descartadas por alteração do arquivo"
+    )
+
+
+class FileStream(BaseModel):
+    """Stream de leitura de um arquivo em blocos."""
+
+    handle: str = Field(..., description="Identificador do stream")
+    path: str = Field(..., description="Caminho do arquivo")
+    size: int = Field(..., description="Tamanho do arquivo em bytes")
+    chunk_size: int = Field(..., description="Tamanho de cada bloco em bytes")
+    chunk_count: int = Field(..., description="Número de blocos")
+    resource_uri: str = Field(
+        ...,
+        description="Modelo de URI para ler cada bloco como recurso ({index})",
+    )
+
+
+class MediaFile(BaseModel):
+    """Conteúdo de um arquivo de mídia codificado em base64."""
+
+    path: str = Field(..., description="Caminho do arquivo")
+    mime_type: str = Field(..., description="Tipo MIME detectado")
+    size: int = Field(..., description="Tamanho original do arquivo em bytes")
+    data: str = Field(..., description="Conteúdo codificado em base64")
+    downscaled: bool = Field(
+        False, description="Se a imagem foi reduzida antes da codificação"
+    )
 
 
 class ToolInfo(BaseModel):
@@ -140,3 +657,57 @@ class ToolInfo(BaseModel):
     name: str
     description: str
     input_schema: Optional[Dict[str, Any]]
+
+
+MAX_BATCH_ITEMS = 100
+
+
+class BatchItem(BaseModel):
+    """Uma operação dentro de um lote."""
+
+    tool: str = Field(..., description="Nome da ferramenta a executar")
+    args: Dict[str, Any] = Field(
+        default_factory=dict, description="Argumentos da ferramenta"
+    )
+
+
+class BatchArgs(BaseModel):
+    """Argumentos para execução de várias operações numa única chamada."""
+
+    items: List[BatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_ITEMS,
+        description="Operações a executar; as que usam os mesmos caminhos "
+        "rodam na ordem informada e as demais em paralelo",
+    )
+    stop_on_error: bool = Field(
+        False,
+        description="Se verdadeiro, nenhuma operação é iniciada após a primeira "
+        "falha",
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Resultado de uma operação do lote."""
+
+    index: int = Field(..., description="Posição da operação no lote")
+    tool: str = Field(..., description="Nome da ferramenta executada")
+    status: Literal["ok", "error", "skipped"] = Field(
+        ..., description="Situação da operação"
+    )
+    result: Any = Field(default=None, description="Resultado da ferramenta")
+    error: Optional[str] = Field(
+        default=None, description="Mensagem de erro, se houver"
+    )
+
+
+class BatchResult(BaseModel):
+    """Resultado da execução de um lote de operações."""
+
+    results: List[BatchItemResult] = Field(
+        ..., description="Resultados na ordem das operações"
+    )
+    succeeded: int = Field(..., description="Operações concluídas com sucesso")
+    failed: int = Field(..., description="Operações que falharam")
+    skipped: int = Field(..., description="Operações não executadas")
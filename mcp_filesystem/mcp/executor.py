@@ -0,0 +1,110 @@
+"""
+Worker-pool execution of tool calls for the MCP filesystem server.
+
+Tool implementations are synchronous and may block for a long time (deep
+searches, large reads). The executor moves them off the asyncio event loop so
+independent requests on the same stdio session proceed in parallel.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_WORKERS = 8
+DEFAULT_TOOL_CONCURRENCY = 4
+DEFAULT_MAX_PENDING = 64
+
+
+class ExecutorBusyError(Exception):
+    """Raised when a call is rejected because the pending queue is full."""
+
+    pass
+
+
+class ToolExecutor:
+    """
+    Runs blocking tool calls in a thread pool.
+
+    Each tool name has its own concurrency limit, so one expensive tool cannot
+    take every worker, and the total number of pending calls is capped so a
+    burst of requests fails fast instead of queueing without bound.
+
+    With ``workers=0`` calls run inline on the event loop, which reproduces the
+    original sequential behaviour.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        tool_concurrency: Optional[int] = DEFAULT_TOOL_CONCURRENCY,
+        max_pending: Optional[int] = DEFAULT_MAX_PENDING,
+    ):
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
+        self.workers = workers
+        self.tool_concurrency = tool_concurrency
+        self.max_pending = max_pending
+        self._pool: Optional[Executor] = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-fs-tool")
+            if workers > 0
+            else None
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of calls accepted and not yet finished."""
+        return self._pending
+
+    def _semaphore_for(self, tool_name: str) -> Optional[asyncio.Semaphore]:
+        if not self.tool_concurrency:
+            return None
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.tool_concurrency)
+            self._semaphores[tool_name] = semaphore
+        return semaphore
+
+    async def run(
+        self, tool_name: str, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Execute ``func(*args, **kwargs)`` on behalf of ``tool_name``.
+
+        Raises:
+            ExecutorBusyError: If ``max_pending`` calls are already in flight.
+        """
+        if self.max_pending and self._pending >= self.max_pending:
+            raise ExecutorBusyError(
+                f"Server busy: {self._pending} pending tool calls "
+                f"(limit {self.max_pending})"
+            )
+
+        self._pending += 1
+        try:
+            semaphore = self._semaphore_for(tool_name)
+            if semaphore is None:
+                return await self._dispatch(func, *args, **kwargs)
+            async with semaphore:
+                return await self._dispatch(func, *args, **kwargs)
+        finally:
+            self._pending -= 1
+
+    async def _dispatch(
+        self, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        if self._pool is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
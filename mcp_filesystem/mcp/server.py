@@ -5,69 +5,200 @@ This module implements a Model Context Protocol server that exposes
 filesystem operations through the standard MCP protocol over stdio.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
-from mcp.types import Resource, TextContent, Tool
+from mcp.types import (
+    BlobResourceContents,
+    EmbeddedResource,
+    ImageContent,
+    Resource,
+    ResourceTemplate,
+    TextContent,
+    Tool,
+)
+from pydantic import AnyUrl
 
 from mcp_filesystem.mcp.controller import McpFilesystemController
+from mcp_filesystem.mcp.executor import (
+    DEFAULT_MAX_PENDING,
+    DEFAULT_TOOL_CONCURRENCY,
+    DEFAULT_WORKERS,
+    ExecutorBusyError,
+    ToolExecutor,
+)
+from mcp_filesystem.storage.caching import CachingStorage
+from mcp_filesystem.storage.events import ChangeNotifier
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.index import FileIndex
+from mcp_filesystem.storage.media import DEFAULT_MAX_MEDIA_BYTES
+from mcp_filesystem.storage.progress import Reporter, reporting_to
+from mcp_filesystem.storage.storage import StorageInterface
+from mcp_filesystem.storage.streams import STREAM_URI_SCHEME, parse_stream_uri
+from mcp_filesystem.storage.trigram import TrigramIndex
+from mcp_filesystem.storage.watcher import Watcher, create_watcher
+from mcp_filesystem.storage.writer import Durability
 
 logger = logging.getLogger(__name__)
 
 
-async def start_server(allowed_directories: List[str]) -> None:
+def media_content(media: Dict[str, Any]) -> Union[ImageContent, EmbeddedResource]:
+    """Wrap a ``read_media_file`` result as MCP image or embedded blob content."""
+    if media["mime_type"].startswith("image/"):
+        return ImageContent(
+            type="image", data=media["data"], mimeType=media["mime_type"]
+        )
+    return EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(
+            uri=AnyUrl(Path(media["path"]).absolute().as_uri()),
+            mimeType=media["mime_type"],
+            blob=media["data"],
+        ),
+    )
+
+
+def progress_reporter(server: Server) -> Optional[Reporter]:
+    """
+    Reporter sending MCP progress notifications for the request being handled,
+    or ``None`` if its client did not ask for progress.
+
+    The reporter may be called from worker threads; it only schedules the
+    notification on the event loop.
+    """
+    context = server.request_context
+    token = context.meta.progressToken if context.meta else None
+    if token is None:
+        return None
+    loop = asyncio.get_running_loop()
+
+    def report(progress: float, total: Optional[float], message: Optional[str]):
+        asyncio.run_coroutine_threadsafe(
+            context.session.send_progress_notification(token, progress, total, message),
+            loop,
+        )
+
+    return report
+
+
+async def start_server(
+    allowed_directories: List[str],
+    workers: int = DEFAULT_WORKERS,
+    tool_concurrency: Optional[int] = DEFAULT_TOOL_CONCURRENCY,
+    max_pending: Optional[int] = DEFAULT_MAX_PENDING,
+    index_path: Optional[str] = None,
+    watch: bool = False,
+    content_index_path: Optional[str] = None,
+    max_media_bytes: int = DEFAULT_MAX_MEDIA_BYTES,
+    read_cache_bytes: int = 0,
+    durability: Durability = Durability.NONE,
+) -> None:
     """
     Start the MCP filesystem server.
 
     Args:
         allowed_directories: List of dirs where operations are permitted.
+        workers: Size of the tool worker pool (0 runs tools on the event loop).
+        tool_concurrency: Max concurrent calls of a single tool.
+        max_pending: Max tool calls in flight before new ones are rejected.
+        index_path: If given, serve metadata queries from the file-tree index
+            stored at this path. It is refreshed in the background at startup.
+        watch: Watch the allowed directories (inotify, or polling as a
+            fallback) and publish external changes to the index and caches.
+        content_index_path: If given, narrow content searches through the
+            trigram index stored at this path, refreshed in the background.
+            Files rewritten in place by other programs are only seen through
+            ``watch`` or the next build.
+        max_media_bytes: Largest file read_media_file will encode.
+        read_cache_bytes: If positive, cache file reads in memory up to this
+            many bytes (see ``CachingStorage``).
+        durability: What write_file and edit_file flush before returning
+            (see ``AtomicWriter``).
     """
-    controller = McpFilesystemController(allowed_directories)
+    notifier = ChangeNotifier()
+    index = None
+    if index_path:
+        index = FileIndex(index_path, allowed_directories)
+        index.build_in_background()
+    content_index = None
+    if content_index_path:
+        content_index = TrigramIndex(content_index_path, allowed_directories)
+        content_index.build_in_background()
+    storage: StorageInterface = FilesystemStorage(
+        allowed_directories,
+        index=index,
+        notifier=notifier,
+        content_index=content_index,
+        max_media_bytes=max_media_bytes,
+        durability=durability,
+    )
+    if read_cache_bytes > 0:
+        storage = CachingStorage(
+            storage, allowed_directories, read_cache_bytes, notifier=notifier
+        )
+    watcher: Optional[Watcher] = None
+    if watch:
+        watcher = create_watcher(allowed_directories, notifier)
+        watcher.start()
+    controller = McpFilesystemController(allowed_directories, storage=storage)
+    executor = ToolExecutor(
+        workers=workers, tool_concurrency=tool_concurrency, max_pending=max_pending
+    )
     server = Server("mcp-filesystem")
 
+    # The tool list never changes, so it is built once.
+    mcp_tools = [
+        Tool(
+            name=tool_info["name"],
+            description=(
+                tool_info["description"] or f"Execute {tool_info['name']} operation"
+            ),
+            inputSchema=tool_info.get("input_schema", {}),
+        )
+        for tool_info in controller.get_tools()
+    ]
+
     @server.list_tools()
     async def handle_list_tools() -> List[Tool]:
         """Handle tools list request."""
-        tools = controller.get_tools()
-        mcp_tools = []
-
-        for tool_info in tools:
-            tool = Tool(
-                name=tool_info["name"],
-                description=(
-                    tool_info["description"] or f"Execute {tool_info['name']} operation"
-                ),
-                inputSchema=tool_info.get("input_schema", {}),
-            )
-            mcp_tools.append(tool)
         return mcp_tools
 
-    @server.call_tool()
+    # Arguments are validated by each tool's Pydantic model in the controller;
+    # the SDK's JSON Schema validation would also re-check the schema itself
+    # on every call, which costs more than most tools.
+    @server.call_tool(validate_input=False)
     async def handle_call_tool(
         name: str, arguments: Dict[str, Any]
-    ) -> List[TextContent]:
+    ) -> List[Union[TextContent, ImageContent, EmbeddedResource]]:
         """Handle tool execution request."""
         try:
-            result = controller.execute_tool(name, arguments)
+            cancelled = threading.Event()
+            try:
+                with reporting_to(progress_reporter(server), cancelled):
+                    result = await executor.run(
+                        name, controller.execute_tool, name, arguments
+                    )
+            except asyncio.CancelledError:
+                # The worker thread cannot be interrupted; tell it to stop.
+                cancelled.set()
+                raise
 
             if "error" in result:
                 error_msg = f"Error in {name}: {result['error']}"
                 logger.error(error_msg)
                 return [TextContent(type="text", text=error_msg)]
-            if "content" in result:
-                content = result["content"]
-            elif "result" in result:
-                if isinstance(result["result"], str):
-                    content = result["result"]
-                else:
-                    import json
-
-                    content = json.dumps(result["result"], indent=2, ensure_ascii=False)
-            else:
-                content = str(result)
-            return [TextContent(type="text", text=content)]
+            if "media" in result:
+                return [media_content(result["media"])]
+            return [TextContent(type="text", text=result["content"])]
+        except ExecutorBusyError as e:
+            logger.warning(str(e))
+            return [TextContent(type="text", text=f"Error in {name}: {e}")]
         except Exception as e:
             error_msg = f"Unexpected error in {name}: {str(e)}"
             logger.exception(error_msg)
@@ -80,9 +211,42 @@ async def start_server(allowed_directories: List[str]) -> None:
         # directory listings as resources in the future.
         return []
 
-    logger.info("Starting MCP Filesystem Server")
-
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream, write_stream, server.create_initialization_options()
+    @server.list_resource_templates()
+    async def handle_list_resource_templates() -> List[ResourceTemplate]:
+        """Advertise the chunks of streams opened with open_file_stream."""
+        return [
+            ResourceTemplate(
+                uriTemplate=f"{STREAM_URI_SCHEME}://{{handle}}/{{index}}",
+                name="file-stream-chunk",
+                description="Chunk <index> of a stream opened with open_file_stream",
+                mimeType="text/plain",
+            )
+        ]
+
+    @server.read_resource()
+    async def handle_read_resource(uri: AnyUrl) -> Iterable[ReadResourceContents]:
+        """Serve one chunk of a file stream; memory is bounded by the chunk."""
+        parsed = parse_stream_uri(str(uri))
+        if parsed is None:
+            raise ValueError(f"Unknown resource: {uri}")
+        handle, index = parsed
+        arguments = {"handle": handle, "index": index}
+        result = await executor.run(
+            "read_file_chunk", controller.execute_tool, "read_file_chunk", arguments
         )
+        if "error" in result:
+            raise ValueError(result["error"])
+        return [ReadResourceContents(content=result["content"], mime_type="text/plain")]
+
+    logger.info("Starting MCP Filesystem Server (workers=%d)", workers)
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream, write_stream, server.create_initialization_options()
+            )
+    finally:
+        executor.shutdown(wait=False)
+        storage.close()
+        if watcher is not None:
+            watcher.stop()
@@ -2,23 +2,55 @@
 Define os serviços e a lógica de negócios para o mcp_filesystem.
 """
 
+from typing import List, Union
+
 from mcp_filesystem.mcp.core.entities import (
+    AbortFileUploadArgs,
+    AppendFileArgs,
+    CacheStats,
+    CloseFileStreamArgs,
+    CommitFileUploadArgs,
+    CompactDirectoryListing,
+    CompactSearchResult,
+    CopyFileArgs,
+    CopyResult,
     CreateDirectoryArgs,
     DeleteFileArgs,
     DirectoryListing,
+    DirectoryTree,
+    DirectoryTreeArgs,
     EditFileArgs,
     FileInfo,
+    FileStream,
+    FileUpload,
+    GetCacheStatsArgs,
     GetFileInfoArgs,
+    GrepFilesArgs,
+    GrepResult,
     ListDirectoryArgs,
     ListDirectoryWithSizesArgs,
+    MediaFile,
     MoveFileArgs,
+    OpenFileStreamArgs,
+    OpenFileUploadArgs,
+    ReadFileChunkArgs,
+    ReadMediaFileArgs,
     ReadMultipleFilesArgs,
     ReadTextFileArgs,
     SearchFilesArgs,
     SearchResult,
     WriteFileArgs,
+    WriteFileChunkArgs,
 )
+from mcp_filesystem.storage.pagination import DEFAULT_PAGE_SIZE
 from mcp_filesystem.storage.storage import StorageInterface
+from mcp_filesystem.utils.columns import (
+    LISTING_COLUMNS,
+    SEARCH_COLUMNS,
+    needs_stat,
+    resolve_columns,
+    to_columns,
+)
 
 
 class FilesystemService:
@@ -37,42 +69,246 @@ class FilesystemService:
         self._storage = storage
 
     def read_text_file(self, args: ReadTextFileArgs) -> str:
-        return self._storage.read_text_file(args.path, args.head, args.tail)
+        return self._storage.read_text_file(
+            args.path,
+            args.head,
+            args.tail,
+            args.offset,
+            args.length,
+            args.start_line,
+            args.end_line,
+        )
 
     def read_multiple_files(self, args: ReadMultipleFilesArgs) -> dict:
-        return self._storage.read_multiple_files(args.paths)
+        return self._storage.read_multiple_files(
+            args.paths, args.max_file_bytes, args.max_total_bytes
+        )
+
+    def read_media_file(self, args: ReadMediaFileArgs) -> MediaFile:
+        """
+        Lê uma imagem ou outro arquivo binário e o retorna em base64, com o
+        tipo MIME detectado pelo conteúdo.
+        """
+        return self._storage.read_media_file(
+            args.path, args.max_bytes, args.max_dimension
+        )
+
+    def open_file_stream(self, args: OpenFileStreamArgs) -> FileStream:
+        """
+        Abre a leitura de um arquivo grande em blocos de tamanho fixo.
+
+        Retorna um handle; cada bloco é lido com read_file_chunk ou como
+        recurso pela URI em resource_uri. Feche com close_file_stream.
+        """
+        return self._storage.open_file_stream(args.path, args.chunk_size)
+
+    def read_file_chunk(self, args: ReadFileChunkArgs) -> str:
+        """Lê um bloco de um stream aberto por open_file_stream."""
+        return self._storage.read_file_chunk(args.handle, args.index)
+
+    def close_file_stream(self, args: CloseFileStreamArgs) -> str:
+        """Fecha um stream aberto por open_file_stream."""
+        self._storage.close_file_stream(args.handle)
+        return f"Stream fechado: {args.handle}"
 
     def write_file(self, args: WriteFileArgs) -> str:
         self._storage.write_file(args.path, args.content)
         return f"Arquivo escrito com sucesso: {args.path}"
 
+    def append_file(self, args: AppendFileArgs) -> str:
+        """
+        Acrescenta conteúdo ao fim de um arquivo, criando-o se necessário,
+        sem ler nem reescrever o que já existe.
+        """
+        self._storage.append_file(args.path, args.content)
+        return f"Conteúdo acrescentado com sucesso: {args.path}"
+
+    def open_file_upload(self, args: OpenFileUploadArgs) -> FileUpload:
+        """
+        Inicia a escrita de um arquivo grande em blocos.
+
+        Envie os blocos em ordem com write_file_chunk e conclua com
+        commit_file_upload, que substitui o destino de forma atômica; até lá o
+        arquivo original não é alterado. Descarte com abort_file_upload.
+        """
+        return self._storage.open_file_upload(args.path)
+
+    def write_file_chunk(self, args: WriteFileChunkArgs) -> FileUpload:
+        """Grava em disco um bloco de um upload aberto por open_file_upload."""
+        return self._storage.write_file_chunk(args.handle, args.content, args.index)
+
+    def commit_file_upload(self, args: CommitFileUploadArgs) -> FileUpload:
+        """Conclui um upload, gravando o arquivo no destino de forma atômica."""
+        return self._storage.commit_file_upload(args.handle, args.expected_bytes)
+
+    def abort_file_upload(self, args: AbortFileUploadArgs) -> str:
+        """Descarta um upload aberto por open_file_upload."""
+        self._storage.abort_file_upload(args.handle)
+        return f"Upload descartado: {args.handle}"
+
     def edit_file(self, args: EditFileArgs) -> str:
+        """
+        Aplica várias edições de texto num arquivo de uma só vez.
+
+        Cada old_text é procurado no conteúdo original e precisa ser único,
+        a menos que occurrence, start_line/end_line ou replace_all indiquem o
+        alvo. Edições ausentes, ambíguas ou sobrepostas fazem a operação
+        falhar sem alterar o arquivo. Com dry_run, retorna o diff.
+        """
         return self._storage.edit_file(
-            args.path, [e.dict() for e in args.edits], args.dry_run
+            args.path,
+            [e.dict() for e in args.edits],
+            args.dry_run,
+            args.max_diff_hunks,
         )
 
     def create_directory(self, args: CreateDirectoryArgs) -> str:
         self._storage.create_directory(args.path)
         return f"Diretório criado com sucesso: {args.path}"
 
-    def list_directory(self, args: ListDirectoryArgs) -> list:
-        return self._storage.list_directory(args.path)
+    def list_directory(
+        self, args: ListDirectoryArgs
+    ) -> Union[List[FileInfo], DirectoryListing, CompactDirectoryListing]:
+        if args.format == "compact":
+            return self._compact_listing(args, args.names_only)
+        if args.limit is not None or args.cursor:
+            return self._storage.list_directory_page(
+                args.path,
+                args.limit or DEFAULT_PAGE_SIZE,
+                args.cursor,
+                args.sort,
+                args.filter,
+                args.names_only,
+            )
+        return self._storage.list_directory(
+            args.path, args.names_only, args.sort, args.filter
+        )
 
     def list_directory_with_sizes(
         self, args: ListDirectoryWithSizesArgs
-    ) -> DirectoryListing:
-        return self._storage.list_directory_with_sizes(args.path)
+    ) -> Union[DirectoryListing, CompactDirectoryListing]:
+        if args.format == "compact":
+            return self._compact_listing(args)
+        return self._storage.list_directory_with_sizes(
+            args.path, args.limit, args.cursor, args.sort, args.filter
+        )
+
+    def _compact_listing(
+        self,
+        args: Union[ListDirectoryArgs, ListDirectoryWithSizesArgs],
+        names_only: bool = False,
+    ) -> CompactDirectoryListing:
+        """
+        Lista o diretório no formato compact; as entradas só são consultadas
+        com stat se alguma coluna pedida depender disso.
+        """
+        columns = resolve_columns(args.fields, LISTING_COLUMNS, names_only)
+        names_only = names_only or not needs_stat(columns)
+        next_cursor = None
+        if args.limit is not None or args.cursor:
+            page = self._storage.list_directory_page(
+                args.path,
+                args.limit or DEFAULT_PAGE_SIZE,
+                args.cursor,
+                args.sort,
+                args.filter,
+                names_only,
+            )
+            entries, next_cursor = page.entries, page.next_cursor
+        else:
+            entries = self._storage.list_directory(
+                args.path, names_only, args.sort, args.filter
+            )
+        return CompactDirectoryListing.model_construct(
+            path=args.path,
+            columns=to_columns(entries, columns, args.path),
+            total_count=len(entries),
+            next_cursor=next_cursor,
+        )
 
     def get_file_info(self, args: GetFileInfoArgs) -> FileInfo:
         return self._storage.get_file_info(args.path)
 
-    def search_files(self, args: SearchFilesArgs) -> SearchResult:
-        return self._storage.search_files(args.path, args.pattern, args.recursive)
+    def search_files(
+        self, args: SearchFilesArgs
+    ) -> Union[SearchResult, CompactSearchResult]:
+        columns = resolve_columns(args.fields, SEARCH_COLUMNS, args.names_only)
+        compact = args.format == "compact"
+        result = self._storage.search_files(
+            args.path,
+            args.pattern,
+            args.recursive,
+            args.names_only or (compact and not needs_stat(columns)),
+            args.max_results,
+            args.max_depth,
+            args.exclude,
+            args.timeout,
+            args.content,
+        )
+        if not compact:
+            return result
+        return CompactSearchResult.model_construct(
+            query=result.query,
+            base_path=result.base_path,
+            columns=to_columns(result.matches, columns, args.path),
+            total_matches=result.total_matches,
+            truncated=result.truncated,
+            truncated_reason=result.truncated_reason,
+        )
+
+    def grep_files(self, args: GrepFilesArgs) -> GrepResult:
+        return self._storage.grep_files(
+            args.path,
+            args.pattern,
+            args.regex,
+            args.ignore_case,
+            args.include,
+            args.exclude,
+            args.context_lines,
+            args.max_results,
+            args.max_depth,
+            args.timeout,
+        )
+
+    def get_cache_stats(self, args: GetCacheStatsArgs) -> CacheStats:
+        """
+        Retorna os contadores do cache de leitura (acertos, falhas e
+        descartes); enabled é falso quando o servidor roda sem cache.
+        """
+        return self._storage.cache_stats()
+
+    def directory_tree(self, args: DirectoryTreeArgs) -> DirectoryTree:
+        """
+        Mostra a árvore de um diretório com tamanho, espaço em disco e número
+        de arquivos e subdiretórios de cada subárvore, numa única chamada.
+        Os itens de cada diretório vêm dos maiores para os menores; max_depth
+        limita só o que é listado, os totais cobrem a subárvore inteira.
+        Links físicos são contados uma vez e links simbólicos não são
+        seguidos.
+        """
+        return self._storage.directory_tree(
+            args.path,
+            args.max_depth,
+            args.include_files,
+            args.max_entries,
+            args.exclude,
+            args.timeout,
+        )
 
     def move_file(self, args: MoveFileArgs) -> str:
         self._storage.move_file(args.source, args.destination)
         return f"Movido com sucesso: {args.source} → {args.destination}"
 
+    def copy_file(self, args: CopyFileArgs) -> CopyResult:
+        """
+        Copia um arquivo ou diretório (recursivamente) dentro do servidor, sem
+        trafegar o conteúdo pela conversa; funciona com arquivos binários.
+        Usa reflink, copy_file_range ou sendfile quando disponíveis e copia
+        árvores em paralelo, enviando progresso se o cliente pedir. Falhas
+        em entradas de um diretório são listadas em errors.
+        """
+        return self._storage.copy_file(args.source, args.destination, args.overwrite)
+
     def delete_file(self, args: DeleteFileArgs) -> str:
         self._storage.delete_file(args.path, args.recursive)
         if args.recursive:
@@ -0,0 +1,460 @@
+"""
+In-process read cache in front of another ``StorageInterface``.
+
+Decoded file contents are kept in an LRU bounded by a byte budget. Entries
+are keyed by the file's identity and version, ``(st_dev, st_ino, st_size,
+st_mtime_ns)``, so validating a hit costs a single ``stat``: a rewritten file
+gets a new key and simply misses, and a renamed file keeps hitting.
+
+Mutations made through the cache, and change events from a
+``ChangeNotifier``, drop the affected entries right away. This covers
+rewrites that keep both the size and the mtime.
+"""
+
+import os
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from mcp_filesystem.mcp.core.entities import (
+    CacheStats,
+    CopyResult,
+    DirectoryListing,
+    DirectoryTree,
+    FileInfo,
+    FileStream,
+    FileUpload,
+    GrepResult,
+    MediaFile,
+    SearchResult,
+)
+from mcp_filesystem.storage.events import ChangeNotifier, EventType, FileEvent
+from mcp_filesystem.storage.storage import StorageInterface
+from mcp_filesystem.utils.path_validation import compile_roots, validate_path
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# read_text_file returns newline-translated text, read_multiple_files the raw
+# decoded bytes; the two views of one file are cached separately.
+VIEW_TEXT = "text"
+VIEW_RAW = "raw"
+
+CacheKey = Tuple[int, int, int, int, str]
+
+
+class _Entry(NamedTuple):
+    path: str
+    content: str
+    cost: int
+
+
+def _cache_key(stats: os.stat_result, view: str) -> CacheKey:
+    return (stats.st_dev, stats.st_ino, stats.st_size, stats.st_mtime_ns, view)
+
+
+def _head_lines(text: str, lines: int) -> str:
+    """The first ``lines`` lines of newline-translated ``text``."""
+    end = -1
+    for _ in range(lines):
+        end = text.find("\n", end + 1)
+        if end < 0:
+            return text
+    return text[: end + 1]
+
+
+class CachingStorage(StorageInterface):
+    """
+    ``StorageInterface`` decorator caching whole-file text reads.
+
+    Full and ``head`` reads of ``read_text_file`` and uncapped entries of
+    ``read_multiple_files`` are served from memory; every other call is
+    forwarded to ``backend`` unchanged.
+    """
+
+    def __init__(
+        self,
+        backend: StorageInterface,
+        allowed_directories: List[str],
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        max_entry_bytes: Optional[int] = None,
+        notifier: Optional[ChangeNotifier] = None,
+    ):
+        self.backend = backend
+        self.allowed_directories = [os.path.abspath(d) for d in allowed_directories]
+        self.allowed_roots = compile_roots(self.allowed_directories)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = (
+            max_bytes // 4 if max_entry_bytes is None else max_entry_bytes
+        )
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._keys_by_path: Dict[str, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if notifier is not None:
+            notifier.subscribe(self.handle_event)
+
+    def _stat(self, path: str) -> Optional[Tuple[str, os.stat_result]]:
+        """Validated path and stats of a regular file, or ``None``."""
+        try:
+            valid_path = validate_path(path, self.allowed_roots)
+            stats = os.stat(valid_path)
+        except Exception:
+            return None
+        if not stat.S_ISREG(stats.st_mode):
+            return None
+        return valid_path, stats
+
+    def _lookup(self, stats: os.stat_result, view: str) -> Optional[str]:
+        key = _cache_key(stats, view)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.content
+
+    def _store(
+        self, valid_path: str, stats: os.stat_result, view: str, content: str
+    ) -> None:
+        """Cache ``content`` if the file is still the version read."""
+        cost = sys.getsizeof(content)
+        if cost > self.max_entry_bytes:
+            return
+        try:
+            current = os.stat(valid_path)
+        except OSError:
+            return
+        key = _cache_key(stats, view)
+        if _cache_key(current, view) != key:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.cost
+                self._unlink_path(previous.path, key)
+            self._entries[key] = _Entry(valid_path, content, cost)
+            self._keys_by_path.setdefault(valid_path, set()).add(key)
+            self._bytes += cost
+            while self._bytes > self.max_bytes:
+                old_key, old = self._entries.popitem(last=False)
+                self._bytes -= old.cost
+                self._unlink_path(old.path, old_key)
+                self.evictions += 1
+
+    def _unlink_path(self, path: str, key: CacheKey) -> None:
+        keys = self._keys_by_path.get(path)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_path[path]
+
+    def invalidate(self, path: str, tree: bool = False) -> None:
+        """Drop the entries read through ``path`` (or anything below it)."""
+        path = os.path.abspath(path)
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            if tree:
+                paths = [
+                    p for p in self._keys_by_path if p == path or p.startswith(prefix)
+                ]
+            else:
+                paths = [path] if path in self._keys_by_path else []
+            for p in paths:
+                for key in self._keys_by_path.pop(p):
+                    entry = self._entries.pop(key, None)
+                    if entry is not None:
+                        self._bytes -= entry.cost
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._bytes = 0
+
+    def handle_event(self, event: FileEvent) -> None:
+        """``ChangeNotifier`` subscriber dropping entries of changed paths."""
+        tree = event.is_directory or event.type is EventType.OVERFLOW
+        self.invalidate(event.path, tree)
+        if event.dest_path:
+            self.invalidate(event.dest_path, tree)
+
+    def cache_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                enabled=True,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+            )
+
+    def read_text_file(
+        self,
+        path: str,
+        head: Optional[int] = None,
+        tail: Optional[int] = None,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+    ) -> str:
+        ranged = (tail, offset, length, start_line, end_line) != (None,) * 5
+        found = None if ranged else self._stat(path)
+        if found is None:
+            return self.backend.read_text_file(
+                path, head, tail, offset, length, start_line, end_line
+            )
+        valid_path, stats = found
+        content = self._lookup(stats, VIEW_TEXT)
+        if content is not None:
+            return _head_lines(content, head) if head else content
+        if head or stats.st_size > self.max_entry_bytes:
+            return self.backend.read_text_file(path, head)
+        content = self.backend.read_text_file(path)
+        self._store(valid_path, stats, VIEW_TEXT, content)
+        return content
+
+    def read_multiple_files(
+        self,
+        paths: List[str],
+        max_file_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        # A total budget is shared in request order, so cached entries
+        # cannot be served without changing what later files receive.
+        if max_total_bytes is not None:
+            return self.backend.read_multiple_files(
+                paths, max_file_bytes, max_total_bytes
+            )
+        cached: Dict[str, str] = {}
+        pending: Dict[str, Tuple[str, os.stat_result]] = {}
+        missing: List[str] = []
+        for path in dict.fromkeys(paths):
+            found = self._stat(path)
+            if found is None:
+                missing.append(path)
+                continue
+            valid_path, stats = found
+            if max_file_bytes is not None and stats.st_size > max_file_bytes:
+                missing.append(path)
+                continue
+            content = self._lookup(stats, VIEW_RAW)
+            if content is not None:
+                cached[path] = content
+                continue
+            missing.append(path)
+            if stats.st_size <= self.max_entry_bytes:
+                pending[path] = found
+        if not missing:
+            return {"files": cached, "errors": {}}
+        result = self.backend.read_multiple_files(missing, max_file_bytes)
+        for path, (valid_path, stats) in pending.items():
+            content = result["files"].get(path)
+            if content is not None:
+                self._store(valid_path, stats, VIEW_RAW, content)
+        if not cached:
+            return result
+        files = {
+            path: cached[path] if path in cached else result["files"][path]
+            for path in dict.fromkeys(paths)
+            if path in cached or path in result["files"]
+        }
+        return {"files": files, "errors": result["errors"]}
+
+    def write_file(self, path: str, content: str) -> None:
+        try:
+            self.backend.write_file(path, content)
+        finally:
+            self.invalidate(path)
+
+    def append_file(self, path: str, content: str) -> None:
+        try:
+            self.backend.append_file(path, content)
+        finally:
+            self.invalidate(path)
+
+    def commit_file_upload(
+        self, handle: str, expected_bytes: Optional[int] = None
+    ) -> FileUpload:
+        upload = self.backend.commit_file_upload(handle, expected_bytes)
+        self.invalidate(upload.path)
+        return upload
+
+    def edit_file(
+        self,
+        path: str,
+        edits: List[Dict[str, Any]],
+        dry_run: bool = False,
+        max_hunks: Optional[int] = None,
+    ) -> str:
+        try:
+            return self.backend.edit_file(path, edits, dry_run, max_hunks)
+        finally:
+            if not dry_run:
+                self.invalidate(path)
+
+    def move_file(self, source: str, destination: str) -> None:
+        try:
+            self.backend.move_file(source, destination)
+        finally:
+            self.invalidate(source, tree=True)
+            self.invalidate(destination, tree=True)
+
+    def directory_tree(
+        self,
+        path: str,
+        max_depth: int = 2,
+        include_files: bool = False,
+        max_entries: int = 50,
+        exclude: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> DirectoryTree:
+        return self.backend.directory_tree(
+            path, max_depth, include_files, max_entries, exclude, timeout
+        )
+
+    def copy_file(
+        self, source: str, destination: str, overwrite: bool = False
+    ) -> CopyResult:
+        try:
+            return self.backend.copy_file(source, destination, overwrite)
+        finally:
+            self.invalidate(destination, tree=True)
+
+    def delete_file(self, path: str, recursive: bool = False) -> None:
+        try:
+            self.backend.delete_file(path, recursive)
+        finally:
+            self.invalidate(path, tree=True)
+
+    def read_media_file(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> MediaFile:
+        return self.backend.read_media_file(path, max_bytes, max_dimension)
+
+    def open_file_stream(self, path: str, chunk_size: int) -> FileStream:
+        return self.backend.open_file_stream(path, chunk_size)
+
+    def read_file_chunk(self, handle: str, index: int) -> str:
+        return self.backend.read_file_chunk(handle, index)
+
+    def close_file_stream(self, handle: str) -> None:
+        self.backend.close_file_stream(handle)
+
+    def open_file_upload(self, path: str) -> FileUpload:
+        return self.backend.open_file_upload(path)
+
+    def write_file_chunk(
+        self, handle: str, content: str, index: Optional[int] = None
+    ) -> FileUpload:
+        return self.backend.write_file_chunk(handle, content, index)
+
+    def abort_file_upload(self, handle: str) -> None:
+        self.backend.abort_file_upload(handle)
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def create_directory(self, path: str) -> None:
+        self.backend.create_directory(path)
+
+    def list_directory(
+        self,
+        path: str,
+        names_only: bool = False,
+        sort: str = "default",
+        filter: Optional[str] = None,
+    ) -> List[FileInfo]:
+        return self.backend.list_directory(path, names_only, sort, filter)
+
+    def list_directory_page(
+        self,
+        path: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: str = "default",
+        filter: Optional[str] = None,
+        names_only: bool = False,
+    ) -> DirectoryListing:
+        return self.backend.list_directory_page(
+            path, limit, cursor, sort, filter, names_only
+        )
+
+    def list_directory_with_sizes(
+        self,
+        path: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "default",
+        filter: Optional[str] = None,
+    ) -> DirectoryListing:
+        return self.backend.list_directory_with_sizes(path, limit, cursor, sort, filter)
+
+    def get_file_info(self, path: str) -> FileInfo:
+        return self.backend.get_file_info(path)
+
+    def search_files(
+        self,
+        path: str,
+        pattern: str,
+        recursive: bool = False,
+        names_only: bool = False,
+        max_results: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        content: Optional[str] = None,
+    ) -> SearchResult:
+        return self.backend.search_files(
+            path,
+            pattern,
+            recursive,
+            names_only,
+            max_results,
+            max_depth,
+            exclude,
+            timeout,
+            content,
+        )
+
+    def grep_files(
+        self,
+        path: str,
+        pattern: str,
+        regex: bool = False,
+        ignore_case: bool = False,
+        include: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        context_lines: int = 0,
+        max_results: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> GrepResult:
+        return self.backend.grep_files(
+            path,
+            pattern,
+            regex,
+            ignore_case,
+            include,
+            exclude,
+            context_lines,
+            max_results,
+            max_depth,
+            timeout,
+        )
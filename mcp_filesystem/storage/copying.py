@@ -0,0 +1,178 @@
+"""
+Server-side file copies that never pass data through Python buffers when the
+kernel can avoid it.
+
+For each file the fastest available method is tried in order:
+
+1. ``FICLONE`` reflink (btrfs, XFS, bcachefs...): the copy shares the
+   source's extents and costs no data I/O at all.
+2. ``os.copy_file_range``: an in-kernel copy, which NFS and SMB turn into a
+   server-side copy and some filesystems into a reflink.
+3. ``os.sendfile``: an in-kernel copy for kernels or filesystem pairs that
+   reject ``copy_file_range`` (e.g. across devices before Linux 5.3).
+4. A plain read/write loop.
+
+A method that fails with an "unsupported" error is remembered per device
+pair and not retried for the following files.
+"""
+
+import errno
+import os
+import stat
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# _IOW(0x94, 9, int) from linux/fs.h.
+FICLONE = 0x40049409
+COPY_CHUNK = 64 * 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+METHOD_CLONE = "clone"
+METHOD_COPY_FILE_RANGE = "copy_file_range"
+METHOD_SENDFILE = "sendfile"
+METHOD_READ_WRITE = "read_write"
+
+# Errors meaning "this method does not work for these files", as opposed to
+# real I/O failures, which are raised.
+_UNSUPPORTED = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.ETXTBSY,
+    errno.EXDEV,
+}
+
+OnCopied = Callable[[int], None]
+
+
+class FileCopier:
+    """
+    Copies file contents between open descriptors with the fastest method
+    the two files support.
+
+    Thread-safe. ``counts`` records how many files each method copied.
+    """
+
+    def __init__(self) -> None:
+        self._disabled: Set[Tuple[str, int, int]] = set()
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def copy(
+        self,
+        src_fd: int,
+        dst_fd: int,
+        size: int,
+        on_copied: Optional[OnCopied] = None,
+    ) -> str:
+        """
+        Copy ``size`` bytes from the start of ``src_fd`` to the empty
+        ``dst_fd`` and return the method used.
+
+        ``on_copied`` is called with the number of bytes of each chunk, so
+        long copies can report progress. Files that grew meanwhile are copied
+        in full by the read/write loop; the other methods stop at ``size``.
+        """
+        devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+        report = on_copied or (lambda _: None)
+        if size and self._enabled(METHOD_CLONE, devices) and fcntl is not None:
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            except OSError as e:
+                self._disable_on_unsupported(e, METHOD_CLONE, devices)
+            else:
+                report(size)
+                return self._count(METHOD_CLONE)
+        for method, kernel_copy in (
+            (METHOD_COPY_FILE_RANGE, getattr(os, "copy_file_range", None)),
+            (METHOD_SENDFILE, _sendfile if hasattr(os, "sendfile") else None),
+        ):
+            if kernel_copy is None or not self._enabled(method, devices):
+                continue
+            try:
+                copied = _copy_loop(kernel_copy, src_fd, dst_fd, size, report)
+            except OSError as e:
+                self._disable_on_unsupported(e, method, devices)
+                # Only a failure on the first call is a reason to fall back.
+                if e.errno not in _UNSUPPORTED or _position(dst_fd):
+                    raise
+                continue
+            if copied or not size:
+                return self._count(method)
+        _read_write(src_fd, dst_fd, report)
+        return self._count(METHOD_READ_WRITE)
+
+    def _enabled(self, method: str, devices: Tuple[int, int]) -> bool:
+        return (method,) + devices not in self._disabled
+
+    def _disable_on_unsupported(
+        self, error: OSError, method: str, devices: Tuple[int, int]
+    ) -> None:
+        if error.errno not in _UNSUPPORTED:
+            raise error
+        with self._lock:
+            self._disabled.add((method,) + devices)
+
+    def _count(self, method: str) -> str:
+        with self._lock:
+            self.counts[method] = self.counts.get(method, 0) + 1
+        return method
+
+
+def _position(fd: int) -> int:
+    return os.lseek(fd, 0, os.SEEK_CUR)
+
+
+def _sendfile(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def _copy_loop(
+    kernel_copy: Callable[[int, int, int], int],
+    src_fd: int,
+    dst_fd: int,
+    size: int,
+    report: OnCopied,
+) -> int:
+    """Call ``kernel_copy`` until ``size`` bytes are copied or it hits EOF."""
+    copied = 0
+    while copied < size:
+        sent = kernel_copy(src_fd, dst_fd, min(COPY_CHUNK, size - copied))
+        if sent == 0:
+            break
+        copied += sent
+        report(sent)
+    return copied
+
+
+def _read_write(src_fd: int, dst_fd: int, report: OnCopied) -> None:
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+    os.ftruncate(dst_fd, 0)
+    buffer = bytearray(READ_CHUNK)
+    view = memoryview(buffer)
+    while True:
+        read = os.readv(src_fd, [buffer])
+        if not read:
+            return
+        chunk = view[:read]
+        while chunk:
+            written = os.write(dst_fd, chunk)
+            chunk = chunk[written:]
+        report(read)
+
+
+def copy_metadata(dst_fd: int, source_stats: os.stat_result) -> None:
+    """Give ``dst_fd`` the permission bits and timestamps of the source."""
+    os.fchmod(dst_fd, stat.S_IMODE(source_stats.st_mode))
+    if os.utime in os.supports_fd:
+        os.utime(dst_fd, ns=(source_stats.st_atime_ns, source_stats.st_mtime_ns))
@@ -0,0 +1,216 @@
+"""
+Line diffs in unified format.
+
+``myers_opcodes`` is an O((N+M)·D) Myers diff that trims the common prefix
+and suffix first; it returns difflib-style opcodes and gives up on a single
+``replace`` once the edit distance exceeds a cap. ``format_unified`` groups
+opcodes into hunks exactly like ``difflib.unified_diff`` does, but reads
+lines through accessors, so callers that already know where the changes
+are can diff only those windows and never materialize the unchanged rest of
+the file.
+"""
+
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+Opcode = Tuple[str, int, int, int, int]
+
+DEFAULT_CONTEXT = 3
+DEFAULT_MAX_COST = 4000
+NO_NEWLINE = "\n\\ No newline at end of file\n"
+
+
+def _myers_matches(
+    a: Sequence[str], b: Sequence[str], max_cost: int
+) -> Optional[List[Tuple[int, int]]]:
+    """Matched index pairs of a shortest edit script, or ``None`` past the cap."""
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, max_cost) + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace: List[dict], n: int, m: int) -> List[Tuple[int, int]]:
+    matches: List[Tuple[int, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        x, y = prev_x, prev_y
+    matches.reverse()
+    return matches
+
+
+def myers_opcodes(
+    a: Sequence[str], b: Sequence[str], max_cost: int = DEFAULT_MAX_COST
+) -> List[Opcode]:
+    """Opcodes turning ``a`` into ``b``, in the format of ``SequenceMatcher``."""
+    n, m = len(a), len(b)
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and a[n - 1 - suffix] == b[m - 1 - suffix]
+    ):
+        suffix += 1
+    core_a = a[prefix : n - suffix]
+    core_b = b[prefix : m - suffix]
+    matches = _myers_matches(core_a, core_b, max_cost)
+    if matches is None:
+        matches = []
+    pairs = [(i + prefix, j + prefix) for i, j in matches]
+    pairs = (
+        [(i, i) for i in range(prefix)]
+        + pairs
+        + [(n - suffix + i, m - suffix + i) for i in range(suffix)]
+    )
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    index = 0
+    while index < len(pairs):
+        pi, pj = pairs[index]
+        if i < pi or j < pj:
+            tag = "replace" if i < pi and j < pj else "delete" if i < pi else "insert"
+            opcodes.append((tag, i, pi, j, pj))
+        run = index
+        while run + 1 < len(pairs) and pairs[run + 1] == (
+            pairs[run][0] + 1,
+            pairs[run][1] + 1,
+        ):
+            run += 1
+        end_i, end_j = pairs[run][0] + 1, pairs[run][1] + 1
+        opcodes.append(("equal", pi, end_i, pj, end_j))
+        i, j = end_i, end_j
+        index = run + 1
+    if i < n or j < m:
+        tag = "replace" if i < n and j < m else "delete" if i < n else "insert"
+        opcodes.append((tag, i, n, j, m))
+    return opcodes
+
+
+def group_opcodes(
+    opcodes: List[Opcode], context: int = DEFAULT_CONTEXT
+) -> Iterator[List[Opcode]]:
+    """Split opcodes into hunks with ``context`` lines around each change."""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    span = context + context
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > span:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _line(prefix: str, text: str) -> str:
+    return prefix + (text if text.endswith("\n") else text + NO_NEWLINE)
+
+
+def format_unified(
+    opcodes: List[Opcode],
+    line_a: Callable[[int], str],
+    line_b: Callable[[int], str],
+    fromfile: str = "",
+    tofile: str = "",
+    context: int = DEFAULT_CONTEXT,
+    max_hunks: Optional[int] = None,
+) -> str:
+    """
+    Render opcodes as a unified diff, reading lines through accessors.
+
+    At most ``max_hunks`` hunks are rendered; a note says how many were left
+    out.
+    """
+    out: List[str] = []
+    hunks = 0
+    omitted = 0
+    for group in group_opcodes(opcodes, context):
+        if max_hunks is not None and hunks >= max_hunks:
+            omitted += 1
+            continue
+        if not out:
+            out.append(f"--- {fromfile}\n+++ {tofile}\n")
+        hunks += 1
+        first, last = group[0], group[-1]
+        out.append(
+            f"@@ -{_format_range(first[1], last[2])} "
+            f"+{_format_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(_line(" ", line_a(i)) for i in range(i1, i2))
+                continue
+            if tag in ("replace", "delete"):
+                out.extend(_line("-", line_a(i)) for i in range(i1, i2))
+            if tag in ("replace", "insert"):
+                out.extend(_line("+", line_b(j)) for j in range(j1, j2))
+    if omitted:
+        out.append(f"... [{omitted} more hunk(s) omitted]\n")
+    return "".join(out)
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    context: int = DEFAULT_CONTEXT,
+    max_hunks: Optional[int] = None,
+) -> str:
+    """Unified diff of two line lists, for callers without change offsets."""
+    return format_unified(
+        myers_opcodes(a, b),
+        a.__getitem__,
+        b.__getitem__,
+        fromfile,
+        tofile,
+        context,
+        max_hunks,
+    )
@@ -0,0 +1,286 @@
+"""
+Single-pass multi-edit engine for edit_file.
+
+All anchors (``old_text`` of every edit) are located in one scan of the
+original text with a combined, longest-first alternation; occurrences hidden
+inside another match are recovered with bounded local searches, and only for
+anchors that can actually overlap. Each edit then picks its target among its
+occurrences (the only one, the Nth, those inside a line range, or all of
+them), overlapping targets are rejected, and the result is built with a
+single join. Every edit matches against the original text, never against
+the output of another edit.
+"""
+
+import bisect
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from mcp_filesystem.storage.diff import (
+    DEFAULT_CONTEXT,
+    Opcode,
+    format_unified,
+    myers_opcodes,
+)
+
+_LINE = re.compile(r"[^\n]*\n|[^\n]+")
+
+
+class EditError(ValueError):
+    """Raised when an edit cannot be applied unambiguously; nothing is written."""
+
+    pass
+
+
+class Replacement(NamedTuple):
+    """Replace ``text[start:end]`` with ``new_text``; ``edit`` is the edit index."""
+
+    start: int
+    end: int
+    new_text: str
+    edit: int
+
+
+def _preview(text: str) -> str:
+    return text if len(text) <= 50 else text[:47] + "..."
+
+
+def _can_overlap(first: str, second: str) -> bool:
+    """Whether an occurrence of ``second`` may start inside one of ``first``."""
+    if second in first[1:]:
+        return True
+    return any(
+        second.startswith(first[i:])
+        for i in range(max(1, len(first) - len(second) + 1), len(first))
+    )
+
+
+def find_anchors(text: str, anchors: Sequence[str]) -> Dict[str, List[int]]:
+    """
+    Start offsets of every occurrence, overlapping ones included, of each anchor.
+
+    The combined pattern tries longer anchors first, so ``finditer`` reports
+    at most one, non-overlapping, match per position. Shorter anchors sharing
+    that start, and anchors starting inside the match, are added afterwards.
+    """
+    distinct = sorted(set(anchors), key=len, reverse=True)
+    found: Dict[str, List[int]] = {anchor: [] for anchor in distinct}
+    if not distinct:
+        return found
+    prefixes = {
+        a: [b for b in distinct if b != a and a.startswith(b)] for a in distinct
+    }
+    overlapping = {a: [b for b in distinct if _can_overlap(a, b)] for a in distinct}
+    combined = re.compile("|".join(re.escape(anchor) for anchor in distinct))
+    for match in combined.finditer(text):
+        start, end = match.span()
+        anchor = match.group()
+        found[anchor].append(start)
+        for prefix in prefixes[anchor]:
+            found[prefix].append(start)
+        for other in overlapping[anchor]:
+            position = text.find(other, start + 1, end - 1 + len(other))
+            while 0 <= position < end:
+                found[other].append(position)
+                position = text.find(other, position + 1, end - 1 + len(other))
+    # Hidden occurrences can be reported twice (e.g. found inside two matches).
+    return {anchor: sorted(set(positions)) for anchor, positions in found.items()}
+
+
+class TextLines:
+    """Start offset of every ``\\n``-terminated line of a text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = [0] + [m.end() for m in re.finditer("\n", text)]
+        if self.starts[-1] == len(text) and len(self.starts) > 1:
+            self.starts.pop()
+
+    @property
+    def count(self) -> int:
+        return len(self.starts) if self.text else 0
+
+    def line_of(self, offset: int) -> int:
+        """0-based line holding ``offset``."""
+        return bisect.bisect_right(self.starts, offset) - 1
+
+    def start(self, line: int) -> int:
+        """Offset where 0-based ``line`` starts, or the text length past the end."""
+        return self.starts[line] if line < len(self.starts) else len(self.text)
+
+    def line(self, line: int) -> str:
+        """Text of 0-based ``line``, newline included."""
+        return self.text[self.start(line) : self.start(line + 1)]
+
+
+def plan_edits(text: str, edits: Sequence[Dict[str, Any]]) -> List[Replacement]:
+    """
+    Resolve ``edits`` against ``text`` into sorted, non-overlapping replacements.
+
+    Each edit has ``old_text`` and ``new_text`` and may set ``occurrence``
+    (1-based), ``start_line``/``end_line`` (1-based, inclusive) and
+    ``replace_all``. Without any of them the anchor must occur exactly once.
+
+    Raises:
+        EditError: If an anchor is missing or ambiguous, an occurrence is out
+            of range, or two edits target overlapping text.
+    """
+    anchors = find_anchors(text, [edit["old_text"] for edit in edits])
+    lines: Optional[TextLines] = None
+    replacements: List[Replacement] = []
+    for index, edit in enumerate(edits):
+        old_text = edit["old_text"]
+        positions = anchors[old_text]
+        start_line = edit.get("start_line")
+        end_line = edit.get("end_line")
+        where = ""
+        if start_line is not None or end_line is not None:
+            lines = lines or TextLines(text)
+            low = lines.start((start_line or 1) - 1)
+            high = len(text) if end_line is None else lines.start(end_line)
+            positions = positions[
+                bisect.bisect_left(positions, low) : bisect.bisect_right(
+                    positions, high - len(old_text)
+                )
+            ]
+            where = f" in lines {start_line or 1}-{end_line or 'end'}"
+        label = f"Edit {index} ('{_preview(old_text)}')"
+        if not positions:
+            raise EditError(f"{label}: text not found{where}.")
+        occurrence = edit.get("occurrence")
+        if edit.get("replace_all"):
+            chosen: List[int] = []
+            for position in positions:
+                if not chosen or position >= chosen[-1] + len(old_text):
+                    chosen.append(position)
+        elif occurrence is not None:
+            if occurrence > len(positions):
+                raise EditError(
+                    f"{label}: occurrence {occurrence} requested, but the text "
+                    f"occurs {len(positions)} time(s){where}."
+                )
+            chosen = [positions[occurrence - 1]]
+        elif len(positions) > 1:
+            raise EditError(
+                f"{label}: text occurs {len(positions)} times{where}; set "
+                "occurrence, start_line/end_line or replace_all."
+            )
+        else:
+            chosen = positions
+        replacements.extend(
+            Replacement(p, p + len(old_text), edit["new_text"], index) for p in chosen
+        )
+    replacements.sort()
+    for previous, current in zip(replacements, replacements[1:]):
+        if current.start < previous.end:
+            raise EditError(
+                f"Edits {previous.edit} and {current.edit} overlap at offset "
+                f"{current.start}."
+            )
+    return replacements
+
+
+def apply_replacements(
+    text: str,
+    replacements: Sequence[Replacement],
+    start: int = 0,
+    end: Optional[int] = None,
+) -> str:
+    """
+    Build the edited text with one join over untouched and new pieces.
+
+    With ``start``/``end`` only that slice of ``text`` is rebuilt; it must
+    contain every replacement.
+    """
+    pieces: List[str] = []
+    position = start
+    for replacement in replacements:
+        pieces.append(text[position : replacement.start])
+        pieces.append(replacement.new_text)
+        position = replacement.end
+    pieces.append(text[position:end])
+    return "".join(pieces)
+
+
+def _split_lines(text: str) -> List[str]:
+    return _LINE.findall(text)
+
+
+def _add_opcode(opcodes: List[Opcode], opcode: Opcode) -> None:
+    if opcode[1] == opcode[2] and opcode[3] == opcode[4]:
+        return
+    if opcodes and opcode[0] == "equal" and opcodes[-1][0] == "equal":
+        tag, i1, _, j1, _ = opcodes[-1]
+        opcodes[-1] = (tag, i1, opcode[2], j1, opcode[4])
+        return
+    opcodes.append(opcode)
+
+
+def preview_diff(
+    text: str,
+    replacements: Sequence[Replacement],
+    fromfile: str = "",
+    tofile: str = "",
+    context: int = DEFAULT_CONTEXT,
+    max_hunks: Optional[int] = None,
+) -> str:
+    """
+    Unified diff of applying ``replacements`` to ``text``.
+
+    Only the lines touched by the replacements are diffed (with
+    ``myers_opcodes``); everything between them is known to be unchanged
+    and is read back only as context, so the cost follows the size of the
+    edits rather than the size of the file.
+    """
+    lines = TextLines(text)
+    opcodes: List[Opcode] = []
+    new_lines: Dict[int, str] = {}
+    next_line = 0
+    delta = 0
+    index = 0
+    while index < len(replacements):
+        first = lines.line_of(replacements[index].start)
+        last = lines.line_of(replacements[index].end - 1)
+        stop = index + 1
+        region_start = lines.start(first)
+        while True:
+            while stop < len(replacements) and (
+                lines.line_of(replacements[stop].start) <= last
+            ):
+                last = max(last, lines.line_of(replacements[stop].end - 1))
+                stop += 1
+            region_end = lines.start(last + 1)
+            new_text = apply_replacements(
+                text, replacements[index:stop], region_start, region_end
+            )
+            # A replacement that drops the last newline joins the next line.
+            if region_end >= len(text) or not new_text or new_text.endswith("\n"):
+                break
+            last += 1
+        old_region = _split_lines(text[region_start:region_end])
+        new_region = _split_lines(new_text)
+        _add_opcode(
+            opcodes, ("equal", next_line, first, next_line + delta, first + delta)
+        )
+        for tag, i1, i2, j1, j2 in myers_opcodes(old_region, new_region):
+            _add_opcode(
+                opcodes,
+                (tag, first + i1, first + i2, first + delta + j1, first + delta + j2),
+            )
+        for offset, line in enumerate(new_region):
+            new_lines[first + delta + offset] = line
+        delta += len(new_region) - len(old_region)
+        next_line = last + 1
+        index = stop
+    _add_opcode(
+        opcodes,
+        ("equal", next_line, lines.count, next_line + delta, lines.count + delta),
+    )
+    return format_unified(
+        opcodes,
+        lines.line,
+        new_lines.__getitem__,
+        fromfile,
+        tofile,
+        context,
+        max_hunks,
+    )
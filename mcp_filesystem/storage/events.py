@@ -0,0 +1,67 @@
+"""
+Filesystem change events and the notifier that distributes them.
+
+Caches and indexes subscribe to a ``ChangeNotifier``. Both the watchers and the
+storage's own mutating operations publish to it, the latter synchronously, so
+a caller always observes its own writes.
+"""
+
+import enum
+import logging
+import threading
+from typing import Callable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventType(str, enum.Enum):
+    CREATED = "created"
+    MODIFIED = "modified"
+    DELETED = "deleted"
+    MOVED = "moved"
+    OVERFLOW = "overflow"
+
+
+class FileEvent(NamedTuple):
+    """
+    A change to a single path.
+
+    ``dest_path`` is only set for ``MOVED`` events. ``OVERFLOW`` means events
+    were lost and everything below ``path`` must be considered stale.
+    """
+
+    type: EventType
+    path: str
+    is_directory: bool = False
+    dest_path: Optional[str] = None
+
+
+Subscriber = Callable[[FileEvent], None]
+
+
+class ChangeNotifier:
+    """Fan-out of ``FileEvent`` objects to registered subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            if subscriber not in self._subscribers:
+                self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def publish(self, event: FileEvent) -> None:
+        """Deliver ``event`` to every subscriber on the calling thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber(event)
+            except Exception:
+                logger.exception("Change subscriber failed for %s", event)
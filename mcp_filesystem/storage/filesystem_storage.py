@@ -1,13 +1,127 @@
-import difflib
-import fnmatch
+import errno
+import mmap
 import os
-import shutil
+import re
 import stat
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from mcp_filesystem.mcp.core.entities import DirectoryListing, FileInfo, SearchResult
+from mcp_filesystem.mcp.core.entities import (
+    CacheStats,
+    CopyResult,
+    DirectoryListing,
+    DirectoryTree,
+    FileInfo,
+    FileStream,
+    FileUpload,
+    GrepMatch,
+    GrepResult,
+    MediaFile,
+    SearchResult,
+    TreeFile,
+    TreeNode,
+)
+from mcp_filesystem.storage.copying import FileCopier, copy_metadata
+from mcp_filesystem.storage.edits import (
+    apply_replacements,
+    plan_edits,
+    preview_diff,
+)
+from mcp_filesystem.storage.events import ChangeNotifier, EventType, FileEvent
+from mcp_filesystem.storage.grep import compile_query, scan_file
+from mcp_filesystem.storage.index import FileIndex
+from mcp_filesystem.storage.line_index import LineIndexCache
+from mcp_filesystem.storage.media import (
+    DEFAULT_MAX_MEDIA_BYTES,
+    SNIFF_BYTES,
+    downscale_image,
+    encode_base64,
+    encode_file_base64,
+    sniff_mime_type,
+)
+from mcp_filesystem.storage.pagination import (
+    DEFAULT_PAGE_SIZE,
+    InvalidCursorError,
+    ListingSession,
+    ListingSessions,
+    decode_cursor,
+    encode_cursor,
+    entry_sort_key,
+    info_sort_key,
+    resume_position,
+)
+from mcp_filesystem.storage.progress import OperationCancelled, Progress, reporting_to
+from mcp_filesystem.storage.readers import (
+    read_byte_range,
+    read_tail_lines,
+    read_text_prefix,
+    read_utf8_chunk,
+    truncation_marker,
+)
+from mcp_filesystem.storage.removal import DEFAULT_DELETE_WORKERS, remove_tree
 from mcp_filesystem.storage.storage import StorageInterface
-from mcp_filesystem.utils.path_validation import ensure_directory_exists, validate_path
+from mcp_filesystem.storage.streams import InvalidStreamError, ReadStream, ReadStreams
+from mcp_filesystem.storage.trigram import TrigramIndex, plan_query
+from mcp_filesystem.storage.uploads import Upload, Uploads
+from mcp_filesystem.storage.usage import UsageNode, scan_usage
+from mcp_filesystem.storage.writer import AtomicWriter, Durability, write_all
+from mcp_filesystem.utils.matcher import PatternMatcher, compile_patterns
+from mcp_filesystem.utils.path_validation import (
+    compile_roots,
+    ensure_directory_exists,
+    validate_path,
+)
+
+# Small files are handed to the copy workers in batches, so the per-task
+# overhead does not dominate trees of many tiny files.
+COPY_BATCH_FILES = 64
+COPY_BATCH_BYTES = 16 * 1024 * 1024
+
+
+# How many entries a walk reads between two deadline checks.
+DEADLINE_CHECK_INTERVAL = 1024
+
+
+class _WalkTimeout(Exception):
+    """Raised by a search walk once its deadline has passed."""
+
+    pass
+
+
+def _check_deadline(deadline: Optional[float]) -> None:
+    if deadline is not None and time.monotonic() > deadline:
+        raise _WalkTimeout()
+
+
+def _copy_batches(
+    files: List[Tuple[str, str, os.stat_result]],
+) -> Iterator[List[Tuple[str, str, os.stat_result]]]:
+    batch: List[Tuple[str, str, os.stat_result]] = []
+    size = 0
+    for item in files:
+        batch.append(item)
+        size += item[2].st_size
+        if len(batch) >= COPY_BATCH_FILES or size >= COPY_BATCH_BYTES:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
 
 
 class FilesystemStorage(StorageInterface):
@@ -15,17 +129,57 @@ class FilesystemStorage(StorageInterface):
     Concrete implementation of the StorageInterface for the local filesystem.
     """
 
-    def __init__(self, allowed_directories: List[str]):
+    def __init__(
+        self,
+        allowed_directories: List[str],
+        read_workers: int = 8,
+        index: Optional[FileIndex] = None,
+        notifier: Optional[ChangeNotifier] = None,
+        content_index: Optional[TrigramIndex] = None,
+        max_media_bytes: int = DEFAULT_MAX_MEDIA_BYTES,
+        durability: Durability = Durability.NONE,
+        copy_workers: int = 8,
+        delete_workers: int = DEFAULT_DELETE_WORKERS,
+    ):
         self.allowed_directories = [os.path.abspath(d) for d in allowed_directories]
+        self.allowed_roots = compile_roots(self.allowed_directories)
+        self.read_workers = read_workers
+        self.copy_workers = copy_workers
+        self.delete_workers = delete_workers
+        self.index = index
+        self.notifier = notifier or ChangeNotifier()
+        self.content_index = content_index
+        self.max_media_bytes = max_media_bytes
+        if index is not None:
+            self.notifier.subscribe(index.handle_event)
+        if content_index is not None:
+            self.notifier.subscribe(content_index.handle_event)
+        self._listings = ListingSessions()
+        self._line_indexes = LineIndexCache()
+        self._streams = ReadStreams()
+        self._writer = AtomicWriter(durability)
+        self._uploads = Uploads()
+        self._copier = FileCopier()
+        self._copy_lock = threading.Lock()
 
     def read_text_file(
-        self, path: str, head: Optional[int] = None, tail: Optional[int] = None
+        self,
+        path: str,
+        head: Optional[int] = None,
+        tail: Optional[int] = None,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
     ) -> str:
-        valid_path = validate_path(path, self.allowed_directories)
+        valid_path = validate_path(path, self.allowed_roots)
+        if start_line is not None or end_line is not None:
+            return self._read_line_range(valid_path, start_line or 1, end_line)
+        if offset is not None or length is not None:
+            return read_byte_range(valid_path, offset or 0, length)
+        if tail:
+            return read_tail_lines(valid_path, tail)
         with open(valid_path, "r", encoding="utf-8") as file:
-            if tail:
-                lines = file.readlines()
-                return "".join(lines[-tail:])
             if head:
                 lines = []
                 for i, line in enumerate(file):
@@ -35,127 +189,1171 @@ class FilesystemStorage(StorageInterface):
                 return "".join(lines)
             return file.read()
 
-    def read_multiple_files(self, paths: List[str]) -> Dict[str, Any]:
-        results = {}
-        errors = {}
-        for path in paths:
+    def _read_line_range(
+        self, valid_path: str, start_line: int, end_line: Optional[int]
+    ) -> str:
+        """Read whole lines through the cached newline-offset index."""
+        with open(valid_path, "rb") as file:
+            stats = os.fstat(file.fileno())
+            if stats.st_size == 0:
+                return ""
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                lines = self._line_indexes.get(valid_path, buf, stats)
+                start, end = lines.byte_range(
+                    buf,
+                    start_line,
+                    end_line if end_line is not None else lines.line_count,
+                )
+                data = buf[start:end]
+        return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+    def read_multiple_files(
+        self,
+        paths: List[str],
+        max_file_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        results: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        plan: List[Tuple[str, str, Optional[int], int]] = []
+        remaining = max_total_bytes
+        for path in dict.fromkeys(paths):
             try:
-                valid_path = validate_path(path, self.allowed_directories)
-                with open(valid_path, "r", encoding="utf-8") as file:
-                    results[path] = file.read()
+                valid_path = validate_path(path, self.allowed_roots)
+                stats = os.stat(valid_path)
+                if stat.S_ISDIR(stats.st_mode):
+                    raise IsADirectoryError(
+                        errno.EISDIR, os.strerror(errno.EISDIR), valid_path
+                    )
+                size = stats.st_size
             except Exception as e:
                 errors[path] = str(e)
+                continue
+            allotment = None if max_file_bytes is None else min(size, max_file_bytes)
+            if remaining is not None:
+                if remaining <= 0 and size > 0:
+                    errors[path] = (
+                        f"Skipped: total byte budget of {max_total_bytes} exhausted"
+                    )
+                    continue
+                allotment = min(size if allotment is None else allotment, remaining)
+                remaining -= allotment
+            plan.append((path, valid_path, allotment, size))
+
+        workers = max(1, min(self.read_workers, len(plan)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (path, allotment, size, pool.submit(read_text_prefix, valid, allotment))
+                for path, valid, allotment, size in plan
+            ]
+            for path, allotment, size, future in futures:
+                try:
+                    content = future.result()
+                except Exception as e:
+                    errors[path] = str(e)
+                    continue
+                if allotment is not None and allotment < size:
+                    content += truncation_marker(allotment, size)
+                results[path] = content
         return {"files": results, "errors": errors}
 
+    def read_media_file(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> MediaFile:
+        valid_path = validate_path(path, self.allowed_roots)
+        limit = min(max_bytes or self.max_media_bytes, self.max_media_bytes)
+        with open(valid_path, "rb") as file:
+            stats = os.fstat(file.fileno())
+            head = file.read(SNIFF_BYTES)
+        mime_type = sniff_mime_type(head, valid_path)
+        if max_dimension and mime_type.startswith("image/"):
+            downscaled = downscale_image(valid_path, mime_type, max_dimension)
+            if downscaled is not None:
+                data, mime_type = downscaled
+                self._check_media_size(path, len(data), limit)
+                return MediaFile.model_construct(
+                    path=path,
+                    mime_type=mime_type,
+                    size=stats.st_size,
+                    data=encode_base64(memoryview(data), len(data)),
+                    downscaled=True,
+                )
+        self._check_media_size(path, stats.st_size, limit)
+        encoded, size = encode_file_base64(valid_path)
+        return MediaFile.model_construct(
+            path=path, mime_type=mime_type, size=size, data=encoded, downscaled=False
+        )
+
+    @staticmethod
+    def _check_media_size(path: str, size: int, limit: int) -> None:
+        if size > limit:
+            raise ValueError(
+                f"'{path}' has {size} bytes, above the {limit}-byte media limit. "
+                "Use max_dimension to downscale images or read it with "
+                "open_file_stream."
+            )
+
+    def open_file_stream(self, path: str, chunk_size: int) -> FileStream:
+        valid_path = validate_path(path, self.allowed_roots)
+        stats = os.stat(valid_path)
+        if stat.S_ISDIR(stats.st_mode):
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+        stream = ReadStream(valid_path, stats, chunk_size)
+        self._streams.add(stream)
+        return FileStream(
+            handle=stream.id,
+            path=path,
+            size=stream.size,
+            chunk_size=stream.chunk_size,
+            chunk_count=stream.chunk_count,
+            resource_uri=stream.uri_template,
+        )
+
+    def read_file_chunk(self, handle: str, index: int) -> str:
+        stream = self._streams.get(handle)
+        if index >= stream.chunk_count:
+            raise ValueError(
+                f"Chunk {index} out of range; the stream has {stream.chunk_count}."
+            )
+        with open(stream.path, "rb") as file:
+            stream.check(os.fstat(file.fileno()))
+            return read_utf8_chunk(
+                file.fileno(),
+                index * stream.chunk_size,
+                stream.chunk_size,
+                stream.size,
+            )
+
+    def close_file_stream(self, handle: str) -> None:
+        if self._streams.remove(handle) is None:
+            raise InvalidStreamError(f"Unknown or expired stream '{handle}'.")
+
+    def cache_stats(self) -> CacheStats:
+        return CacheStats(enabled=False)
+
+    def close(self) -> None:
+        # Pending uploads would otherwise leave their temp files behind.
+        self._uploads.close()
+
     def write_file(self, path: str, content: str) -> None:
-        valid_path = validate_path(path, self.allowed_directories)
-        parent_dir = os.path.dirname(valid_path)
-        ensure_directory_exists(parent_dir)
-        with open(valid_path, "w", encoding="utf-8") as file:
-            file.write(content)
+        valid_path = validate_path(path, self.allowed_roots)
+        self._ensure_parent(valid_path)
+        existed = os.path.exists(valid_path)
+        self._writer.write(valid_path, content.encode("utf-8"))
+        self._publish(EventType.MODIFIED if existed else EventType.CREATED, valid_path)
+
+    def append_file(self, path: str, content: str) -> None:
+        valid_path = validate_path(path, self.allowed_roots)
+        self._ensure_parent(valid_path)
+        created = self._writer.append(valid_path, content.encode("utf-8"))
+        self._publish(EventType.CREATED if created else EventType.MODIFIED, valid_path)
+
+    def open_file_upload(self, path: str) -> FileUpload:
+        valid_path = validate_path(path, self.allowed_roots)
+        if os.path.isdir(valid_path):
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+        self._ensure_parent(valid_path)
+        fd, temp_path, target = self._writer.create_temp(valid_path)
+        os.close(fd)
+        upload = Upload(path, target, temp_path)
+        self._uploads.add(upload)
+        return self._upload_info(upload)
+
+    def write_file_chunk(
+        self, handle: str, content: str, index: Optional[int] = None
+    ) -> FileUpload:
+        upload = self._uploads.get(handle)
+        with upload.lock:
+            self._check_upload(upload)
+            if index is not None and index != upload.chunks:
+                raise ValueError(
+                    f"Expected chunk {upload.chunks} of upload '{handle}', "
+                    f"got {index}."
+                )
+            data = content.encode("utf-8")
+            try:
+                fd = os.open(upload.temp_path, os.O_WRONLY | os.O_APPEND)
+            except FileNotFoundError:
+                upload.discard_locked()
+                raise InvalidStreamError(
+                    f"The temp file of upload '{handle}' was removed; open a new "
+                    "upload."
+                )
+            try:
+                write_all(fd, data)
+            except BaseException:
+                # Drop the partial chunk so the client can resend it.
+                os.ftruncate(fd, upload.bytes_written)
+                raise
+            finally:
+                os.close(fd)
+            upload.bytes_written += len(data)
+            upload.chunks += 1
+            return self._upload_info(upload)
+
+    def commit_file_upload(
+        self, handle: str, expected_bytes: Optional[int] = None
+    ) -> FileUpload:
+        upload = self._uploads.get(handle)
+        with upload.lock:
+            self._check_upload(upload)
+            if expected_bytes is not None and expected_bytes != upload.bytes_written:
+                raise ValueError(
+                    f"Upload '{handle}' received {upload.bytes_written} bytes, "
+                    f"expected {expected_bytes}."
+                )
+            self._uploads.remove(handle)
+            existed = os.path.exists(upload.target)
+            try:
+                fd = os.open(upload.temp_path, os.O_RDONLY)
+            except BaseException:
+                upload.discard_locked()
+                raise
+            self._writer.commit(fd, upload.temp_path, upload.target)
+        self._publish(
+            EventType.MODIFIED if existed else EventType.CREATED, upload.target
+        )
+        return self._upload_info(upload, committed=True)
+
+    def abort_file_upload(self, handle: str) -> None:
+        self._uploads.remove(handle).discard()
+
+    @staticmethod
+    def _check_upload(upload: Upload) -> None:
+        """Reject an upload evicted or expired after it was looked up."""
+        if upload.discarded:
+            raise InvalidStreamError(
+                f"Upload '{upload.id}' expired or was evicted; open a new upload."
+            )
+
+    @staticmethod
+    def _upload_info(upload: Upload, committed: bool = False) -> FileUpload:
+        return FileUpload(
+            handle=upload.id,
+            path=upload.path,
+            bytes_written=upload.bytes_written,
+            chunks=upload.chunks,
+            committed=committed,
+        )
 
     def edit_file(
-        self, path: str, edits: List[Dict[str, str]], dry_run: bool = False
+        self,
+        path: str,
+        edits: List[Dict[str, Any]],
+        dry_run: bool = False,
+        max_hunks: Optional[int] = None,
     ) -> str:
-        valid_path = validate_path(path, self.allowed_directories)
+        valid_path = validate_path(path, self.allowed_roots)
         with open(valid_path, "r", encoding="utf-8") as file:
             original_content = file.read()
-        modified_content = original_content
-        changes = []
-        for edit in edits:
-            if edit["old_text"] in modified_content:
-                modified_content = modified_content.replace(
-                    edit["old_text"], edit["new_text"]
-                )
-                changes.append(
-                    f"Replaced: '{edit['old_text'][:50]}' with '{edit['new_text'][:50]}'"
-                )
-            else:
-                changes.append(f"Not found: '{edit['old_text'][:50]}'")
+        replacements = plan_edits(original_content, edits)
         if dry_run:
-            diff = list(
-                difflib.unified_diff(
-                    original_content.splitlines(keepends=True),
-                    modified_content.splitlines(keepends=True),
-                    fromfile=f"{path} (original)",
-                    tofile=f"{path} (modified)",
-                )
+            diff = preview_diff(
+                original_content,
+                replacements,
+                fromfile=f"{path} (original)",
+                tofile=f"{path} (modified)",
+                max_hunks=max_hunks,
             )
-            return f"Preview of changes:\n{''.join(diff)}"
-        else:
-            with open(valid_path, "w", encoding="utf-8") as file:
-                file.write(modified_content)
-            return "File edited successfully."
+            return f"Preview of changes:\n{diff}"
+        modified_content = apply_replacements(original_content, replacements)
+        self._writer.write(valid_path, modified_content.encode("utf-8"))
+        self._publish(EventType.MODIFIED, valid_path)
+        return (
+            f"File edited successfully: {len(replacements)} replacement(s) "
+            f"from {len(edits)} edit(s)."
+        )
 
     def create_directory(self, path: str) -> None:
-        valid_path = validate_path(path, self.allowed_directories)
+        valid_path = validate_path(path, self.allowed_roots)
         if not os.path.exists(valid_path):
+            created = self._first_missing_ancestor(valid_path)
             ensure_directory_exists(valid_path)
+            self._publish(EventType.CREATED, created, is_directory=True)
 
-    def list_directory(self, path: str) -> List[FileInfo]:
-        valid_path = validate_path(path, self.allowed_directories)
-        if not os.path.isdir(valid_path):
-            raise NotADirectoryError(f"'{path}' is not a directory.")
-        entries = []
-        for entry in os.listdir(valid_path):
-            entry_path = os.path.join(valid_path, entry)
-            entries.append(self._get_file_info(entry_path))
-        return sorted(entries, key=lambda x: (not x.is_directory, x.name.lower()))
+    def list_directory(
+        self,
+        path: str,
+        names_only: bool = False,
+        sort: str = "default",
+        filter: Optional[str] = None,
+    ) -> List[FileInfo]:
+        valid_path = self._validate_directory(path)
+        session = self._new_listing(valid_path, sort, filter)
+        if session.items is not None:
+            items = session.items
+        else:
+            assert session.stream is not None
+            items = list(session.stream)
+        return self._materialize(items, names_only)
+
+    def list_directory_page(
+        self,
+        path: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: str = "default",
+        filter: Optional[str] = None,
+        names_only: bool = False,
+    ) -> DirectoryListing:
+        valid_path = self._validate_directory(path)
+        session = None
+        if cursor:
+            payload = decode_cursor(cursor)
+            if (payload.get("p"), payload.get("m"), payload.get("f")) != (
+                valid_path,
+                sort,
+                filter,
+            ):
+                raise InvalidCursorError(
+                    "Cursor does not belong to this listing (path, sort or filter "
+                    "changed)."
+                )
+            session = self._listings.pop(payload.get("s", ""), payload["o"])
+            if session is None:
+                session = self._resume_listing(valid_path, sort, filter, payload)
+        else:
+            session = self._new_listing(valid_path, sort, filter)
 
-    def list_directory_with_sizes(self, path: str) -> DirectoryListing:
-        entries = self.list_directory(path)
-        return DirectoryListing(path=path, entries=entries, total_count=len(entries))
+        items, has_more = session.take(limit)
+        entries = self._materialize(items, names_only)
+        next_cursor = None
+        if has_more:
+            last_key = session.keys[session.offset - 1] if session.keys else None
+            next_cursor = encode_cursor(
+                {
+                    "s": session.id,
+                    "o": session.offset,
+                    "k": list(last_key) if last_key is not None else None,
+                    "p": valid_path,
+                    "m": sort,
+                    "f": filter,
+                }
+            )
+            session.touched = time.monotonic()
+            self._listings.add(session)
+        else:
+            session.close()
+        return DirectoryListing(
+            path=path,
+            entries=entries,
+            total_count=len(entries),
+            next_cursor=next_cursor,
+        )
+
+    def list_directory_with_sizes(
+        self,
+        path: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "default",
+        filter: Optional[str] = None,
+    ) -> DirectoryListing:
+        if limit is not None or cursor:
+            return self.list_directory_page(
+                path, limit or DEFAULT_PAGE_SIZE, cursor, sort, filter
+            )
+        entries = self.list_directory(path, sort=sort, filter=filter)
+        return DirectoryListing(
+            path=path, entries=entries, total_count=len(entries), next_cursor=None
+        )
 
     def get_file_info(self, path: str) -> FileInfo:
-        valid_path = validate_path(path, self.allowed_directories)
+        valid_path = validate_path(path, self.allowed_roots)
         return self._get_file_info(valid_path, path)
 
+    def directory_tree(
+        self,
+        path: str,
+        max_depth: int = 2,
+        include_files: bool = False,
+        max_entries: int = 50,
+        exclude: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> DirectoryTree:
+        valid_path = self._validate_directory(path)
+        scan = scan_usage(
+            valid_path,
+            self.read_workers,
+            include_files_to=max_depth if include_files else 0,
+            excluded=compile_patterns(exclude) if exclude else None,
+            timeout=timeout,
+        )
+        return DirectoryTree(
+            path=path,
+            root=self._tree_node(scan.root, max_depth, max_entries),
+            hardlinks_skipped=scan.hardlinks_skipped,
+            truncated=scan.truncated,
+            errors=scan.errors,
+        )
+
+    @classmethod
+    def _tree_node(cls, node: UsageNode, max_depth: int, max_entries: int) -> TreeNode:
+        """Largest-first nested view of a scanned directory, down to max_depth."""
+        children: Optional[List[Union[TreeNode, TreeFile]]] = None
+        omitted = 0
+        if node.depth < max_depth:
+            ranked = sorted(node.children, key=lambda c: (-c.size, c.name))
+            omitted = max(0, len(ranked) - max_entries)
+            children = [
+                (
+                    cls._tree_node(child, max_depth, max_entries)
+                    if child.is_directory
+                    else TreeFile.model_construct(
+                        name=child.name,
+                        size=child.size,
+                        disk_usage=child.disk_usage,
+                        hardlink=child.hardlink,
+                    )
+                )
+                for child in ranked[:max_entries]
+            ]
+        # Totals come straight from the scan, so validation is skipped.
+        return TreeNode.model_construct(
+            name=node.name,
+            size=node.size,
+            disk_usage=node.disk_usage,
+            files=node.files,
+            directories=node.directories,
+            children=children,
+            omitted=omitted,
+        )
+
     def search_files(
-        self, path: str, pattern: str, recursive: bool = False
+        self,
+        path: str,
+        pattern: str,
+        recursive: bool = False,
+        names_only: bool = False,
+        max_results: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        content: Optional[str] = None,
     ) -> SearchResult:
-        valid_base_path = validate_path(path, self.allowed_directories)
-        matches = []
-        if recursive:
-            for root, _, files in os.walk(valid_base_path):
-                for file in files:
-                    if fnmatch.fnmatch(file, pattern):
-                        file_path = os.path.join(root, file)
-                        matches.append(self._get_file_info(file_path))
-        else:
-            for entry in os.listdir(valid_base_path):
-                if fnmatch.fnmatch(entry, pattern):
-                    entry_path = os.path.join(valid_base_path, entry)
-                    if os.path.isfile(entry_path):
-                        matches.append(self._get_file_info(entry_path))
+        valid_base_path = validate_path(path, self.allowed_roots)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        matcher = compile_patterns([pattern])
+        excluded = compile_patterns(exclude) if exclude else None
+        if not recursive:
+            max_depth = 0
+
+        candidates: Optional[Iterator[FileInfo]] = None
+        if self.index:
+            rows = (
+                self.index.walk_files(valid_base_path)
+                if recursive
+                else self.index.children(valid_base_path)
+            )
+            if rows is not None:
+                candidates = self._filter_index_rows(
+                    rows,
+                    valid_base_path,
+                    matcher,
+                    excluded,
+                    max_depth,
+                    names_only,
+                    deadline,
+                )
+        if candidates is None:
+            to_info = self._entry_name_info if names_only else self._entry_info
+            candidates = (
+                to_info(entry)
+                for entry, rel_path in self._scan_files(
+                    valid_base_path, max_depth, excluded, deadline
+                )
+                if matcher(entry.name, rel_path)
+            )
+
+        content_query = compile_query(content) if content else None
+        indexed = (
+            self._content_candidates(valid_base_path, content, False)
+            if content
+            else None
+        )
+        may_contain = set(indexed) if indexed is not None else None
+
+        matches: List[FileInfo] = []
+        truncated_reason: Optional[Literal["max_results", "timeout"]] = None
+        try:
+            for info in candidates:
+                _check_deadline(deadline)
+                if content_query is not None:
+                    if may_contain is not None and info.path not in may_contain:
+                        continue
+                    if not self._scan_quietly(info.path, content_query, limit=1):
+                        continue
+                if max_results is not None and len(matches) >= max_results:
+                    truncated_reason = "max_results"
+                    break
+                matches.append(info)
+        except _WalkTimeout:
+            truncated_reason = "timeout"
+        if isinstance(candidates, Generator):
+            candidates.close()
         return SearchResult(
-            query=pattern, base_path=path, matches=matches, total_matches=len(matches)
+            query=pattern,
+            base_path=path,
+            matches=matches,
+            total_matches=len(matches),
+            truncated=truncated_reason is not None,
+            truncated_reason=truncated_reason,
+        )
+
+    def _filter_index_rows(
+        self,
+        rows: Iterable[Any],
+        base_path: str,
+        matcher: PatternMatcher,
+        excluded: Optional[PatternMatcher],
+        max_depth: Optional[int],
+        names_only: bool = False,
+        deadline: Optional[float] = None,
+    ) -> Iterator[FileInfo]:
+        """
+        Yield the index rows that match, described by a fresh ``stat`` (the
+        row's own size and timestamps may be stale) unless ``names_only``.
+        """
+        prefix_len = len(base_path.rstrip(os.sep)) + 1
+        for i, row in enumerate(rows):
+            if not i % DEADLINE_CHECK_INTERVAL:
+                _check_deadline(deadline)
+            if row[7]:
+                continue
+            rel_path = row[0][prefix_len:]
+            if os.sep != "/":
+                rel_path = rel_path.replace(os.sep, "/")
+            if not matcher(row[2], rel_path) or not self._within_walk(
+                rel_path, excluded, max_depth
+            ):
+                continue
+            if names_only:
+                yield self._row_name_info(row)
+                continue
+            try:
+                yield self._get_file_info(row[0])
+            except FileNotFoundError:
+                # Removed after its directory was checked.
+                continue
+
+    @staticmethod
+    def _within_walk(
+        rel_path: str, excluded: Optional[PatternMatcher], max_depth: Optional[int]
+    ) -> bool:
+        """
+        Whether a file found without walking (e.g. through an index) would
+        have been reached by ``_scan_files`` with the same limits.
+        """
+        if excluded is None and max_depth is None:
+            return True
+        parts = rel_path.split("/")
+        if max_depth is not None and len(parts) - 1 > max_depth:
+            return False
+        return excluded is None or not any(
+            excluded(part, "/".join(parts[: i + 1])) for i, part in enumerate(parts)
+        )
+
+    def grep_files(
+        self,
+        path: str,
+        pattern: str,
+        regex: bool = False,
+        ignore_case: bool = False,
+        include: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        context_lines: int = 0,
+        max_results: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> GrepResult:
+        valid_base_path = validate_path(path, self.allowed_roots)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        query = compile_query(pattern, regex, ignore_case)
+        if not os.path.isdir(valid_base_path):
+            files: Iterator[str] = iter([valid_base_path])
+        else:
+            included = compile_patterns([include]) if include else None
+            excluded = compile_patterns(exclude) if exclude else None
+            indexed = self._content_candidates(valid_base_path, pattern, regex)
+            if indexed is not None:
+                prefix_len = len(valid_base_path.rstrip(os.sep)) + 1
+                files = (
+                    candidate
+                    for candidate, rel_path in (
+                        (c, c[prefix_len:].replace(os.sep, "/")) for c in indexed
+                    )
+                    if (
+                        included is None
+                        or included(rel_path.rsplit("/", 1)[-1], rel_path)
+                    )
+                    and self._within_walk(rel_path, excluded, max_depth)
+                )
+            else:
+                files = (
+                    entry.path
+                    for entry, rel_path in self._scan_files(
+                        valid_base_path, max_depth, excluded, deadline
+                    )
+                    if (included is None or included(entry.name, rel_path))
+                    and entry.is_file()
+                )
+
+        matches: List[GrepMatch] = []
+        truncated_reason: Optional[Literal["max_results", "timeout"]] = None
+        files_scanned = 0
+        stop = threading.Event()
+        in_flight: Deque[Future] = deque()
+        workers = max(1, self.read_workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Results are collected in walk order; only a few files per worker
+            # are queued ahead, so an early stop leaves little work to cancel.
+            while True:
+                while len(in_flight) < workers * 4:
+                    try:
+                        file_path = next(files, None)
+                    except _WalkTimeout:
+                        truncated_reason = "timeout"
+                        break
+                    if file_path is None:
+                        break
+                    in_flight.append(
+                        pool.submit(
+                            self._scan_quietly,
+                            file_path,
+                            query,
+                            context_lines,
+                            max_results,
+                            stop,
+                        )
+                    )
+                if truncated_reason is not None or not in_flight:
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    truncated_reason = "timeout"
+                    break
+                found = in_flight.popleft().result()
+                files_scanned += 1
+                matches.extend(found)
+                if max_results is not None and len(matches) >= max_results:
+                    del matches[max_results:]
+                    truncated_reason = "max_results"
+                    break
+            stop.set()
+            for future in in_flight:
+                future.cancel()
+        if isinstance(files, Generator):
+            files.close()
+        return GrepResult(
+            query=pattern,
+            base_path=path,
+            matches=matches,
+            total_matches=len(matches),
+            files_scanned=files_scanned,
+            truncated=truncated_reason is not None,
+            truncated_reason=truncated_reason,
         )
 
+    def _content_candidates(
+        self, base_path: str, pattern: str, regex: bool
+    ) -> Optional[List[str]]:
+        """Files that may contain ``pattern``, according to the trigram index."""
+        if self.content_index is None:
+            return None
+        plan = plan_query(pattern, regex)
+        if plan is None:
+            return None
+        return self.content_index.candidates(base_path, plan)
+
+    @staticmethod
+    def _scan_quietly(
+        path: str,
+        query: "re.Pattern[bytes]",
+        context_lines: int = 0,
+        limit: Optional[int] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> List[GrepMatch]:
+        """Scan one file, treating unreadable or vanished files as empty."""
+        try:
+            return scan_file(path, query, context_lines, limit, stop)
+        except (OSError, ValueError):
+            return []
+
     def move_file(self, source: str, destination: str) -> None:
-        valid_source = validate_path(source, self.allowed_directories)
-        valid_destination = validate_path(destination, self.allowed_directories)
-        dest_parent = os.path.dirname(valid_destination)
-        ensure_directory_exists(dest_parent)
-        shutil.move(valid_source, valid_destination)
+        valid_source = validate_path(source, self.allowed_roots)
+        valid_destination = validate_path(destination, self.allowed_roots)
+        self._ensure_parent(valid_destination)
+        if os.path.isdir(valid_destination) and not os.path.samefile(
+            valid_source, valid_destination
+        ):
+            # Like shutil.move, a directory destination receives the source.
+            name = os.path.basename(valid_source)
+            valid_destination = validate_path(
+                os.path.join(valid_destination, name), self.allowed_roots
+            )
+            if os.path.lexists(valid_destination):
+                raise FileExistsError(f"'{valid_destination}' already exists.")
+        is_directory = os.path.isdir(valid_source)
+        try:
+            os.rename(valid_source, valid_destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            self._move_across_devices(valid_source, valid_destination)
+        self._publish(
+            EventType.MOVED,
+            valid_source,
+            is_directory=is_directory,
+            dest_path=valid_destination,
+        )
+
+    def _move_across_devices(self, source: str, destination: str) -> None:
+        """
+        Move ``source`` to another filesystem: copy it with the copy workers,
+        then delete it with the delete workers. If the copy fails or is
+        cancelled, the partial copy is removed and the source is left intact;
+        once the copy is complete the deletion is no longer cancellable.
+        """
+        if os.path.islink(source):
+            self._copy_symlink(source, destination)
+            os.unlink(source)
+            return
+        existed = os.path.lexists(destination)
+        result = CopyResult(source=source, destination=destination)
+        try:
+            if os.path.isdir(source):
+                self._copy_tree(source, destination, result)
+            else:
+                source_stats = os.stat(source)
+                progress = Progress(source_stats.st_size, f"Moving {source}")
+                self._copy_one(source, destination, source_stats, progress, result)
+            if result.errors:
+                path, error = next(iter(result.errors.items()))
+                raise OSError(
+                    f"Could not copy {len(result.errors)} entries across devices "
+                    f"(first: {path}: {error}); '{source}' was left in place."
+                )
+        except BaseException:
+            if not existed:
+                self._discard_partial_copy(destination)
+            raise
+        with reporting_to(None):
+            if os.path.isdir(source):
+                remove_tree(source, self.delete_workers)
+            else:
+                os.unlink(source)
+
+    def _discard_partial_copy(self, path: str) -> None:
+        """Best-effort, uncancellable removal of an incomplete copy."""
+        with reporting_to(None):
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    remove_tree(path, self.delete_workers)
+                else:
+                    os.unlink(path)
+            except OSError:
+                pass
+
+    def copy_file(
+        self, source: str, destination: str, overwrite: bool = False
+    ) -> CopyResult:
+        valid_source = validate_path(source, self.allowed_roots)
+        valid_destination = validate_path(destination, self.allowed_roots)
+        if os.path.isdir(valid_destination):
+            name = os.path.basename(valid_source)
+            destination = os.path.join(destination, name)
+            valid_destination = validate_path(
+                os.path.join(valid_destination, name), self.allowed_roots
+            )
+        source_stats = os.stat(valid_source)
+        is_directory = stat.S_ISDIR(source_stats.st_mode)
+        if valid_destination == valid_source or (
+            is_directory and valid_destination.startswith(valid_source + os.sep)
+        ):
+            raise ValueError(f"Cannot copy '{source}' onto or into itself.")
+        existed = os.path.lexists(valid_destination)
+        if existed and not overwrite:
+            raise FileExistsError(
+                f"'{destination}' already exists; set overwrite to replace it."
+            )
+        result = CopyResult(source=source, destination=destination)
+        self._ensure_parent(valid_destination)
+        if is_directory:
+            try:
+                self._copy_tree(valid_source, valid_destination, result)
+            except OperationCancelled:
+                if not existed:
+                    self._discard_partial_copy(valid_destination)
+                raise
+            finally:
+                self._publish(EventType.CREATED, valid_destination, is_directory=True)
+        else:
+            progress = Progress(source_stats.st_size, f"Copying {source}")
+            self._copy_one(
+                valid_source, valid_destination, source_stats, progress, result
+            )
+            self._publish(
+                EventType.MODIFIED if existed else EventType.CREATED, valid_destination
+            )
+        return result
+
+    def _copy_tree(self, source: str, destination: str, result: CopyResult) -> None:
+        """
+        Recreate the directories and symlinks of ``source`` while walking it,
+        then copy its files in parallel. Per-entry failures are collected in
+        ``result.errors``; permission bits of directories are applied last so
+        read-only directories can still be filled.
+        """
+        progress = Progress(message=f"Copying {source}")
+        files: List[Tuple[str, str, os.stat_result]] = []
+        directories: List[Tuple[str, os.stat_result]] = []
+        stack = [(source, destination)]
+        while stack:
+            progress.check()
+            src_dir, dst_dir = stack.pop()
+            try:
+                dir_stats = os.stat(src_dir)
+                self._make_copy_directory(dst_dir)
+                it = os.scandir(src_dir)
+            except OSError as e:
+                if src_dir == source:
+                    raise
+                result.errors[src_dir] = str(e)
+                continue
+            directories.append((dst_dir, dir_stats))
+            result.directories += 1
+            with it:
+                for entry in it:
+                    target = os.path.join(dst_dir, entry.name)
+                    try:
+                        if entry.is_symlink():
+                            self._copy_symlink(entry.path, target)
+                            result.symlinks += 1
+                        elif entry.is_dir():
+                            stack.append((entry.path, target))
+                        elif entry.is_file():
+                            files.append((entry.path, target, entry.stat()))
+                        else:
+                            result.errors[entry.path] = "Not a regular file; skipped"
+                    except OSError as e:
+                        result.errors[entry.path] = str(e)
+
+        progress.total = sum(stats.st_size for _, _, stats in files)
+        batches = list(_copy_batches(files))
+        workers = max(1, min(self.copy_workers, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._copy_batch, batch, progress, result)
+                for batch in batches
+            ]
+            for future in futures:
+                try:
+                    result.errors.update(future.result())
+                except OperationCancelled:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+        for dst_dir, dir_stats in reversed(directories):
+            try:
+                os.chmod(dst_dir, stat.S_IMODE(dir_stats.st_mode))
+                os.utime(dst_dir, ns=(dir_stats.st_atime_ns, dir_stats.st_mtime_ns))
+            except OSError as e:
+                result.errors.setdefault(dst_dir, str(e))
+
+    @staticmethod
+    def _make_copy_directory(path: str) -> None:
+        """Create ``path``, replacing a symlink so the copy never leaves the tree."""
+        if os.path.islink(path):
+            os.unlink(path)
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            if not os.path.isdir(path):
+                raise
+
+    @staticmethod
+    def _copy_symlink(source: str, destination: str) -> None:
+        if os.path.lexists(destination) and not os.path.isdir(destination):
+            os.unlink(destination)
+        os.symlink(os.readlink(source), destination)
+
+    def _copy_batch(
+        self,
+        batch: List[Tuple[str, str, os.stat_result]],
+        progress: Progress,
+        result: CopyResult,
+    ) -> Dict[str, str]:
+        errors: Dict[str, str] = {}
+        for source, destination, source_stats in batch:
+            try:
+                self._copy_one(source, destination, source_stats, progress, result)
+            except OSError as e:
+                errors[source] = str(e)
+        return errors
+
+    def _copy_one(
+        self,
+        source: str,
+        destination: str,
+        source_stats: os.stat_result,
+        progress: Progress,
+        result: CopyResult,
+    ) -> None:
+        """
+        Copy one file. A new ``destination`` is written in place; an existing
+        one is replaced atomically through a temp file.
+        """
+        progress.check()
+        src_fd = os.open(source, os.O_RDONLY)
+        try:
+            try:
+                fd, temp_path, target = self._writer.create_new(destination)
+            except FileExistsError:
+                if os.path.islink(destination):
+                    # Replace the link rather than write wherever it points.
+                    os.unlink(destination)
+                fd, temp_path, target = self._writer.create_temp(destination)
+            try:
+                method = self._copier.copy(
+                    src_fd, fd, source_stats.st_size, progress.advance
+                )
+                copy_metadata(fd, source_stats)
+            except BaseException:
+                os.close(fd)
+                os.unlink(temp_path)
+                raise
+        finally:
+            os.close(src_fd)
+        self._writer.commit(fd, temp_path, target)
+        with self._copy_lock:
+            result.files += 1
+            result.bytes += source_stats.st_size
+            result.methods[method] = result.methods.get(method, 0) + 1
 
     def delete_file(self, path: str, recursive: bool = False) -> None:
-        valid_path = validate_path(path, self.allowed_directories)
-        if os.path.isdir(valid_path):
+        valid_path = validate_path(path, self.allowed_roots)
+        is_directory = os.path.isdir(valid_path)
+        if is_directory:
             if recursive:
-                shutil.rmtree(valid_path)
+                remove_tree(valid_path, self.delete_workers)
             else:
                 os.rmdir(valid_path)
         else:
             os.remove(valid_path)
+        self._publish(EventType.DELETED, valid_path, is_directory=is_directory)
+
+    def _validate_directory(self, path: str) -> str:
+        valid_path = validate_path(path, self.allowed_roots)
+        if not os.path.isdir(valid_path):
+            raise NotADirectoryError(f"'{path}' is not a directory.")
+        return valid_path
+
+    @staticmethod
+    def _iter_entries(
+        directory: str, filter: Optional[str] = None
+    ) -> Iterator[os.DirEntry]:
+        matcher = compile_patterns([filter]) if filter else None
+        with os.scandir(directory) as it:
+            for entry in it:
+                if matcher is None or matcher(entry.name):
+                    yield entry
+
+    def _new_listing(
+        self, valid_path: str, sort: str, filter: Optional[str]
+    ) -> ListingSession:
+        """
+        Start a listing. Sorting only needs names and ``d_type`` (plus stats
+        for the size/modified orders); index rows are used when available.
+
+        Index rows only give membership and order: an in-place write does not
+        change the directory's mtime, so their sizes and times may be stale.
+        Entries are described by a fresh ``stat``, taken here for the
+        size/modified orders and otherwise when the page is materialized.
+        """
+        rows = self.index.children(valid_path) if self.index else None
+        if rows is not None:
+            matcher = compile_patterns([filter]) if filter else None
+            items: List[Any] = [
+                self._row_name_info(row)
+                for row in rows
+                if matcher is None or matcher(row[2])
+            ]
+            if sort in ("size", "modified"):
+                items = self._stat_infos(items)
+            key = info_sort_key(sort)
+        else:
+            key = entry_sort_key(sort)
+            if key is None:
+                return ListingSession(stream=self._iter_entries(valid_path, filter))
+            items = list(self._iter_entries(valid_path, filter))
+        if key is None:
+            return ListingSession(items=items)
+        keyed = sorted(((key(item), item) for item in items), key=lambda x: x[0])
+        return ListingSession(
+            items=[item for _, item in keyed], keys=[k for k, _ in keyed]
+        )
+
+    def _resume_listing(
+        self, valid_path: str, sort: str, filter: Optional[str], payload: dict
+    ) -> ListingSession:
+        """Rebuild an expired session and position it after the cursor."""
+        session = self._new_listing(valid_path, sort, filter)
+        if session.keys is not None:
+            session.offset = resume_position(session.keys, payload.get("k"))
+        elif session.items is not None:
+            session.offset = payload["o"]
+        else:
+            session.take(payload["o"])
+        return session
+
+    def _materialize(self, items: List[Any], names_only: bool) -> List[FileInfo]:
+        if items and isinstance(items[0], FileInfo):
+            return items if names_only else self._stat_infos(items)
+        to_info = self._entry_name_info if names_only else self._entry_info
+        return [to_info(entry) for entry in items]
+
+    def _publish(
+        self,
+        event_type: EventType,
+        path: str,
+        is_directory: bool = False,
+        dest_path: Optional[str] = None,
+    ) -> None:
+        self.notifier.publish(FileEvent(event_type, path, is_directory, dest_path))
+
+    @staticmethod
+    def _first_missing_ancestor(path: str) -> str:
+        missing = path
+        parent = os.path.dirname(missing)
+        while parent != missing and not os.path.exists(parent):
+            missing, parent = parent, os.path.dirname(parent)
+        return missing
+
+    def _ensure_parent(self, path: str) -> None:
+        parent_dir = os.path.dirname(path)
+        if not os.path.isdir(parent_dir):
+            created = self._first_missing_ancestor(parent_dir)
+            ensure_directory_exists(parent_dir)
+            self._publish(EventType.CREATED, created, is_directory=True)
 
     def _get_file_info(self, path: str, display_path: Optional[str] = None) -> FileInfo:
         stats = os.stat(path)
-        return FileInfo(
-            path=display_path or path,
-            name=os.path.basename(path),
+        return self._stats_info(display_path or path, os.path.basename(path), stats)
+
+    @staticmethod
+    def _stats_info(path: str, name: str, stats: os.stat_result) -> FileInfo:
+        # Values come straight from the kernel, so Pydantic validation is skipped.
+        return FileInfo.model_construct(
+            path=path,
+            name=name,
             size=stats.st_size,
-            is_directory=os.path.isdir(path),
+            is_directory=stat.S_ISDIR(stats.st_mode),
             created=stats.st_ctime,
             modified=stats.st_mtime,
             permissions=stat.filemode(stats.st_mode),
         )
+
+    @staticmethod
+    def _row_name_info(row: Sequence[Any]) -> FileInfo:
+        """Build a stat-free ``FileInfo`` from an index row's name and type."""
+        return FileInfo.model_construct(
+            path=row[0],
+            name=row[2],
+            is_directory=bool(row[7]),
+            size=None,
+            created=None,
+            modified=None,
+            permissions=None,
+        )
+
+    def _stat_infos(self, infos: List[FileInfo]) -> List[FileInfo]:
+        """
+        Describe each entry with a fresh ``stat``, skipping those removed since
+        they were listed; entries that already carry stats are kept as is.
+        """
+        result = []
+        for info in infos:
+            if info.permissions is not None:
+                result.append(info)
+                continue
+            try:
+                try:
+                    stats = os.stat(info.path)
+                except FileNotFoundError:
+                    # Dangling symlink: describe the link itself.
+                    stats = os.lstat(info.path)
+            except FileNotFoundError:
+                continue
+            result.append(self._stats_info(info.path, info.name, stats))
+        return result
+
+    def _entry_info(self, entry: os.DirEntry) -> FileInfo:
+        """Build a ``FileInfo`` for a scandir entry with a single ``stat``."""
+        try:
+            stats = entry.stat()
+        except FileNotFoundError:
+            # Dangling symlink: describe the link itself.
+            stats = entry.stat(follow_symlinks=False)
+        return self._stats_info(entry.path, entry.name, stats)
+
+    @staticmethod
+    def _entry_name_info(entry: os.DirEntry) -> FileInfo:
+        """Build a stat-free ``FileInfo`` using only the entry's ``d_type``."""
+        return FileInfo.model_construct(
+            path=entry.path,
+            name=entry.name,
+            is_directory=entry.is_dir(),
+            size=None,
+            created=None,
+            modified=None,
+            permissions=None,
+        )
+
+    @staticmethod
+    def _scan_files(
+        base_path: str,
+        max_depth: Optional[int] = None,
+        excluded: Optional[PatternMatcher] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[Tuple[os.DirEntry, str]]:
+        """
+        Yield ``(entry, relative_path)`` for the non-directory entries below
+        ``base_path``, lazily; relative paths are ``/``-separated.
+
+        Directories deeper than ``max_depth`` (0 = only ``base_path``) and
+        entries matched by ``excluded`` are pruned before being opened. Like
+        ``os.walk``, symlinks to directories are neither yielded nor followed.
+        Raises ``_WalkTimeout`` once ``deadline`` (a ``time.monotonic()``
+        value) has passed, even if the caller filters out every entry.
+        """
+        stack = [(base_path, "", 0)]
+        read = 0
+        while stack:
+            _check_deadline(deadline)
+            directory, prefix, depth = stack.pop()
+            try:
+                it = os.scandir(directory)
+            except OSError:
+                if directory == base_path:
+                    raise
+                continue
+            descend = max_depth is None or depth < max_depth
+            subdirs = []
+            with it:
+                for entry in it:
+                    read += 1
+                    if not read % DEADLINE_CHECK_INTERVAL:
+                        _check_deadline(deadline)
+                    rel_path = prefix + entry.name
+                    if excluded is not None and excluded(entry.name, rel_path):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        yield entry, rel_path
+                    elif descend and not entry.is_symlink():
+                        subdirs.append((entry.path, rel_path + "/", depth + 1))
+            stack.extend(reversed(subdirs))
@@ -0,0 +1,155 @@
+"""
+Content search over memory-mapped files.
+
+Each file is opened once, sniffed for binary content and mapped read-only;
+the compiled byte pattern then runs directly over the mapping, so file data
+is never copied into Python strings except for the lines that are returned.
+Line numbers are computed incrementally between consecutive matches, counting
+line breaks over bounded slices so a distant match costs no large copy.
+"""
+
+import mmap
+import os
+import re
+import threading
+from typing import List, Optional
+
+from mcp_filesystem.mcp.core.entities import GrepMatch
+
+BINARY_SNIFF_BYTES = 8192
+MAX_LINE_BYTES = 1024
+# Largest slice of the mapping copied at once to count line breaks.
+COUNT_CHUNK_BYTES = 1024 * 1024
+
+
+def compile_query(
+    pattern: str, regex: bool = False, ignore_case: bool = False
+) -> "re.Pattern[bytes]":
+    """
+    Compile a literal or regular expression for matching UTF-8 bytes.
+
+    Patterns run over raw bytes, so ``ignore_case`` and classes such as
+    ``\\w`` only cover ASCII.
+    """
+    source = pattern.encode("utf-8")
+    if not regex:
+        source = re.escape(source)
+    return re.compile(source, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+
+def _count_newlines(buf: mmap.mmap, start: int, end: int) -> int:
+    """Count ``\\n`` in ``buf[start:end]``, copying at most one chunk at a time."""
+    count = 0
+    while start < end:
+        stop = min(end, start + COUNT_CHUNK_BYTES)
+        count += buf[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def is_binary(head: bytes) -> bool:
+    """Treat data with a NUL byte near the start as binary, like git does."""
+    return b"\0" in head
+
+
+def _decode_line(data: bytes) -> str:
+    return data.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def _line_window(
+    buf: mmap.mmap, line_start: int, line_end: int, start: int, end: int
+) -> bytes:
+    """The matched line, cut to ``MAX_LINE_BYTES`` around the match."""
+    if line_end - line_start <= MAX_LINE_BYTES:
+        return buf[line_start:line_end]
+    half = max(0, (MAX_LINE_BYTES - (end - start)) // 2)
+    lo = max(line_start, start - half)
+    hi = min(line_end, max(end, lo + MAX_LINE_BYTES))
+    return buf[lo:hi]
+
+
+def _context_before(buf: mmap.mmap, line_start: int, count: int) -> List[str]:
+    lines: List[str] = []
+    end = line_start - 1
+    while len(lines) < count and end >= 0:
+        start = buf.rfind(b"\n", 0, end) + 1
+        lines.append(_decode_line(buf[start : min(end, start + MAX_LINE_BYTES)]))
+        end = start - 1
+    lines.reverse()
+    return lines
+
+
+def _context_after(buf: mmap.mmap, line_end: int, count: int) -> List[str]:
+    lines: List[str] = []
+    start = line_end + 1
+    size = len(buf)
+    while len(lines) < count and start < size:
+        end = buf.find(b"\n", start)
+        if end < 0:
+            end = size
+        lines.append(_decode_line(buf[start : min(end, start + MAX_LINE_BYTES)]))
+        start = end + 1
+    return lines
+
+
+def scan_file(
+    path: str,
+    query: "re.Pattern[bytes]",
+    context_lines: int = 0,
+    limit: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> List[GrepMatch]:
+    """
+    Return the lines of ``path`` that match ``query``, one entry per line.
+
+    Binary and empty files yield nothing. Scanning ends after ``limit``
+    matching lines or as soon as ``stop`` is set.
+    """
+    with open(path, "rb") as file:
+        if is_binary(file.read(BINARY_SNIFF_BYTES)):
+            return []
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            matches: List[GrepMatch] = []
+            line_number = 1
+            counted_to = 0
+            pos = 0
+            while pos < size:
+                if stop is not None and stop.is_set():
+                    break
+                found = query.search(buf, pos)
+                if found is None:
+                    break
+                start, end = found.span()
+                line_start = buf.rfind(b"\n", 0, start) + 1
+                line_end = buf.find(b"\n", max(start, end - 1))
+                if line_end < 0:
+                    line_end = size
+                line_number += _count_newlines(buf, counted_to, line_start)
+                counted_to = line_start
+                matches.append(
+                    GrepMatch.model_construct(
+                        path=path,
+                        line_number=line_number,
+                        byte_offset=start,
+                        line=_decode_line(
+                            _line_window(buf, line_start, line_end, start, end)
+                        ),
+                        before=(
+                            _context_before(buf, line_start, context_lines)
+                            if context_lines
+                            else []
+                        ),
+                        after=(
+                            _context_after(buf, line_end, context_lines)
+                            if context_lines
+                            else []
+                        ),
+                    )
+                )
+                if limit is not None and len(matches) >= limit:
+                    break
+                pos = line_end + 1
+            return matches
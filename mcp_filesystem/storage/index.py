@@ -0,0 +1,439 @@
+"""
+Persistent file-tree index backed by SQLite.
+
+The index stores one row per filesystem entry under the allowed directories
+(path, size, mode and timestamps) plus the mtime each directory had when it
+was last scanned. Rebuilds are incremental: a directory whose mtime has not
+changed since the last scan is not listed again, only descended into. Builds
+commit every ``BATCH_DIRS`` directories and release the lock in between, so
+change events and queries are not held up by a long build.
+"""
+
+import hashlib
+import os
+import sqlite3
+import stat
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mcp_filesystem.storage.events import EventType, FileEvent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mode INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    ctime REAL NOT NULL,
+    is_dir INTEGER NOT NULL,
+    is_link INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+ENTRY_COLUMNS = "path, parent, name, size, mode, mtime, ctime, is_dir, is_link"
+BATCH_DIRS = 100
+
+Row = Tuple[str, str, str, int, int, float, float, int, int]
+
+
+def default_index_path(roots: Sequence[str], kind: str = "index") -> str:
+    """
+    Return the default database location for a set of allowed directories.
+
+    ``kind`` names the database, so that several indexes of the same roots
+    (e.g. ``"index"`` and ``"trigram"``) live side by side.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    key = "\0".join(sorted(os.path.abspath(r) for r in roots))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_home, "mcp-filesystem", f"{kind}-{digest}.sqlite")
+
+
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """Return the half-open key range covering every path below ``path``."""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _make_row(path: str, stats: os.stat_result, is_link: bool) -> Row:
+    parent, name = os.path.split(path)
+    return (
+        path,
+        parent,
+        name,
+        stats.st_size,
+        stats.st_mode,
+        stats.st_mtime,
+        stats.st_ctime,
+        int(stat.S_ISDIR(stats.st_mode)),
+        int(is_link),
+    )
+
+
+class FileIndex:
+    """
+    On-disk index of the entries below a set of root directories.
+
+    The index is safe to share between threads; every access goes through a
+    single connection guarded by a lock.
+    """
+
+    def __init__(self, db_path: str, roots: Sequence[str]):
+        self.db_path = db_path
+        self.roots = self._normalize_roots(roots)
+        self.ready = False
+        self._lock = threading.RLock()
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _normalize_roots(roots: Sequence[str]) -> List[str]:
+        normalized = sorted({os.path.abspath(r) for r in roots})
+        kept: List[str] = []
+        for root in normalized:
+            if not any(root.startswith(k.rstrip(os.sep) + os.sep) for k in kept):
+                kept.append(root)
+        return kept
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def build(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the filesystem.
+
+        Args:
+            full: Rescan every directory even if its mtime is unchanged.
+
+        Returns:
+            Counters describing the work done.
+        """
+        started = time.monotonic()
+        counters = {"scanned_dirs": 0, "reused_dirs": 0, "removed_dirs": 0}
+        for root in self.roots:
+            with self._lock, self._conn:
+                try:
+                    root_stats = os.stat(root)
+                except OSError:
+                    self._delete_subtree(root, include_self=True)
+                    continue
+                self._upsert(_make_row(root, root_stats, os.path.islink(root)))
+            self._refresh_tree(root, full, counters)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('built_at', ?)",
+                (str(time.time()),),
+            )
+        self.ready = True
+        return {**counters, "seconds": round(time.monotonic() - started, 3)}
+
+    def build_in_background(self) -> threading.Thread:
+        """Run an incremental :meth:`build` on a daemon thread."""
+        thread = threading.Thread(
+            target=self.build, name="mcp-fs-index-build", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _refresh_tree(self, root: str, full: bool, counters: Dict[str, Any]) -> None:
+        """
+        Rescan the directories below ``root`` whose mtime changed, in
+        transactions of ``BATCH_DIRS`` directories each.
+        """
+        stack = [root]
+        while stack:
+            with self._lock, self._conn:
+                for _ in range(BATCH_DIRS):
+                    if not stack:
+                        break
+                    self._refresh_directory(stack.pop(), full, stack, counters)
+
+    def _refresh_directory(
+        self, directory: str, full: bool, stack: List[str], counters: Dict[str, Any]
+    ) -> None:
+        """Bring one directory up to date and push its subdirectories."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._delete_subtree(directory, include_self=True)
+            counters["removed_dirs"] += 1
+            return
+        known = self._conn.execute(
+            "SELECT mtime_ns FROM dirs WHERE path = ?", (directory,)
+        ).fetchone()
+        if not full and known is not None and known[0] == mtime_ns:
+            counters["reused_dirs"] += 1
+            stack.extend(
+                path
+                for (path,) in self._conn.execute(
+                    "SELECT path FROM entries "
+                    "WHERE parent = ? AND is_dir = 1 AND is_link = 0",
+                    (directory,),
+                )
+            )
+            return
+        counters["scanned_dirs"] += 1
+        stack.extend(self._scan_directory(directory, mtime_ns))
+
+    def _scan_directory(self, directory: str, mtime_ns: int) -> List[str]:
+        """Replace the children of ``directory`` and return its subdirectories."""
+        rows: List[Row] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        entry_stats = entry.stat()
+                        is_link = entry.is_symlink()
+                    except OSError:
+                        continue
+                    rows.append(_make_row(entry.path, entry_stats, is_link))
+                    if stat.S_ISDIR(entry_stats.st_mode) and not is_link:
+                        subdirs.append(entry.path)
+        except OSError:
+            self._delete_subtree(directory, include_self=False)
+            return []
+
+        current = {row[0] for row in rows}
+        for path, is_dir in self._conn.execute(
+            "SELECT path, is_dir FROM entries WHERE parent = ?", (directory,)
+        ).fetchall():
+            if path not in current and is_dir:
+                self._delete_subtree(path, include_self=True)
+        self._conn.execute("DELETE FROM entries WHERE parent = ?", (directory,))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO entries ({ENTRY_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)",
+            (directory, mtime_ns),
+        )
+        return subdirs
+
+    def _upsert(self, row: Row) -> None:
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO entries ({ENTRY_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            row,
+        )
+
+    def _delete_subtree(self, path: str, include_self: bool) -> None:
+        low, high = _subtree_bounds(path)
+        for table in ("entries", "dirs"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE path >= ? AND path < ?", (low, high)
+            )
+            if include_self:
+                self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def refresh_entry(self, path: str) -> None:
+        """Re-stat a single path after it was created, modified or removed."""
+        path = os.path.abspath(path)
+        if not self.covers(path):
+            return
+        with self._lock, self._conn:
+            try:
+                entry_stats = os.stat(path)
+            except OSError:
+                self._delete_subtree(path, include_self=True)
+            else:
+                self._upsert(_make_row(path, entry_stats, os.path.islink(path)))
+            self._touch_dir(os.path.dirname(path))
+
+    def move_entry(self, source: str, destination: str) -> None:
+        """Rename the rows of ``source`` (and its subtree) to ``destination``."""
+        source = os.path.abspath(source)
+        destination = os.path.abspath(destination)
+        if not self.covers(destination):
+            self.refresh_entry(source)
+            return
+        with self._lock, self._conn:
+            self._delete_subtree(destination, include_self=True)
+            low, high = _subtree_bounds(source)
+            offset = len(source) + 1
+            self._conn.execute(
+                "UPDATE entries SET path = ? || substr(path, ?), "
+                "parent = ? || substr(parent, ?) WHERE path >= ? AND path < ?",
+                (destination, offset, destination, offset, low, high),
+            )
+            self._conn.execute(
+                "UPDATE dirs SET path = ? || substr(path, ?) "
+                "WHERE path = ? OR (path >= ? AND path < ?)",
+                (destination, offset, source, low, high),
+            )
+            self._conn.execute("DELETE FROM entries WHERE path = ?", (source,))
+            self._touch_dir(os.path.dirname(source))
+        self.refresh_entry(destination)
+
+    def refresh_tree(self, path: str) -> None:
+        """Incrementally rescan the directory tree rooted at ``path``."""
+        path = os.path.abspath(path)
+        if not self.covers(path):
+            return
+        counters = {"scanned_dirs": 0, "reused_dirs": 0, "removed_dirs": 0}
+        self._refresh_tree(path, False, counters)
+
+    def handle_event(self, event: FileEvent) -> None:
+        """``ChangeNotifier`` subscriber keeping the index in sync."""
+        if event.type is EventType.MOVED and event.dest_path:
+            self.move_entry(event.path, event.dest_path)
+        elif event.type is EventType.OVERFLOW:
+            self.refresh_tree(event.path)
+        else:
+            self.refresh_entry(event.path)
+            if event.type is EventType.CREATED and event.is_directory:
+                self.refresh_tree(event.path)
+
+    def _touch_dir(self, directory: str) -> None:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+        self._conn.execute(
+            "UPDATE dirs SET mtime_ns = ? WHERE path = ?", (mtime_ns, directory)
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def covers(self, path: str) -> bool:
+        """Whether ``path`` lies below one of the indexed roots."""
+        return any(
+            path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+            for root in self.roots
+        )
+
+    def _is_scanned(self, directory: str) -> bool:
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM dirs WHERE path = ?", (directory,)
+            ).fetchone()
+            is not None
+        )
+
+    def children(self, directory: str) -> Optional[List[Row]]:
+        """
+        Return the rows directly inside ``directory``.
+
+        The directory mtime is checked first and the directory is rescanned if
+        it changed, so membership is always current. Returns ``None`` when the
+        directory is not indexed.
+        """
+        if not self.ready or not self.covers(directory):
+            return None
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT mtime_ns FROM dirs WHERE path = ?", (directory,)
+            ).fetchone()
+            if known is None:
+                return None
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                return None
+            if mtime_ns != known[0]:
+                with self._conn:
+                    self._scan_directory(directory, mtime_ns)
+            return self._conn.execute(
+                f"SELECT {ENTRY_COLUMNS} FROM entries WHERE parent = ?", (directory,)
+            ).fetchall()
+
+    def walk_files(
+        self, directory: str, batch_size: int = 1000
+    ) -> Optional[Iterator[Row]]:
+        """
+        Return an iterator over every indexed non-directory row below
+        ``directory``, or ``None`` when the directory is not indexed.
+
+        As in :meth:`children`, directory mtimes are checked first and the
+        directories that changed are rescanned, so the set of files is
+        current; their sizes and timestamps may still be stale.
+
+        Rows are fetched lazily in ``batch_size`` chunks (in path order), so a
+        caller that stops early never reads the rest of the subtree.
+        """
+        if not self.ready or not self.covers(directory):
+            return None
+        with self._lock:
+            if not self._is_scanned(directory):
+                return None
+        counters = {"scanned_dirs": 0, "reused_dirs": 0, "removed_dirs": 0}
+        self._refresh_tree(directory, False, counters)
+        return self._iter_subtree_files(directory, batch_size)
+
+    def _iter_subtree_files(self, directory: str, batch_size: int) -> Iterator[Row]:
+        low, high = _subtree_bounds(directory)
+        last = None
+        while True:
+            with self._lock:
+                if last is None:
+                    batch = self._conn.execute(
+                        f"SELECT {ENTRY_COLUMNS} FROM entries "
+                        "WHERE path >= ? AND path < ? AND is_dir = 0 "
+                        "ORDER BY path LIMIT ?",
+                        (low, high, batch_size),
+                    ).fetchall()
+                else:
+                    batch = self._conn.execute(
+                        f"SELECT {ENTRY_COLUMNS} FROM entries "
+                        "WHERE path > ? AND path < ? AND is_dir = 0 "
+                        "ORDER BY path LIMIT ?",
+                        (last, high, batch_size),
+                    ).fetchall()
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            last = batch[-1][0]
+
+    def status(self) -> Dict[str, Any]:
+        """Summarize the contents of the index."""
+        with self._lock:
+            files, dirs = self._conn.execute(
+                "SELECT COALESCE(SUM(is_dir = 0), 0), COALESCE(SUM(is_dir = 1), 0) "
+                "FROM entries"
+            ).fetchone()
+            scanned = self._conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+            built_at = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'built_at'"
+            ).fetchone()
+        return {
+            "db_path": self.db_path,
+            "roots": self.roots,
+            "files": files,
+            "directories": dirs,
+            "scanned_directories": scanned,
+            "built_at": float(built_at[0]) if built_at else None,
+            "db_bytes": os.path.getsize(self.db_path),
+            "ready": self.ready,
+        }
@@ -0,0 +1,106 @@
+"""
+Cached newline-offset indexes for line-range reads.
+
+The first line-range read of a file scans it through an mmap and records,
+in an ``array('q')``, how many newlines precede each fixed-size block
+(a checkpoint every ``CHECKPOINT_BYTES``). A later read of any window
+bisects to the block holding its first line and only splits that block,
+so it costs O(window + block) instead of O(file).
+
+A checkpoint per block rather than an offset per line keeps the index at
+8 bytes per 64 KiB, and building it is a byte count that runs in C.
+Entries are validated against the file's ``st_mtime_ns`` and ``st_size`` on
+every use and rebuilt when either changed.
+"""
+
+import bisect
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Tuple
+
+CHECKPOINT_BYTES = 64 * 1024
+DEFAULT_MAX_FILES = 64
+
+
+class LineOffsets:
+    """Newline checkpoints of one file, as of ``mtime_ns``/``size``."""
+
+    def __init__(
+        self,
+        checkpoints: "array[int]",
+        mtime_ns: int,
+        size: int,
+        ends_with_newline: bool,
+    ):
+        self.checkpoints = checkpoints
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.line_count = checkpoints[-1] + int(size > 0 and not ends_with_newline)
+
+    def line_start(self, buf: mmap.mmap, line: int) -> int:
+        """Byte offset where ``line`` (1-based) starts, or the size past EOF."""
+        newlines = line - 1
+        if newlines <= 0:
+            return 0
+        if newlines > self.checkpoints[-1]:
+            return self.size
+        block = bisect.bisect_left(self.checkpoints, newlines) - 1
+        block_start = block * CHECKPOINT_BYTES
+        skip = newlines - self.checkpoints[block]
+        chunk = buf[block_start : block_start + CHECKPOINT_BYTES]
+        parts = chunk.split(b"\n", skip)
+        return block_start + sum(map(len, parts[:skip])) + skip
+
+    def byte_range(
+        self, buf: mmap.mmap, start_line: int, end_line: int
+    ) -> Tuple[int, int]:
+        """Byte span of lines ``start_line``..``end_line`` (1-based, inclusive)."""
+        if start_line > self.line_count:
+            return self.size, self.size
+        return self.line_start(buf, start_line), self.line_start(buf, end_line + 1)
+
+
+def build_line_offsets(buf: mmap.mmap, size: int) -> "array[int]":
+    """Count the newlines before each ``CHECKPOINT_BYTES`` block of ``buf``."""
+    checkpoints = array("q", [0])
+    total = 0
+    for block_start in range(0, size, CHECKPOINT_BYTES):
+        total += buf[block_start : block_start + CHECKPOINT_BYTES].count(b"\n")
+        checkpoints.append(total)
+    return checkpoints
+
+
+class LineIndexCache:
+    """LRU cache of ``LineOffsets`` keyed by path."""
+
+    def __init__(self, max_files: int = DEFAULT_MAX_FILES):
+        self.max_files = max_files
+        self._entries: "OrderedDict[str, LineOffsets]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, buf: mmap.mmap, stats: os.stat_result) -> LineOffsets:
+        """Return the index of the file mapped as ``buf``, rebuilding it if stale."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if (
+                entry is not None
+                and entry.mtime_ns == stats.st_mtime_ns
+                and entry.size == stats.st_size
+            ):
+                self._entries.move_to_end(path)
+                return entry
+        entry = LineOffsets(
+            build_line_offsets(buf, stats.st_size),
+            stats.st_mtime_ns,
+            stats.st_size,
+            stats.st_size > 0 and buf[stats.st_size - 1] == 0x0A,
+        )
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+        return entry
@@ -0,0 +1,113 @@
+"""
+Helpers for returning binary files as base64 media content.
+
+The file is memory-mapped and encoded in blocks straight into a
+preallocated output buffer, so the raw bytes are never copied into a
+``bytes`` object of their own. Large images can optionally be downscaled
+with Pillow (an optional dependency) before encoding.
+"""
+
+import binascii
+import io
+import mimetypes
+import mmap
+import os
+from typing import Optional, Tuple
+
+DEFAULT_MAX_MEDIA_BYTES = 10 * 1024 * 1024
+ENCODE_BLOCK_BYTES = 3 * 64 * 1024  # multiple of 3: no padding between blocks
+
+# (offset, signature, MIME type); checked in order.
+_SIGNATURES = (
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"BM", "image/bmp"),
+    (0, b"II*\x00", "image/tiff"),
+    (0, b"MM\x00*", "image/tiff"),
+    (0, b"\x00\x00\x01\x00", "image/x-icon"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"\xff\xfb", "audio/mpeg"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"\x1a\x45\xdf\xa3", "video/webm"),
+    (4, b"ftyp", "video/mp4"),
+)
+_RIFF_TYPES = {b"WEBP": "image/webp", b"WAVE": "audio/wav", b"AVI ": "video/x-msvideo"}
+SNIFF_BYTES = 512
+_DOWNSCALE_FORMATS = ("PNG", "JPEG", "WEBP", "GIF")
+
+
+def sniff_mime_type(head: bytes, path: str) -> str:
+    """Guess the MIME type from magic bytes, then from the file extension."""
+    if head.startswith(b"RIFF") and head[8:12] in _RIFF_TYPES:
+        return _RIFF_TYPES[head[8:12]]
+    for offset, signature, mime_type in _SIGNATURES:
+        if head.startswith(signature, offset):
+            return mime_type
+    stripped = head.lstrip()
+    if stripped.startswith(b"<svg") or (
+        stripped.startswith(b"<?xml") and b"<svg" in head
+    ):
+        return "image/svg+xml"
+    guessed, _ = mimetypes.guess_type(path)
+    return guessed or "application/octet-stream"
+
+
+def encode_base64(data: "memoryview | mmap.mmap", size: int) -> str:
+    """Base64-encode ``size`` bytes of ``data`` block by block."""
+    out = bytearray(4 * ((size + 2) // 3))
+    view = memoryview(data)
+    written = 0
+    try:
+        for start in range(0, size, ENCODE_BLOCK_BYTES):
+            block = binascii.b2a_base64(
+                view[start : start + ENCODE_BLOCK_BYTES], newline=False
+            )
+            out[written : written + len(block)] = block
+            written += len(block)
+    finally:
+        view.release()
+    return out.decode("ascii")
+
+
+def encode_file_base64(path: str) -> Tuple[str, int]:
+    """Return the base64 text of a file and its size, encoding from an mmap."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return "", 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return encode_base64(buf, size), size
+
+
+def downscale_image(
+    path: str, mime_type: str, max_dimension: int
+) -> Optional[Tuple[bytes, str]]:
+    """
+    Shrink an image so neither side exceeds ``max_dimension`` pixels.
+
+    Returns the re-encoded image and its MIME type, or ``None`` if Pillow is
+    not installed, the format is not supported, or no resize was needed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as image:
+            if max(image.size) <= max_dimension:
+                return None
+            image_format = image.format if image.format in _DOWNSCALE_FORMATS else "PNG"
+            image.thumbnail((max_dimension, max_dimension))
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, format=image_format)
+    except (OSError, ValueError):
+        return None
+    return output.getvalue(), Image.MIME.get(image_format, mime_type)
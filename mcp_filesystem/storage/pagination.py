@@ -0,0 +1,181 @@
+"""
+Cursor-based pagination of directory listings.
+
+A listing session is created on the first page and kept in a small LRU cache,
+so later pages neither rescan nor re-sort the directory:
+
+* ``sort="none"`` keeps the live ``os.scandir`` iterator and simply continues
+  it; entries come out in directory order and nothing is materialized ahead.
+* Every other sort mode keeps the sorted snapshot of the directory (names and
+  ``d_type`` only; stats are taken page by page unless the sort needs them).
+
+Cursors are opaque, self-describing tokens. If the session they point to was
+evicted or the server restarted, the listing is rebuilt and resumed from the
+last sort key (or the entry offset for ``sort="none"``).
+"""
+
+import base64
+import bisect
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+SORT_MODES = ("default", "name", "size", "modified", "none")
+DEFAULT_PAGE_SIZE = 1000
+
+SortKey = Tuple[Any, ...]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or belongs to another listing."""
+
+    pass
+
+
+def entry_sort_key(sort: str) -> Optional[Callable[[os.DirEntry], SortKey]]:
+    """Return the key function for sorting ``DirEntry`` objects."""
+    if sort == "default":
+        return lambda e: (not _entry_is_dir(e), e.name.lower(), e.name)
+    if sort == "name":
+        return lambda e: (e.name,)
+    if sort == "size":
+        return lambda e: (_entry_stat(e).st_size, e.name)
+    if sort == "modified":
+        return lambda e: (_entry_stat(e).st_mtime, e.name)
+    if sort == "none":
+        return None
+    raise ValueError(f"Unknown sort mode '{sort}'. Use one of: {', '.join(SORT_MODES)}")
+
+
+def info_sort_key(sort: str) -> Optional[Callable[[Any], SortKey]]:
+    """Return the key function for sorting ``FileInfo`` objects."""
+    if sort == "default":
+        return lambda i: (not i.is_directory, i.name.lower(), i.name)
+    if sort == "name":
+        return lambda i: (i.name,)
+    if sort == "size":
+        return lambda i: (i.size or 0, i.name)
+    if sort == "modified":
+        return lambda i: (i.modified or 0.0, i.name)
+    if sort == "none":
+        return None
+    raise ValueError(f"Unknown sort mode '{sort}'. Use one of: {', '.join(SORT_MODES)}")
+
+
+def _entry_is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _entry_stat(entry: os.DirEntry) -> os.stat_result:
+    try:
+        return entry.stat()
+    except FileNotFoundError:
+        return entry.stat(follow_symlinks=False)
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+    if not isinstance(payload, dict) or "o" not in payload:
+        raise InvalidCursorError("Malformed cursor")
+    return payload
+
+
+class ListingSession:
+    """State needed to serve the next page of one listing."""
+
+    def __init__(
+        self,
+        items: Optional[List[Any]] = None,
+        keys: Optional[List[SortKey]] = None,
+        stream: Optional[Iterator[Any]] = None,
+    ):
+        self.id = uuid.uuid4().hex[:16]
+        self.items = items
+        self.keys = keys
+        self.stream = stream
+        self._source = stream
+        self.offset = 0
+        self.touched = time.monotonic()
+
+    def take(self, limit: int) -> Tuple[List[Any], bool]:
+        """Return the next ``limit`` items and whether more remain."""
+        if self.items is not None:
+            page = self.items[self.offset : self.offset + limit]
+            self.offset += len(page)
+            return page, self.offset < len(self.items)
+        assert self.stream is not None
+        page = list(itertools.islice(self.stream, limit + 1))
+        has_more = len(page) > limit
+        if has_more:
+            self.stream = itertools.chain([page.pop()], self.stream)
+        self.offset += len(page)
+        return page, has_more
+
+    def close(self) -> None:
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            close()
+
+
+class ListingSessions:
+    """LRU cache of open listing sessions with a time-to-live."""
+
+    def __init__(self, max_sessions: int = 64, ttl: float = 300.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, ListingSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, session: ListingSession) -> None:
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                evicted.close()
+
+    def pop(self, session_id: str, offset: int) -> Optional[ListingSession]:
+        """
+        Take the session out of the cache if it is positioned at ``offset``.
+
+        Sessions are removed while a page is being served so that two requests
+        with the same cursor never advance the same iterator.
+        """
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is None or session.offset != offset:
+                return None
+            del self._sessions[session_id]
+            return session
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        for session_id in [
+            sid for sid, s in self._sessions.items() if s.touched < deadline
+        ]:
+            self._sessions.pop(session_id).close()
+
+
+def resume_position(keys: List[SortKey], last_key: Optional[list]) -> int:
+    """Index of the first key strictly greater than ``last_key``."""
+    if last_key is None:
+        return 0
+    return bisect.bisect_right(keys, tuple(last_key))
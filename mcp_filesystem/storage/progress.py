@@ -0,0 +1,97 @@
+"""
+Progress reporting and cancellation for long-running storage operations.
+
+The server binds a reporter and a cancellation event to the current tool
+call with ``reporting_to``; storage code creates a ``Progress``, advances it
+and checks it without knowing whether anyone listens. Both live in context
+variables, which ``ToolExecutor`` copies into the worker thread running the
+call. A ``Progress`` captures them when it is created, so it can be used
+from helper threads that do not share that context, and it throttles
+reports so a tree of many small files does not flood the client.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+# progress, total, message
+Reporter = Callable[[float, Optional[float], Optional[str]], None]
+
+REPORT_INTERVAL = 0.25
+
+_reporter: contextvars.ContextVar[Optional[Reporter]] = contextvars.ContextVar(
+    "mcp_filesystem_progress_reporter", default=None
+)
+_cancelled: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "mcp_filesystem_cancelled", default=None
+)
+
+
+class OperationCancelled(Exception):
+    """Raised inside an operation whose caller cancelled it."""
+
+    pass
+
+
+@contextlib.contextmanager
+def reporting_to(
+    reporter: Optional[Reporter], cancelled: Optional[threading.Event] = None
+) -> Iterator[None]:
+    """
+    Send the progress of operations started in this context to ``reporter``
+    and stop them once ``cancelled`` is set. ``None`` unbinds either.
+    """
+    reporter_token = _reporter.set(reporter)
+    cancelled_token = _cancelled.set(cancelled)
+    try:
+        yield
+    finally:
+        _cancelled.reset(cancelled_token)
+        _reporter.reset(reporter_token)
+
+
+class Progress:
+    """
+    Thread-safe counter towards ``total`` that reports to the bound reporter.
+
+    Reports are sent at most every ``interval`` seconds, plus one when the
+    total is reached. Without a reporter, ``advance`` only counts. The
+    reporter must not block.
+    """
+
+    def __init__(
+        self,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+        interval: float = REPORT_INTERVAL,
+    ):
+        self.total = total
+        self.message = message
+        self.interval = interval
+        self.done = 0.0
+        self._reporter = _reporter.get()
+        self._cancelled = _cancelled.get()
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+
+    def check(self) -> None:
+        """Raise ``OperationCancelled`` if the caller cancelled the operation."""
+        if self._cancelled is not None and self._cancelled.is_set():
+            raise OperationCancelled("Operation cancelled by the client.")
+
+    def advance(self, amount: float) -> None:
+        """Count ``amount`` more units done; raises if cancelled meanwhile."""
+        self.check()
+        with self._lock:
+            self.done += amount
+            if self._reporter is None:
+                return
+            now = time.monotonic()
+            finished = self.total is not None and self.done >= self.total
+            if not finished and now - self._last_report < self.interval:
+                return
+            self._last_report = now
+            # Reported under the lock: MCP requires increasing progress values.
+            self._reporter(self.done, self.total, self.message)
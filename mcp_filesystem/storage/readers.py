@@ -0,0 +1,124 @@
+"""
+Low-level helpers for reading text files efficiently.
+"""
+
+import codecs
+import os
+from typing import List, Optional
+
+TRUNCATION_MARKER = "\n... [truncated: {shown} of {total} bytes shown]"
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def read_text_prefix(path: str, limit: Optional[int] = None) -> str:
+    """
+    Read at most ``limit`` bytes of a UTF-8 file.
+
+    When the limit falls in the middle of a multi-byte character, the partial
+    character is dropped instead of raising a decode error. Line endings are
+    normalized to ``\\n`` as in text mode.
+    """
+    with open(path, "rb") as file:
+        data = file.read() if limit is None else file.read(limit)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    text = decoder.decode(data, final=limit is None or len(data) < limit)
+    return _normalize_newlines(text)
+
+
+def read_tail_lines(path: str, lines: int, block_size: int = TAIL_BLOCK_SIZE) -> str:
+    """
+    Return the last ``lines`` lines of a UTF-8 file.
+
+    Blocks of ``block_size`` bytes are read backward from the end until enough
+    newlines have been seen, so time and memory depend on the length of the
+    tail, not on the size of the file. The cut is always made right after a
+    ``\\n`` byte, which never occurs inside a multi-byte UTF-8 sequence, so
+    the tail decodes cleanly. Line endings are normalized to ``\\n`` as in
+    text mode.
+    """
+    if lines <= 0:
+        return ""
+    with open(path, "rb") as file:
+        position = file.seek(0, os.SEEK_END)
+        blocks: List[bytes] = []
+        newlines = 0
+        # A trailing newline ends the last line; it does not start a new one.
+        skip_last = True
+        while position > 0 and newlines < lines:
+            step = min(block_size, position)
+            position -= step
+            file.seek(position)
+            block = file.read(step)
+            newlines += block.count(b"\n")
+            if skip_last:
+                skip_last = False
+                if block.endswith(b"\n"):
+                    newlines -= 1
+            blocks.append(block)
+    data = b"".join(reversed(blocks))
+    end = len(data) - 1 if data.endswith(b"\n") else len(data)
+    for _ in range(lines):
+        end = data.rfind(b"\n", 0, end)
+        if end < 0:
+            break
+    return _normalize_newlines(data[end + 1 :].decode("utf-8"))
+
+
+def _normalize_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def decode_utf8_window(data: bytes, at_start: bool, at_end: bool) -> str:
+    """
+    Decode a slice of a UTF-8 file, dropping the partial characters it may
+    start or end with (unless the slice starts or ends the file).
+    """
+    if not at_start:
+        skip = 0
+        while skip < min(3, len(data)) and data[skip] & 0xC0 == 0x80:
+            skip += 1
+        data = data[skip:]
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    return decoder.decode(data, final=at_end)
+
+
+def read_byte_range(path: str, offset: int, length: Optional[int] = None) -> str:
+    """
+    Read ``length`` bytes (or up to EOF) of a UTF-8 file starting at
+    ``offset``. Characters cut by either end of the range are dropped.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if length is None:
+            length = max(0, size - offset)
+        data = os.pread(file.fileno(), length, offset)
+    return decode_utf8_window(
+        data, at_start=offset == 0, at_end=offset + len(data) >= size
+    )
+
+
+def read_utf8_chunk(fd: int, start: int, length: int, size: int) -> str:
+    """
+    Read the chunk ``[start, start + length)`` of a UTF-8 file open as ``fd``.
+
+    Each character belongs to the chunk holding its first byte: continuation
+    bytes at the start are left to the previous chunk and a character cut at
+    the end is completed from the next one, so concatenating every chunk
+    reproduces the file exactly.
+    """
+    end = min(size, start + length)
+    if end <= start:
+        return ""
+    data = os.pread(fd, end - start + 3, start)
+    head = 0
+    if start > 0:
+        while head < min(3, len(data)) and data[head] & 0xC0 == 0x80:
+            head += 1
+    tail = end - start
+    while tail < len(data) and data[tail] & 0xC0 == 0x80:
+        tail += 1
+    return data[head:tail].decode("utf-8")
+
+
+def truncation_marker(shown: int, total: int) -> str:
+    return TRUNCATION_MARKER.format(shown=shown, total=total)
@@ -0,0 +1,228 @@
+"""
+Parallel recursive deletion with descriptor-relative system calls.
+
+``remove_tree`` opens every directory relative to its parent's descriptor
+(``O_NOFOLLOW``), lists it with ``os.scandir`` on that descriptor and removes
+its entries with ``unlinkat``/``rmdir`` relative to it, like the fd-based
+``shutil.rmtree``: paths are never re-resolved, so a directory swapped for a
+symlink mid-way cannot redirect the deletion outside the tree, and the
+kernel does not walk the full path for each of millions of entries.
+
+Subtrees are processed by a pool of workers that take directories from a
+shared stack. Taking the most recent one first keeps the walk depth-first,
+which bounds how many directory descriptors are open at a time. A directory
+is removed by whichever worker finishes its last subdirectory.
+"""
+
+import os
+import shutil
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from mcp_filesystem.storage.progress import OperationCancelled, Progress
+
+DEFAULT_DELETE_WORKERS = 8
+
+_DIR_FLAGS = (
+    os.O_RDONLY
+    | getattr(os, "O_DIRECTORY", 0)
+    | getattr(os, "O_NOFOLLOW", 0)
+    | getattr(os, "O_CLOEXEC", 0)
+)
+SUPPORTS_FD_WALK = {
+    os.open,
+    os.unlink,
+    os.rmdir,
+} <= os.supports_dir_fd and os.scandir in os.supports_fd
+
+
+class _Directory:
+    """A directory being emptied; ``pending`` counts unfinished work in it."""
+
+    __slots__ = ("parent", "parent_fd", "name", "path", "fd", "pending", "failed")
+
+    def __init__(
+        self, parent: Optional["_Directory"], parent_fd: int, name: str, path: str
+    ):
+        self.parent = parent
+        self.parent_fd = parent_fd
+        self.name = name
+        self.path = path
+        self.fd = -1
+        # One for its own scan, plus one per subdirectory found.
+        self.pending = 1
+        self.failed = False
+
+
+class _TreeRemover:
+    def __init__(self, workers: int, progress: Progress):
+        self.workers = workers
+        self.progress = progress
+        self.removed = 0
+        self.errors: List[OSError] = []
+        self.cancelled: Optional[OperationCancelled] = None
+        self._stack: List[_Directory] = []
+        self._open: List[_Directory] = []
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def run(self, root: _Directory) -> None:
+        self._stack.append(root)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self._work) for _ in range(self.workers)]
+                for future in futures:
+                    future.result()
+        finally:
+            for directory in self._open:
+                os.close(directory.fd)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stack and self._active and self.cancelled is None:
+                    self._cond.wait()
+                if not self._stack or self.cancelled is not None:
+                    self._cond.notify_all()
+                    return
+                directory = self._stack.pop()
+                self._active += 1
+            try:
+                self._empty(directory)
+            except OperationCancelled as e:
+                with self._cond:
+                    self.cancelled = self.cancelled or e
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._cond.notify_all()
+
+    def _empty(self, directory: _Directory) -> None:
+        """Delete the files of ``directory`` and queue its subdirectories."""
+        self.progress.check()
+        try:
+            fd = os.open(directory.name, _DIR_FLAGS, dir_fd=directory.parent_fd)
+        except FileNotFoundError:
+            self._done(directory)
+            return
+        except OSError as e:
+            self._fail(directory, e, directory.path)
+            self._done(directory)
+            return
+        with self._cond:
+            directory.fd = fd
+            self._open.append(directory)
+        removed = 0
+        try:
+            with os.scandir(fd) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        path = os.path.join(directory.path, entry.name)
+                        child = _Directory(directory, fd, entry.name, path)
+                        with self._cond:
+                            directory.pending += 1
+                            self._stack.append(child)
+                            self._cond.notify()
+                        continue
+                    try:
+                        os.unlink(entry.name, dir_fd=fd)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        path = os.path.join(directory.path, entry.name)
+                        self._fail(directory, e, path)
+        except OSError as e:
+            self._fail(directory, e, directory.path)
+        self.progress.advance(removed)
+        with self._cond:
+            self.removed += removed
+        self._done(directory)
+
+    def _fail(self, directory: _Directory, error: OSError, path: str) -> None:
+        error.filename = path
+        with self._cond:
+            self.errors.append(error)
+            directory.failed = True
+
+    def _done(self, directory: Optional[_Directory]) -> None:
+        """Finish one unit of work in ``directory`` and remove what emptied."""
+        while directory is not None:
+            with self._cond:
+                directory.pending -= 1
+                if directory.pending:
+                    return
+                if directory.fd >= 0:
+                    self._open.remove(directory)
+                    os.close(directory.fd)
+                    directory.fd = -1
+                failed = directory.failed
+            parent = directory.parent
+            if failed:
+                if parent is not None:
+                    with self._cond:
+                        parent.failed = True
+            else:
+                try:
+                    os.rmdir(directory.name, dir_fd=directory.parent_fd)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self._fail(parent or directory, e, directory.path)
+                else:
+                    with self._cond:
+                        self.removed += 1
+            directory = parent
+
+
+def remove_tree(
+    path: str,
+    workers: int = DEFAULT_DELETE_WORKERS,
+    progress: Optional[Progress] = None,
+) -> int:
+    """
+    Delete directory ``path`` and everything below it; returns the number of
+    entries removed.
+
+    Entries that cannot be removed are skipped and the rest of the tree is
+    still deleted; the first failure is raised at the end. ``progress``
+    counts removed files (there is no total) and cancelling it stops the
+    workers, leaving the remainder of the tree in place.
+
+    Raises:
+        OSError: If ``path`` is a symlink or not a directory, or some entries
+            could not be removed.
+        OperationCancelled: If the operation was cancelled.
+    """
+    progress = progress or Progress(message=f"Deleting {path}")
+    mode = os.lstat(path).st_mode
+    if stat.S_ISLNK(mode):
+        raise OSError(f"Cannot delete symbolic link '{path}' recursively.")
+    if not stat.S_ISDIR(mode):
+        raise NotADirectoryError(f"'{path}' is not a directory.")
+    if not SUPPORTS_FD_WALK:
+        shutil.rmtree(path)
+        return 0
+
+    parent_fd = os.open(os.path.dirname(path) or ".", _DIR_FLAGS & ~os.O_NOFOLLOW)
+    try:
+        remover = _TreeRemover(max(1, workers), progress)
+        remover.run(_Directory(None, parent_fd, os.path.basename(path), path))
+    finally:
+        os.close(parent_fd)
+    if remover.cancelled is not None:
+        raise remover.cancelled
+    if remover.errors:
+        first = remover.errors[0]
+        if len(remover.errors) > 1:
+            first.strerror = (
+                f"{first.strerror} (and {len(remover.errors) - 1} more errors)"
+            )
+        raise first
+    return remover.removed
@@ -1,7 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
-from mcp_filesystem.mcp.core.entities import DirectoryListing, FileInfo, SearchResult
+from mcp_filesystem.mcp.core.entities import (
+    CacheStats,
+    CopyResult,
+    DirectoryListing,
+    DirectoryTree,
+    FileInfo,
+    FileStream,
+    FileUpload,
+    GrepResult,
+    MediaFile,
+    SearchResult,
+)
 
 
 class StorageInterface(ABC):
@@ -11,21 +22,89 @@ class StorageInterface(ABC):
 
     @abstractmethod
     def read_text_file(
-        self, path: str, head: Optional[int] = None, tail: Optional[int] = None
+        self,
+        path: str,
+        head: Optional[int] = None,
+        tail: Optional[int] = None,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
     ) -> str:
         raise NotImplementedError
 
     @abstractmethod
-    def read_multiple_files(self, paths: List[str]) -> Dict[str, Any]:
+    def read_multiple_files(
+        self,
+        paths: List[str],
+        max_file_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
         raise NotImplementedError
 
+    @abstractmethod
+    def read_media_file(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> MediaFile:
+        raise NotImplementedError
+
+    @abstractmethod
+    def open_file_stream(self, path: str, chunk_size: int) -> FileStream:
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_file_chunk(self, handle: str, index: int) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def close_file_stream(self, handle: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def cache_stats(self) -> CacheStats:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release what the storage holds on disk; called on server shutdown."""
+
     @abstractmethod
     def write_file(self, path: str, content: str) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def append_file(self, path: str, content: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def open_file_upload(self, path: str) -> FileUpload:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_file_chunk(
+        self, handle: str, content: str, index: Optional[int] = None
+    ) -> FileUpload:
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_file_upload(
+        self, handle: str, expected_bytes: Optional[int] = None
+    ) -> FileUpload:
+        raise NotImplementedError
+
+    @abstractmethod
+    def abort_file_upload(self, handle: str) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     def edit_file(
-        self, path: str, edits: List[Dict[str, str]], dry_run: bool = False
+        self,
+        path: str,
+        edits: List[Dict[str, Any]],
+        dry_run: bool = False,
+        max_hunks: Optional[int] = None,
     ) -> str:
         raise NotImplementedError
 
@@ -34,11 +113,36 @@ class StorageInterface(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def list_directory(self, path: str) -> List[FileInfo]:
+    def list_directory(
+        self,
+        path: str,
+        names_only: bool = False,
+        sort: str = "default",
+        filter: Optional[str] = None,
+    ) -> List[FileInfo]:
         raise NotImplementedError
 
     @abstractmethod
-    def list_directory_with_sizes(self, path: str) -> DirectoryListing:
+    def list_directory_page(
+        self,
+        path: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: str = "default",
+        filter: Optional[str] = None,
+        names_only: bool = False,
+    ) -> DirectoryListing:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_directory_with_sizes(
+        self,
+        path: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "default",
+        filter: Optional[str] = None,
+    ) -> DirectoryListing:
         raise NotImplementedError
 
     @abstractmethod
@@ -47,14 +151,57 @@ class StorageInterface(ABC):
 
     @abstractmethod
     def search_files(
-        self, path: str, pattern: str, recursive: bool = False
+        self,
+        path: str,
+        pattern: str,
+        recursive: bool = False,
+        names_only: bool = False,
+        max_results: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        content: Optional[str] = None,
     ) -> SearchResult:
         raise NotImplementedError
 
+    @abstractmethod
+    def grep_files(
+        self,
+        path: str,
+        pattern: str,
+        regex: bool = False,
+        ignore_case: bool = False,
+        include: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        context_lines: int = 0,
+        max_results: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> GrepResult:
+        raise NotImplementedError
+
+    @abstractmethod
+    def directory_tree(
+        self,
+        path: str,
+        max_depth: int = 2,
+        include_files: bool = False,
+        max_entries: int = 50,
+        exclude: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> DirectoryTree:
+        raise NotImplementedError
+
     @abstractmethod
     def move_file(self, source: str, destination: str) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def copy_file(
+        self, source: str, destination: str, overwrite: bool = False
+    ) -> CopyResult:
+        raise NotImplementedError
+
     @abstractmethod
     def delete_file(self, path: str, recursive: bool = False) -> None:
         raise NotImplementedError
@@ -0,0 +1,102 @@
+"""
+Handles for reading large files in fixed-size chunks.
+
+Opening a stream only records the file's identity (path, size, mtime); no
+descriptor is held between calls. Every chunk read reopens the file, checks
+that it has not changed and ``pread``s one chunk, so server memory per
+request is bounded by the chunk size whatever the size of the file.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+STREAM_URI_SCHEME = "file-stream"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class InvalidStreamError(ValueError):
+    """Raised for unknown or expired handles and for files changed mid-stream."""
+
+    pass
+
+
+class ReadStream:
+    """Identity of a file being read chunk by chunk."""
+
+    def __init__(self, path: str, stats: os.stat_result, chunk_size: int):
+        self.id = uuid.uuid4().hex[:16]
+        self.path = path
+        self.size = stats.st_size
+        self.mtime_ns = stats.st_mtime_ns
+        self.chunk_size = chunk_size
+        self.touched = time.monotonic()
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    @property
+    def uri_template(self) -> str:
+        return f"{STREAM_URI_SCHEME}://{self.id}/{{index}}"
+
+    def check(self, stats: os.stat_result) -> None:
+        if stats.st_size != self.size or stats.st_mtime_ns != self.mtime_ns:
+            raise InvalidStreamError(
+                f"File '{self.path}' changed since the stream was opened; "
+                "open a new stream."
+            )
+
+
+class ReadStreams:
+    """LRU registry of open read streams with a time-to-live."""
+
+    def __init__(self, max_streams: int = 256, ttl: float = 600.0):
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self._streams: "OrderedDict[str, ReadStream]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, stream: ReadStream) -> None:
+        with self._lock:
+            self._expire()
+            self._streams[stream.id] = stream
+            while len(self._streams) > self.max_streams:
+                self._streams.popitem(last=False)
+
+    def get(self, stream_id: str) -> ReadStream:
+        with self._lock:
+            self._expire()
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                raise InvalidStreamError(
+                    f"Unknown or expired stream '{stream_id}'; open a new stream."
+                )
+            stream.touched = time.monotonic()
+            self._streams.move_to_end(stream_id)
+            return stream
+
+    def remove(self, stream_id: str) -> Optional[ReadStream]:
+        with self._lock:
+            return self._streams.pop(stream_id, None)
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        for stream_id in [
+            sid for sid, s in self._streams.items() if s.touched < deadline
+        ]:
+            del self._streams[stream_id]
+
+
+def parse_stream_uri(uri: str) -> Optional[Tuple[str, int]]:
+    """Split ``file-stream://<handle>/<index>`` into ``(handle, index)``."""
+    prefix = f"{STREAM_URI_SCHEME}://"
+    if not uri.startswith(prefix):
+        return None
+    handle, _, index = uri[len(prefix) :].partition("/")
+    if not handle or not index.isdigit():
+        return None
+    return handle, int(index)
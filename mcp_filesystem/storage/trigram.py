@@ -0,0 +1,537 @@
+"""
+Trigram inverted index over the contents of text files.
+
+Every text file below the allowed directories is reduced to the set of
+3-byte sequences it contains (ASCII-lowercased), stored in SQLite as
+``trigram -> file`` postings. A content query is turned into the trigrams
+any match must contain; the intersection of their postings is a small
+superset of the matching files, which are then confirmed by a real scan.
+
+Builds are incremental: a file is only re-read when its mtime or size
+changed. Files larger than ``max_file_bytes`` are recorded without postings
+and always returned as candidates; binary files are never candidates.
+
+Change events are not trusted to be complete (there may be no watcher at
+all), so every query first checks the directories below the queried one
+against the mtimes they had when last listed, as ``FileIndex`` does, and
+lists again only those that changed. That catches files created, removed or
+renamed behind the server's back with one ``stat`` per directory. A file
+rewritten in place does not touch its directory's mtime: the server's own
+writes and a watcher report it as an event, and builds, which stat every
+file, pick up the rest.
+"""
+
+import os
+import sqlite3
+import stat
+import threading
+import time
+from array import array
+from re import _constants as sre_constants  # type: ignore[attr-defined]
+from re import _parser as sre_parse  # type: ignore[attr-defined]
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from mcp_filesystem.storage.events import EventType, FileEvent
+from mcp_filesystem.storage.grep import BINARY_SNIFF_BYTES, is_binary
+from mcp_filesystem.storage.index import _subtree_bounds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    trigrams BLOB
+);
+CREATE INDEX IF NOT EXISTS files_parent ON files (parent);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, file_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+KIND_TEXT = 0
+KIND_BINARY = 1
+KIND_TOO_LARGE = 2
+
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+# Queries use at most this many trigrams per alternative; fewer constraints
+# only widen the candidate set, so long literals stay cheap to plan.
+MAX_QUERY_TRIGRAMS = 32
+BATCH_FILES = 500
+
+QueryPlan = List[Set[int]]
+
+_REPEATS = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+}
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+
+def trigrams_of(data: bytes) -> Set[int]:
+    """Return the distinct ASCII-lowercased trigrams of ``data`` as integers."""
+    data = data.lower()
+    grams = {data[i : i + 3] for i in range(len(data) - 2)}
+    return {int.from_bytes(g, "big") for g in grams}
+
+
+def _sequence_runs(items: Any) -> List[bytes]:
+    """Literal byte runs that every match of a parsed sequence must contain."""
+    runs: List[bytes] = []
+    current = bytearray()
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            current.append(av)
+            continue
+        if current:
+            runs.append(bytes(current))
+            current.clear()
+        if op is sre_constants.SUBPATTERN:
+            runs.extend(_sequence_runs(av[-1]))
+        elif op is _ATOMIC_GROUP:
+            runs.extend(_sequence_runs(av))
+        elif op in _REPEATS and av[0] >= 1:
+            runs.extend(_sequence_runs(av[2]))
+    if current:
+        runs.append(bytes(current))
+    return runs
+
+
+def plan_query(pattern: str, regex: bool = False) -> Optional[QueryPlan]:
+    """
+    Return the trigram sets a match must contain, one set per top-level
+    alternative, or ``None`` when the query cannot be narrowed.
+    """
+    source = pattern.encode("utf-8")
+    if regex:
+        try:
+            parsed = list(sre_parse.parse(source))
+        except Exception:
+            return None
+        if len(parsed) == 1 and parsed[0][0] is sre_constants.BRANCH:
+            alternatives = [_sequence_runs(seq) for seq in parsed[0][1][1]]
+        else:
+            alternatives = [_sequence_runs(parsed)]
+    else:
+        alternatives = [[source]]
+
+    plan: QueryPlan = []
+    for runs in alternatives:
+        grams: Set[int] = set()
+        for run in runs:
+            grams |= trigrams_of(run)
+        if not grams:
+            return None
+        plan.append(set(sorted(grams)[:MAX_QUERY_TRIGRAMS]))
+    return plan
+
+
+class TrigramIndex:
+    """
+    Persistent trigram index of the text files below a set of roots.
+
+    Like ``FileIndex``, it shares one SQLite connection between threads under
+    a lock. Change events only mark paths as dirty; they are re-indexed right
+    before the next query so that bursts of writes are folded together.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        roots: Sequence[str],
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    ):
+        self.db_path = db_path
+        self.roots = sorted({os.path.abspath(r) for r in roots})
+        self.max_file_bytes = max_file_bytes
+        self.ready = False
+        self._lock = threading.RLock()
+        self._dirty_files: Set[str] = set()
+        self._dirty_trees: Set[str] = set()
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        tables = {
+            name
+            for (name,) in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        if "files" in tables and "dirs" not in tables:
+            # Written before directory mtimes were kept: start over.
+            self._conn.executescript("DROP TABLE files; DROP TABLE postings;")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def build(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the filesystem.
+
+        Args:
+            full: Re-read every file even if its mtime and size are unchanged.
+
+        Returns:
+            Counters describing the work done.
+        """
+        started = time.monotonic()
+        counters = {"indexed_files": 0, "reused_files": 0, "removed_files": 0}
+        for root in self.roots:
+            self._refresh_tree(root, counters, full=full)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('built_at', ?)",
+                (str(time.time()),),
+            )
+        self.ready = True
+        return {**counters, "seconds": round(time.monotonic() - started, 3)}
+
+    def build_in_background(self) -> threading.Thread:
+        """Run an incremental :meth:`build` on a daemon thread."""
+        thread = threading.Thread(
+            target=self.build, name="mcp-fs-trigram-build", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _refresh_tree(
+        self,
+        root: str,
+        counters: Dict[str, int],
+        full: bool = False,
+        trust_dirs: bool = False,
+    ) -> None:
+        """
+        Re-index the files below ``root`` whose mtime or size changed and
+        drop the ones that disappeared. Work is committed in batches so
+        queries are not blocked for the whole walk.
+
+        Args:
+            full: Re-read every file even if its mtime and size are unchanged.
+            trust_dirs: Only descend into directories whose mtime is the one
+                recorded when they were last listed, without listing them.
+        """
+        stack = [root]
+        pending: List[Tuple[str, os.stat_result]] = []
+        listed: List[Tuple[str, int]] = []
+        while stack:
+            directory = stack.pop()
+            try:
+                stats = os.stat(directory)
+            except OSError:
+                counters["removed_files"] += self._forget_tree(directory)
+                continue
+            if not stat.S_ISDIR(stats.st_mode):
+                if stat.S_ISREG(stats.st_mode):
+                    pending.append((directory, stats))
+                else:
+                    counters["removed_files"] += self._forget_tree(directory)
+                continue
+            if trust_dirs and not full:
+                with self._lock:
+                    known = self._conn.execute(
+                        "SELECT mtime_ns FROM dirs WHERE path = ?", (directory,)
+                    ).fetchone()
+                    if known is not None and known[0] == stats.st_mtime_ns:
+                        stack.extend(
+                            path
+                            for (path,) in self._conn.execute(
+                                "SELECT path FROM dirs WHERE parent = ?", (directory,)
+                            )
+                        )
+                        continue
+            pending.extend(self._scan_directory(directory, full, stack, counters))
+            listed.append((directory, stats.st_mtime_ns))
+            if len(pending) >= BATCH_FILES or len(listed) >= BATCH_FILES:
+                counters["indexed_files"] += self._index_batch(pending, listed)
+                pending, listed = [], []
+        counters["indexed_files"] += self._index_batch(pending, listed)
+
+    def _scan_directory(
+        self,
+        directory: str,
+        full: bool,
+        stack: List[str],
+        counters: Dict[str, int],
+    ) -> List[Tuple[str, os.stat_result]]:
+        """
+        List ``directory``, push its subdirectories and drop what it no longer
+        holds; return its files that are new or changed.
+        """
+        files: Dict[str, os.stat_result] = {}
+        subdirs: List[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            files[entry.path] = entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        stack.extend(subdirs)
+        with self._lock:
+            known = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in self._conn.execute(
+                    "SELECT path, mtime_ns, size FROM files WHERE parent = ?",
+                    (directory,),
+                )
+            }
+            known_dirs = [
+                path
+                for (path,) in self._conn.execute(
+                    "SELECT path FROM dirs WHERE parent = ?", (directory,)
+                )
+            ]
+        for path in set(known_dirs).difference(subdirs):
+            counters["removed_files"] += self._forget_tree(path)
+        removed = [path for path in known if path not in files]
+        if removed:
+            with self._lock, self._conn:
+                for path in removed:
+                    self._remove(path)
+            counters["removed_files"] += len(removed)
+        changed = []
+        for path, stats in files.items():
+            if not full and known.get(path) == (stats.st_mtime_ns, stats.st_size):
+                counters["reused_files"] += 1
+            else:
+                changed.append((path, stats))
+        return changed
+
+    def _forget_tree(self, path: str) -> int:
+        """Drop ``path`` and everything recorded below it; return the file count."""
+        low, high = _subtree_bounds(path)
+        with self._lock, self._conn:
+            paths = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT path FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+                    (path, low, high),
+                ).fetchall()
+            ]
+            for file_path in paths:
+                self._remove(file_path)
+            self._conn.execute(
+                "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, low, high),
+            )
+        return len(paths)
+
+    def _read(self, path: str, stats: os.stat_result) -> Tuple[int, Set[int]]:
+        if stats.st_size > self.max_file_bytes:
+            return KIND_TOO_LARGE, set()
+        with open(path, "rb") as file:
+            data = file.read(self.max_file_bytes + 1)
+        if len(data) > self.max_file_bytes:
+            return KIND_TOO_LARGE, set()
+        if is_binary(data[:BINARY_SNIFF_BYTES]):
+            return KIND_BINARY, set()
+        return KIND_TEXT, trigrams_of(data)
+
+    def _index_batch(
+        self,
+        batch: List[Tuple[str, os.stat_result]],
+        directories: Sequence[Tuple[str, int]] = (),
+    ) -> int:
+        """
+        Index a batch of files and record the mtimes of the directories they
+        were listed from, in one transaction.
+        """
+        # Files are read outside the lock; only the writes hold it.
+        prepared = []
+        for path, stats in batch:
+            try:
+                kind, grams = self._read(path, stats)
+            except OSError:
+                continue
+            prepared.append((path, stats, kind, grams))
+        with self._lock, self._conn:
+            for path, stats, kind, grams in prepared:
+                self._remove(path)
+                cursor = self._conn.execute(
+                    "INSERT INTO files (path, parent, mtime_ns, size, kind, trigrams) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        path,
+                        os.path.dirname(path),
+                        stats.st_mtime_ns,
+                        stats.st_size,
+                        kind,
+                        array("I", sorted(grams)).tobytes(),
+                    ),
+                )
+                file_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+                    ((gram, file_id) for gram in grams),
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                (
+                    (path, os.path.dirname(path), mtime_ns)
+                    for path, mtime_ns in directories
+                ),
+            )
+        return len(prepared)
+
+    def _remove(self, path: str) -> None:
+        row = self._conn.execute(
+            "SELECT id, trigrams FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return
+        file_id, blob = row
+        grams = array("I")
+        grams.frombytes(blob or b"")
+        self._conn.executemany(
+            "DELETE FROM postings WHERE trigram = ? AND file_id = ?",
+            ((gram, file_id) for gram in grams),
+        )
+        self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def covers(self, path: str) -> bool:
+        """Whether ``path`` lies below one of the indexed roots."""
+        return any(
+            path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+            for root in self.roots
+        )
+
+    def handle_event(self, event: FileEvent) -> None:
+        """``ChangeNotifier`` subscriber marking changed paths as dirty."""
+        paths = [event.path] + ([event.dest_path] if event.dest_path else [])
+        with self._lock:
+            for path in paths:
+                path = os.path.abspath(path)
+                if not self.covers(path):
+                    continue
+                if event.is_directory or event.type is EventType.OVERFLOW:
+                    self._dirty_trees.add(path)
+                else:
+                    self._dirty_files.add(path)
+
+    def flush(self) -> None:
+        """Re-index every path marked dirty since the last flush."""
+        with self._lock:
+            files, self._dirty_files = self._dirty_files, set()
+            trees, self._dirty_trees = self._dirty_trees, set()
+        counters = {"indexed_files": 0, "reused_files": 0, "removed_files": 0}
+        for tree in trees:
+            self._refresh_tree(tree, counters)
+        changed = []
+        removed = []
+        for path in files:
+            try:
+                stats = os.stat(path)
+            except OSError:
+                removed.append(path)
+                continue
+            if os.path.isfile(path):
+                changed.append((path, stats))
+        self._index_batch(changed)
+        with self._lock, self._conn:
+            for path in removed:
+                self._remove(path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def candidates(self, directory: str, plan: QueryPlan) -> Optional[List[str]]:
+        """
+        Return the files below ``directory`` (in path order) that may match a
+        query with the given plan, or ``None`` if the index cannot answer.
+
+        Pending change events are applied and the directories below
+        ``directory`` whose mtime changed are listed again first, so files
+        created, removed or renamed since they were indexed are accounted for
+        even when no change event reported them.
+        """
+        if not self.ready or not self.covers(directory):
+            return None
+        self.flush()
+        counters = {"indexed_files": 0, "reused_files": 0, "removed_files": 0}
+        self._refresh_tree(directory, counters, trust_dirs=True)
+        low, high = _subtree_bounds(directory)
+        paths: Set[str] = set()
+        with self._lock:
+            for grams in plan:
+                marks = ",".join("?" * len(grams))
+                paths.update(
+                    path
+                    for (path,) in self._conn.execute(
+                        "SELECT path FROM files WHERE path >= ? AND path < ? "
+                        "AND id IN (SELECT file_id FROM postings "
+                        f"WHERE trigram IN ({marks}) "
+                        "GROUP BY file_id HAVING COUNT(*) = ?)",
+                        (low, high, *grams, len(grams)),
+                    )
+                )
+            paths.update(
+                path
+                for (path,) in self._conn.execute(
+                    "SELECT path FROM files WHERE path >= ? AND path < ? "
+                    "AND kind = ?",
+                    (low, high, KIND_TOO_LARGE),
+                )
+            )
+        return sorted(paths)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize the contents of the index."""
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT kind, COUNT(*) FROM files GROUP BY kind"
+                ).fetchall()
+            )
+            postings, trigrams = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT trigram) FROM postings"
+            ).fetchone()
+            built_at = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'built_at'"
+            ).fetchone()
+        return {
+            "db_path": self.db_path,
+            "roots": self.roots,
+            "text_files": counts.get(KIND_TEXT, 0),
+            "binary_files": counts.get(KIND_BINARY, 0),
+            "large_files": counts.get(KIND_TOO_LARGE, 0),
+            "trigrams": trigrams,
+            "postings": postings,
+            "built_at": float(built_at[0]) if built_at else None,
+            "db_bytes": os.path.getsize(self.db_path),
+            "ready": self.ready,
+        }
@@ -0,0 +1,104 @@
+"""
+Handles for writing large files in chunks.
+
+Opening an upload creates a temp file next to the target (see
+``AtomicWriter.create_temp``). Each chunk is appended to it as soon as it
+arrives, so the server holds one chunk in memory at a time, and committing
+renames the temp file over the target atomically. No descriptor is kept
+between calls. Uploads that are aborted, expire or are evicted delete their
+temp file, and so do the uploads still pending when the server shuts down.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List
+
+from mcp_filesystem.storage.streams import InvalidStreamError
+
+
+class Upload:
+    """A temp file being filled chunk by chunk for ``path``."""
+
+    def __init__(self, path: str, target: str, temp_path: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.path = path
+        self.target = target
+        self.temp_path = temp_path
+        self.bytes_written = 0
+        self.chunks = 0
+        # Held while a chunk is written or the upload is committed.
+        self.lock = threading.Lock()
+        self.touched = time.monotonic()
+        self.discarded = False
+
+    def discard(self) -> None:
+        """Delete the temp file once no chunk is being written to it."""
+        with self.lock:
+            self.discard_locked()
+
+    def discard_locked(self) -> None:
+        """``discard`` for callers already holding ``lock``."""
+        self.discarded = True
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class Uploads:
+    """LRU registry of pending uploads with a time-to-live."""
+
+    def __init__(self, max_uploads: int = 64, ttl: float = 3600.0):
+        self.max_uploads = max_uploads
+        self.ttl = ttl
+        self._uploads: "OrderedDict[str, Upload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, upload: Upload) -> None:
+        with self._lock:
+            dropped = self._expire()
+            self._uploads[upload.id] = upload
+            while len(self._uploads) > self.max_uploads:
+                dropped.append(self._uploads.popitem(last=False)[1])
+        for old in dropped:
+            old.discard()
+
+    def get(self, upload_id: str) -> Upload:
+        with self._lock:
+            dropped = self._expire()
+            upload = self._uploads.get(upload_id)
+            if upload is not None:
+                upload.touched = time.monotonic()
+                self._uploads.move_to_end(upload_id)
+        for old in dropped:
+            old.discard()
+        if upload is None:
+            raise InvalidStreamError(
+                f"Unknown or expired upload '{upload_id}'; open a new upload."
+            )
+        return upload
+
+    def remove(self, upload_id: str) -> Upload:
+        with self._lock:
+            upload = self._uploads.pop(upload_id, None)
+        if upload is None:
+            raise InvalidStreamError(f"Unknown or expired upload '{upload_id}'.")
+        return upload
+
+    def close(self) -> None:
+        """Discard every pending upload."""
+        with self._lock:
+            pending = list(self._uploads.values())
+            self._uploads.clear()
+        for upload in pending:
+            upload.discard()
+
+    def _expire(self) -> List[Upload]:
+        deadline = time.monotonic() - self.ttl
+        expired = [u for u in self._uploads.values() if u.touched < deadline]
+        for upload in expired:
+            del self._uploads[upload.id]
+        return expired
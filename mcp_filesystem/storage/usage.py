@@ -0,0 +1,233 @@
+"""
+Parallel disk-usage walk for directory_tree.
+
+``scan_usage`` lists every directory below a root with ``os.scandir`` on a
+pool of workers: each scanned directory queues its subdirectories as new
+tasks, so independent subtrees are read concurrently. Sizes come from the
+``lstat`` data scandir already caches on most platforms; symlinks are
+counted as entries, never followed. Files with several hard links are
+counted once, by ``(st_dev, st_ino)``, like ``du``; the other links are
+still listed, flagged as ``hardlink``, so a directory's listing does not
+depend on which link the parallel walk reached first.
+
+Each directory keeps only its own totals during the walk; recursive totals
+are summed bottom-up once the walk is over, so the workers never contend
+on shared counters beyond the task bookkeeping.
+"""
+
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from mcp_filesystem.storage.progress import Progress
+from mcp_filesystem.utils.matcher import PatternMatcher
+
+DEFAULT_USAGE_WORKERS = 8
+MAX_REPORTED_ERRORS = 20
+
+
+class UsageNode:
+    """A directory or file found by ``scan_usage``, with its totals."""
+
+    __slots__ = (
+        "name",
+        "depth",
+        "is_directory",
+        "size",
+        "disk_usage",
+        "files",
+        "directories",
+        "children",
+        "hardlink",
+    )
+
+    def __init__(self, name: str, depth: int, is_directory: bool):
+        self.name = name
+        self.depth = depth
+        self.is_directory = is_directory
+        self.size = 0
+        self.disk_usage = 0
+        self.files = 0
+        self.directories = 0
+        self.children: List["UsageNode"] = []
+        # A file already counted through another hard link.
+        self.hardlink = False
+
+
+class UsageScan:
+    """Result of ``scan_usage``; ``root`` holds the recursive totals."""
+
+    def __init__(self, root: UsageNode):
+        self.root = root
+        self.hardlinks_skipped = 0
+        self.errors: Dict[str, str] = {}
+        self.truncated = False
+
+
+def _disk_usage(stats: os.stat_result) -> int:
+    blocks = getattr(stats, "st_blocks", None)
+    return stats.st_size if blocks is None else blocks * 512
+
+
+class _UsageWalker:
+    def __init__(
+        self,
+        include_files_to: int,
+        excluded: Optional[PatternMatcher],
+        deadline: Optional[float],
+        progress: Progress,
+    ):
+        self.include_files_to = include_files_to
+        self.excluded = excluded
+        self.deadline = deadline
+        self.progress = progress
+        self.failure: Optional[BaseException] = None
+        self.truncated = False
+        self.hardlinks_skipped = 0
+        self.errors: Dict[str, str] = {}
+        self._seen: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._finished = threading.Event()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def run(self, root: UsageNode, path: str, workers: int) -> None:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            self._pool = pool
+            self._submit(root, path, "")
+            self._finished.wait()
+
+    def _submit(self, node: UsageNode, path: str, rel_path: str) -> None:
+        with self._lock:
+            self._outstanding += 1
+        assert self._pool is not None
+        self._pool.submit(self._scan, node, path, rel_path)
+
+    def _scan(self, node: UsageNode, path: str, rel_path: str) -> None:
+        try:
+            if self.failure is None and not self.truncated:
+                self._scan_directory(node, path, rel_path)
+        except Exception as e:
+            # Cancellation, or a root that cannot be listed: stop the walk.
+            self.failure = self.failure or e
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+                if not self._outstanding:
+                    self._finished.set()
+
+    def _scan_directory(self, node: UsageNode, path: str, rel_path: str) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.truncated = True
+            return
+        entries = 0
+        try:
+            it = os.scandir(path)
+        except OSError as e:
+            if not node.depth:
+                raise
+            self._error(path, e)
+            return
+        with it:
+            for entry in it:
+                entries += 1
+                entry_rel = rel_path + entry.name
+                if self.excluded is not None and self.excluded(entry.name, entry_rel):
+                    continue
+                try:
+                    stats = entry.stat(follow_symlinks=False)
+                except OSError as e:
+                    self._error(entry.path, e)
+                    continue
+                if stat.S_ISDIR(stats.st_mode):
+                    child = UsageNode(entry.name, node.depth + 1, True)
+                    child.disk_usage = _disk_usage(stats)
+                    node.children.append(child)
+                    self._submit(child, entry.path, entry_rel + "/")
+                    continue
+                counted = stats.st_nlink == 1 or self._first_link(stats)
+                disk_usage = _disk_usage(stats)
+                if counted:
+                    node.files += 1
+                    node.size += stats.st_size
+                    node.disk_usage += disk_usage
+                if node.depth < self.include_files_to:
+                    leaf = UsageNode(entry.name, node.depth + 1, False)
+                    leaf.size = stats.st_size
+                    leaf.disk_usage = disk_usage
+                    leaf.hardlink = not counted
+                    node.children.append(leaf)
+        self.progress.advance(entries)
+
+    def _first_link(self, stats: os.stat_result) -> bool:
+        key = (stats.st_dev, stats.st_ino)
+        with self._lock:
+            if key in self._seen:
+                self.hardlinks_skipped += 1
+                return False
+            self._seen.add(key)
+            return True
+
+    def _error(self, path: str, error: OSError) -> None:
+        with self._lock:
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors[path] = error.strerror or str(error)
+
+
+def _sum_tree(root: UsageNode) -> None:
+    """Add every directory's totals into its ancestors, bottom-up."""
+    order: List[UsageNode] = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(child for child in node.children if child.is_directory)
+    for node in reversed(order):
+        for child in node.children:
+            if child.is_directory:
+                node.size += child.size
+                node.disk_usage += child.disk_usage
+                node.files += child.files
+                node.directories += child.directories + 1
+
+
+def scan_usage(
+    path: str,
+    workers: int = DEFAULT_USAGE_WORKERS,
+    include_files_to: int = 0,
+    excluded: Optional[PatternMatcher] = None,
+    timeout: Optional[float] = None,
+    progress: Optional[Progress] = None,
+) -> UsageScan:
+    """
+    Walk directory ``path`` and return its tree with recursive totals.
+
+    Files are kept as leaves only in directories shallower than
+    ``include_files_to`` (the root has depth 0); deeper files still count
+    towards the totals. If ``timeout`` expires, directories not yet listed
+    are left out and the scan is flagged as truncated.
+
+    Raises:
+        NotADirectoryError: If ``path`` is not a directory.
+        OperationCancelled: If the operation was cancelled.
+    """
+    progress = progress or Progress(message=f"Scanning {path}")
+    stats = os.stat(path)
+    if not stat.S_ISDIR(stats.st_mode):
+        raise NotADirectoryError(f"'{path}' is not a directory.")
+    root = UsageNode(os.path.basename(path) or path, 0, True)
+    root.disk_usage = _disk_usage(stats)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    walker = _UsageWalker(include_files_to, excluded, deadline, progress)
+    walker.run(root, path, max(1, workers))
+    if walker.failure is not None:
+        raise walker.failure
+    _sum_tree(root)
+    scan = UsageScan(root)
+    scan.hardlinks_skipped = walker.hardlinks_skipped
+    scan.errors = walker.errors
+    scan.truncated = walker.truncated
+    return scan
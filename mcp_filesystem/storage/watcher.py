@@ -0,0 +1,335 @@
+"""
+Watchers that turn changes below the allowed directories into ``FileEvent``s.
+
+``InotifyWatcher`` talks to the Linux inotify API directly through ctypes.
+``PollingWatcher`` compares periodic snapshots and is used wherever inotify is
+not available.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import stat
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from mcp_filesystem.storage.events import ChangeNotifier, EventType, FileEvent
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class Watcher:
+    """Base class for watchers publishing to a ``ChangeNotifier``."""
+
+    def __init__(self, roots: Sequence[str], notifier: ChangeNotifier):
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.notifier = notifier
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+
+class InotifyWatcher(Watcher):
+    """Recursive watcher built on ``inotify_init1``/``inotify_add_watch``."""
+
+    def __init__(self, roots: Sequence[str], notifier: ChangeNotifier):
+        super().__init__(roots, notifier)
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_init1.argtypes = [ctypes.c_int]
+        self._libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        self._stop_r, self._stop_w = os.pipe()
+        self._paths: Dict[int, str] = {}
+        self._wds: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        for root in self.roots:
+            self._add_tree(root)
+        self._thread = threading.Thread(
+            target=self._run, name="mcp-fs-inotify", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        os.write(self._stop_w, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                logger.warning(
+                    "inotify watch limit reached; '%s' is not watched "
+                    "(raise fs.inotify.max_user_watches)",
+                    path,
+                )
+            elif err not in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                logger.warning("inotify_add_watch(%s): %s", path, os.strerror(err))
+            return
+        with self._lock:
+            self._paths[wd] = path
+            self._wds[path] = wd
+
+    def _add_tree(self, root: str) -> None:
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            self._add_watch(directory)
+            try:
+                with os.scandir(directory) as it:
+                    stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def _forget(self, wd: int) -> None:
+        with self._lock:
+            path = self._paths.pop(wd, None)
+            if path is not None:
+                self._wds.pop(path, None)
+
+    def _rename_watches(self, source: str, destination: str) -> None:
+        prefix = source + os.sep
+        with self._lock:
+            for wd, path in list(self._paths.items()):
+                if path == source or path.startswith(prefix):
+                    new_path = destination + path[len(source) :]
+                    self._paths[wd] = new_path
+                    self._wds.pop(path, None)
+                    self._wds[new_path] = wd
+
+    def _drop_tree(self, root: str) -> None:
+        prefix = root + os.sep
+        with self._lock:
+            wds = [
+                wd
+                for wd, path in self._paths.items()
+                if path == root or path.startswith(prefix)
+            ]
+        for wd in wds:
+            self._libc.inotify_rm_watch(self._fd, wd)
+            self._forget(wd)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                ready, _, _ = select.select([self._fd, self._stop_r], [], [])
+            except (OSError, ValueError):
+                return
+            if self._stop_r in ready:
+                return
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            for event in self._decode(data):
+                self.notifier.publish(event)
+
+    def _decode(self, data: bytes) -> List[FileEvent]:
+        events: List[FileEvent] = []
+        moved_from: Dict[int, Tuple[str, bool]] = {}
+        seen = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                for root in self.roots:
+                    events.append(FileEvent(EventType.OVERFLOW, root, True))
+                continue
+            if mask & IN_IGNORED:
+                self._forget(wd)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            is_dir = bool(mask & IN_ISDIR)
+            if not raw_name:
+                # Events on the watched directory itself are reported by its
+                # parent watch, except for the roots.
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF) and directory in self.roots:
+                    events.append(FileEvent(EventType.DELETED, directory, True))
+                continue
+            path = os.path.join(directory, os.fsdecode(raw_name))
+
+            if mask & IN_MOVED_FROM:
+                moved_from[cookie] = (path, is_dir)
+                continue
+            if mask & IN_MOVED_TO:
+                source = moved_from.pop(cookie, None)
+                if source is None:
+                    if is_dir:
+                        self._add_tree(path)
+                    events.append(FileEvent(EventType.CREATED, path, is_dir))
+                else:
+                    if is_dir:
+                        self._rename_watches(source[0], path)
+                    events.append(FileEvent(EventType.MOVED, source[0], is_dir, path))
+                continue
+            if mask & IN_CREATE:
+                if is_dir:
+                    self._add_tree(path)
+                event = FileEvent(EventType.CREATED, path, is_dir)
+            elif mask & IN_DELETE:
+                event = FileEvent(EventType.DELETED, path, is_dir)
+            else:
+                event = FileEvent(EventType.MODIFIED, path, is_dir)
+            if event not in seen:
+                seen.add(event)
+                events.append(event)
+
+        for path, is_dir in moved_from.values():
+            if is_dir:
+                self._drop_tree(path)
+            events.append(FileEvent(EventType.DELETED, path, is_dir))
+        return events
+
+
+Snapshot = Dict[str, Tuple[int, int, bool]]
+
+
+class PollingWatcher(Watcher):
+    """Detects changes by diffing periodic ``os.scandir`` snapshots."""
+
+    def __init__(
+        self, roots: Sequence[str], notifier: ChangeNotifier, interval: float = 2.0
+    ):
+        super().__init__(roots, notifier)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._snapshot: Snapshot = {}
+
+    def start(self) -> None:
+        self._snapshot = self._take_snapshot()
+        self._thread = threading.Thread(
+            target=self._run, name="mcp-fs-poll", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _take_snapshot(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        stack = list(self.roots)
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            entry_stats = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        is_dir = stat.S_ISDIR(entry_stats.st_mode)
+                        snapshot[entry.path] = (
+                            entry_stats.st_mtime_ns,
+                            entry_stats.st_size,
+                            is_dir,
+                        )
+                        if is_dir:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+        return snapshot
+
+    def poll(self) -> List[FileEvent]:
+        """Take a new snapshot and publish the differences."""
+        current = self._take_snapshot()
+        previous = self._snapshot
+        events: List[FileEvent] = []
+        for path, (mtime_ns, size, is_dir) in current.items():
+            before = previous.get(path)
+            if before is None:
+                events.append(FileEvent(EventType.CREATED, path, is_dir))
+            elif not is_dir and before[:2] != (mtime_ns, size):
+                events.append(FileEvent(EventType.MODIFIED, path, is_dir))
+        for path, (_, _, is_dir) in previous.items():
+            if path not in current:
+                events.append(FileEvent(EventType.DELETED, path, is_dir))
+        self._snapshot = current
+        for event in events:
+            self.notifier.publish(event)
+        return events
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Polling watcher failed")
+
+
+def create_watcher(
+    roots: Sequence[str], notifier: ChangeNotifier, poll_interval: float = 2.0
+) -> Watcher:
+    """Return an inotify watcher when the platform supports it, else a poller."""
+    try:
+        return InotifyWatcher(roots, notifier)
+    except (OSError, AttributeError) as e:
+        logger.info("inotify unavailable (%s); falling back to polling", e)
+        return PollingWatcher(roots, notifier, interval=poll_interval)
@@ -0,0 +1,244 @@
+"""
+Atomic, durability-aware file writes.
+
+Content goes to a temporary file in the target's directory, which is then
+renamed over the target with ``os.replace``. Readers see either the old or
+the new file, never a partial one.
+
+The durability level controls what is flushed before ``write`` returns:
+
+* ``none``: nothing. The rename is atomic but may be lost on power failure.
+* ``data``: the file contents (``fdatasync``) before the rename.
+* ``full``: the file (``fsync``) before the rename and the directory entry
+  (``fsync`` of the directory) after it.
+
+Synced writes go through a group commit. The first writer to arrive becomes
+the leader and commits every write queued by the time it starts; writers
+arriving meanwhile queue up for the next leader. Each file is flushed on
+its own, so a failed flush fails only its write, and each directory is
+synced once per group, so concurrent writes to one directory share that
+cost. ``syncfs(2)`` is not used: it flushes every dirty page of the
+filesystem, stalling a small group behind unrelated writers, and before
+Linux 5.8 it does not report writeback errors.
+"""
+
+import enum
+import os
+import stat
+import tempfile
+import threading
+from typing import List, Optional, Set, Tuple
+
+TEMP_SUFFIX = ".tmp"
+
+
+class Durability(str, enum.Enum):
+    NONE = "none"
+    DATA = "data"
+    FULL = "full"
+
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def write_all(fd: int, data: bytes) -> None:
+    """Write all of ``data`` to ``fd``, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def fsync_directory(path: str) -> None:
+    """Persist the entries of directory ``path``, where the OS allows it."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _PendingWrite:
+    """A temp file written but not yet flushed and renamed."""
+
+    def __init__(self, fd: int, temp_path: str, path: str):
+        self.fd = fd
+        self.temp_path = temp_path
+        self.path = path
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class AtomicWriter:
+    """
+    Writes files atomically at a fixed ``Durability`` level.
+
+    Thread-safe. Statistics about group commits are kept in ``groups`` (flush
+    rounds) and ``grouped_writes`` (writes committed by them).
+    """
+
+    def __init__(self, durability: Durability = Durability.NONE):
+        self.durability = Durability(durability)
+        self._file_mode = 0o666 & ~_current_umask()
+        self._cond = threading.Condition()
+        self._queue: List[_PendingWrite] = []
+        self._leader_active = False
+        self.groups = 0
+        self.grouped_writes = 0
+
+    def write(self, path: str, data: bytes) -> None:
+        """Replace the contents of ``path`` with ``data``."""
+        fd, temp_path, path = self.create_temp(path)
+        try:
+            write_all(fd, data)
+        except BaseException:
+            os.close(fd)
+            os.unlink(temp_path)
+            raise
+        self.commit(fd, temp_path, path)
+
+    def create_temp(self, path: str) -> Tuple[int, str, str]:
+        """
+        Create the temp file that will replace ``path``.
+
+        Returns its descriptor, its path and the final target: the file a
+        symlink at ``path`` points to, so the link itself is kept. The temp
+        file already has the target's permission bits.
+        """
+        if os.path.islink(path):
+            path = os.path.realpath(path)
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(path)}.",
+            suffix=TEMP_SUFFIX,
+            dir=os.path.dirname(path),
+        )
+        try:
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = self._file_mode
+            os.fchmod(fd, mode)
+        except BaseException:
+            os.close(fd)
+            os.unlink(temp_path)
+            raise
+        return fd, temp_path, path
+
+    def create_new(self, path: str, mode: int = 0o600) -> Tuple[int, str, str]:
+        """
+        Create ``path`` itself, which must not exist, in place of a temp file.
+
+        For new files nobody can be reading yet there is nothing to replace
+        atomically, so the temp file and rename are skipped; ``commit``
+        still applies the durability level and removes the file on failure.
+        Raises ``FileExistsError`` if ``path`` exists, symlinks included.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
+        return os.open(path, flags, mode), path, path
+
+    def commit(self, fd: int, temp_path: str, path: str) -> None:
+        """Flush the temp file per the durability level and rename it over ``path``."""
+        if self.durability is Durability.NONE:
+            os.close(fd)
+            self._rename(temp_path, path)
+            return
+        self._commit(_PendingWrite(fd, temp_path, path))
+
+    def append(self, path: str, data: bytes) -> bool:
+        """
+        Append ``data`` to ``path``, creating it if needed.
+
+        Appends are not atomic: a crash can leave part of ``data`` written.
+        Returns whether the file was created.
+        """
+        created = not os.path.exists(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666)
+        try:
+            write_all(fd, data)
+            if self.durability is Durability.FULL:
+                os.fsync(fd)
+            elif self.durability is Durability.DATA:
+                _fdatasync(fd)
+        finally:
+            os.close(fd)
+        if created and self.durability is Durability.FULL:
+            fsync_directory(os.path.dirname(path))
+        return created
+
+    @staticmethod
+    def _rename(temp_path: str, path: str) -> None:
+        try:
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _commit(self, pending: _PendingWrite) -> None:
+        with self._cond:
+            self._queue.append(pending)
+            while not pending.done and self._leader_active:
+                self._cond.wait()
+            if pending.done:
+                if pending.error is not None:
+                    raise pending.error
+                return
+            self._leader_active = True
+            group, self._queue = self._queue, []
+        try:
+            self._flush_group(group)
+        except BaseException as e:
+            for item in group:
+                item.error = item.error or e
+            raise
+        finally:
+            with self._cond:
+                for item in group:
+                    item.done = True
+                self._leader_active = False
+                self.groups += 1
+                self.grouped_writes += len(group)
+                self._cond.notify_all()
+        if pending.error is not None:
+            raise pending.error
+
+    def _flush_group(self, group: List[_PendingWrite]) -> None:
+        """Flush, rename and (for ``full``) sync the directories of a group."""
+        self._sync_files(group)
+        directories: Set[str] = set()
+        for item in group:
+            if item.error is not None:
+                continue
+            try:
+                self._rename(item.temp_path, item.path)
+            except OSError as e:
+                item.error = e
+                continue
+            directories.add(os.path.dirname(item.path))
+        if self.durability is Durability.FULL:
+            for directory in directories:
+                try:
+                    fsync_directory(directory)
+                except OSError as e:
+                    for item in group:
+                        if os.path.dirname(item.path) == directory:
+                            item.error = item.error or e
+
+    def _sync_files(self, group: List[_PendingWrite]) -> None:
+        """Flush and close the temp files of ``group``; a failure fails its write."""
+        sync = os.fsync if self.durability is Durability.FULL else _fdatasync
+        for item in group:
+            try:
+                sync(item.fd)
+            except OSError as e:
+                item.error = e
+                os.unlink(item.temp_path)
+            finally:
+                os.close(item.fd)
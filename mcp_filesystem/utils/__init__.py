@@ -4,8 +4,12 @@ Utilities module for mcp_filesystem.
 Contains helper functions and utilities for path validation and file operations.
 """
 
+from mcp_filesystem.utils.columns import needs_stat, resolve_columns, to_columns
+from mcp_filesystem.utils.matcher import PatternMatcher, compile_patterns
 from mcp_filesystem.utils.path_validation import (
+    AllowedRoots,
     PathValidationError,
+    compile_roots,
     ensure_directory_exists,
     get_relative_path,
     get_safe_filename,
@@ -22,4 +26,11 @@ __all__ = [
     "get_safe_filename",
     "match_patterns",
     "get_relative_path",
+    "PatternMatcher",
+    "compile_patterns",
+    "AllowedRoots",
+    "compile_roots",
+    "resolve_columns",
+    "needs_stat",
+    "to_columns",
 ]
@@ -0,0 +1,56 @@
+"""
+Conversão de listas de ``FileInfo`` para o formato de resposta compact.
+
+Em vez de um objeto por entrada, com as mesmas chaves repetidas em cada um,
+o formato compact traz uma lista por campo pedido. Caminhos ficam relativos
+ao diretório base, e campos que dependem de ``stat`` só entram quando pedidos,
+o que permite listar sem consultar cada entrada.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from mcp_filesystem.mcp.core.entities import FileInfo
+
+# Campos que exigem um stat por entrada.
+STAT_FIELDS = frozenset({"size", "created", "modified", "permissions"})
+LISTING_COLUMNS = ("name", "is_directory", "size", "modified")
+SEARCH_COLUMNS = ("path", "is_directory", "size", "modified")
+
+
+def resolve_columns(
+    fields: Optional[Sequence[str]], defaults: Sequence[str], names_only: bool
+) -> List[str]:
+    """
+    Retorna as colunas pedidas, sem repetições, ou as padrão; no modo
+    somente nomes, as colunas padrão que exigem stat são omitidas.
+    """
+    if fields:
+        return list(dict.fromkeys(fields))
+    return [f for f in defaults if not (names_only and f in STAT_FIELDS)]
+
+
+def needs_stat(columns: Sequence[str]) -> bool:
+    """Indica se alguma das colunas depende de stat."""
+    return not STAT_FIELDS.isdisjoint(columns)
+
+
+def to_columns(
+    entries: Sequence[FileInfo], columns: Sequence[str], base_path: str
+) -> Dict[str, List[Any]]:
+    """
+    Monta uma lista de valores por coluna, na ordem das entradas.
+
+    Caminhos sob ``base_path`` ficam relativos a ele; os demais, absolutos.
+    """
+    result: Dict[str, List[Any]] = {}
+    for column in columns:
+        if column == "path":
+            prefix = os.path.join(os.path.abspath(base_path), "")
+            start = len(prefix)
+            result[column] = [
+                e.path[start:] if e.path.startswith(prefix) else e.path for e in entries
+            ]
+        else:
+            result[column] = [getattr(e, column) for e in entries]
+    return result
@@ -0,0 +1,174 @@
+"""
+Motor de correspondência de padrões de nomes e caminhos.
+
+Compila um conjunto de padrões glob (incluindo ``**``), expressões regulares
+(prefixo ``re:``) e negações (prefixo ``!``) em uma única expressão regular
+combinada, com atalhos para os casos mais comuns (``*.py``, nomes literais).
+
+Padrões sem ``/`` são comparados com o nome da entrada; padrões com ``/`` são
+comparados com o caminho relativo (separado por ``/``).
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+REGEX_PREFIX = "re:"
+NEGATION_PREFIX = "!"
+_GLOB_CHARS = frozenset("*?[")
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Traduz um glob para uma expressão regular (sem âncoras).
+
+    ``*`` e ``?`` não atravessam ``/``; ``**`` atravessa qualquer número de
+    diretórios. Classes ``[...]`` aceitam ``!`` ou ``^`` para negação.
+    """
+    i, n = 0, len(pattern)
+    parts: List[str] = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if pattern.startswith("/", i):
+                    parts.append("(?:.*/)?")
+                    i += 1
+                else:
+                    parts.append(".*")
+                continue
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j]
+                negate = body[:1] in ("!", "^")
+                if negate:
+                    body = body[1:]
+                body = "".join("\\" + ch if ch in "\\[&~|^" else ch for ch in body)
+                parts.append("[" + ("^" if negate else "") + body + "]")
+                i = j
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+def _pattern_regex(pattern: str) -> str:
+    if pattern.startswith(REGEX_PREFIX):
+        # Semântica de busca (re.search) expressa como correspondência total.
+        return f"(?s:.*?(?:{pattern[len(REGEX_PREFIX):]}).*)"
+    return f"(?s:{glob_to_regex(pattern)})"
+
+
+def _is_path_pattern(pattern: str) -> bool:
+    body = pattern[len(REGEX_PREFIX) :] if pattern.startswith(REGEX_PREFIX) else pattern
+    return "/" in body or (not pattern.startswith(REGEX_PREFIX) and "**" in body)
+
+
+def _compile_group(patterns: List[str]) -> Optional[Callable[[str], bool]]:
+    """Compila padrões de um mesmo alvo (nome ou caminho) em um predicado."""
+    if not patterns:
+        return None
+    globs = [p for p in patterns if not p.startswith(REGEX_PREFIX)]
+    if len(globs) == len(patterns):
+        literals = [p for p in globs if not _GLOB_CHARS.intersection(p)]
+        # ``*`` não atravessa ``/``: sufixos com ``/`` ficam com a regex.
+        suffixes = [
+            p[1:]
+            for p in globs
+            if p.startswith("*")
+            and "/" not in p
+            and not _GLOB_CHARS.intersection(p[1:])
+        ]
+        if len(literals) == len(globs):
+            names = frozenset(literals)
+            return names.__contains__
+        if len(suffixes) == len(globs) and all(suffixes):
+            suffix_tuple = tuple(suffixes)
+            return lambda value: value.endswith(suffix_tuple)
+    combined = re.compile("|".join(_pattern_regex(p) for p in patterns))
+    fullmatch = combined.fullmatch
+    return lambda value: fullmatch(value) is not None
+
+
+class PatternMatcher:
+    """
+    Conjunto compilado de padrões de inclusão e exclusão.
+
+    Uma entrada corresponde quando satisfaz algum padrão de inclusão (ou
+    quando só há negações) e nenhum padrão negado.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        include_name: List[str] = []
+        include_path: List[str] = []
+        exclude_name: List[str] = []
+        exclude_path: List[str] = []
+        for pattern in self.patterns:
+            negated = pattern.startswith(NEGATION_PREFIX)
+            body = pattern[1:] if negated else pattern
+            if not body:
+                continue
+            is_path = _is_path_pattern(body)
+            if negated:
+                (exclude_path if is_path else exclude_name).append(body)
+            else:
+                (include_path if is_path else include_name).append(body)
+        self._include_name = _compile_group(include_name)
+        self._include_path = _compile_group(include_path)
+        self._exclude_name = _compile_group(exclude_name)
+        self._exclude_path = _compile_group(exclude_path)
+        self._has_includes = bool(include_name or include_path)
+        self.needs_path = bool(include_path or exclude_path)
+
+    def __call__(self, name: str, path: Optional[str] = None) -> bool:
+        """
+        Verifica uma entrada.
+
+        Args:
+            name: Nome da entrada (último componente do caminho).
+            path: Caminho relativo, separado por ``/``; obrigatório apenas se
+                ``needs_path`` for verdadeiro. Por padrão, usa ``name``.
+        """
+        if path is None:
+            path = name
+        if self._has_includes:
+            if not (
+                (self._include_name is not None and self._include_name(name))
+                or (self._include_path is not None and self._include_path(path))
+            ):
+                return False
+        if self._exclude_name is not None and self._exclude_name(name):
+            return False
+        if self._exclude_path is not None and self._exclude_path(path):
+            return False
+        return True
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(patterns: Tuple[str, ...]) -> PatternMatcher:
+    return PatternMatcher(patterns)
+
+
+def compile_patterns(patterns: Sequence[str]) -> PatternMatcher:
+    """
+    Retorna um ``PatternMatcher`` para os padrões, reaproveitando compilações
+    anteriores do mesmo conjunto.
+
+    Raises:
+        re.error: Se algum padrão ``re:`` for uma expressão regular inválida.
+    """
+    return _compile_cached(tuple(patterns))
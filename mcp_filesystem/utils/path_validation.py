@@ -5,10 +5,13 @@ Fornece funções de segurança para validar caminhos e prevenir
 acessos não autorizados ao sistema de arquivos.
 """
 
-import fnmatch
+import bisect
+import functools
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple, Union
+
+from mcp_filesystem.utils.matcher import compile_patterns
 
 
 class PathValidationError(Exception):
@@ -17,13 +20,93 @@ class PathValidationError(Exception):
     pass
 
 
-def validate_path(path: str, allowed_directories: List[str]) -> str:
+VALIDATED_CACHE_SIZE = 4096
+
+
+class AllowedRoots:
+    """
+    Diretórios permitidos normalizados uma única vez.
+
+    As raízes são guardadas como prefixos terminados em separador, ordenadas
+    e sem raízes aninhadas em outras. Nesse conjunto, a única raiz que pode
+    conter um caminho é a maior que não o ultrapassa, encontrada por bisect.
+    """
+
+    def __init__(self, directories: Iterable[str]):
+        self.directories = list(directories)
+        self.relative = not all(os.path.isabs(d) for d in self.directories)
+        prefixes: List[str] = []
+        candidates = {
+            prefix
+            for prefix in map(_root_prefix, self.directories)
+            if prefix is not None
+        }
+        for prefix in sorted(candidates):
+            if prefixes and prefix.startswith(prefixes[-1]):
+                continue
+            prefixes.append(prefix)
+        self._prefixes = prefixes
+
+    def contains(self, abs_path: str) -> bool:
+        """Indica se um caminho absoluto normalizado está sob alguma raiz."""
+        probe = _as_prefix(abs_path)
+        i = bisect.bisect_right(self._prefixes, probe) - 1
+        return i >= 0 and probe.startswith(self._prefixes[i])
+
+    def __repr__(self) -> str:
+        return repr(self.directories)
+
+
+def _as_prefix(abs_path: str) -> str:
+    return abs_path if abs_path.endswith(os.sep) else abs_path + os.sep
+
+
+def _root_prefix(directory: str) -> Optional[str]:
+    try:
+        return _as_prefix(os.path.abspath(directory))
+    except (OSError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_roots(directories: Tuple[str, ...], cwd: Optional[str]) -> AllowedRoots:
+    return AllowedRoots(directories)
+
+
+def compile_roots(allowed_directories: Iterable[str]) -> AllowedRoots:
+    """
+    Retorna o ``AllowedRoots`` dos diretórios, reaproveitando compilações.
+
+    Raízes relativas são resolvidas contra o diretório de trabalho atual, que
+    então faz parte da chave do cache.
+    """
+    directories = tuple(allowed_directories)
+    roots = _compile_roots(directories, None)
+    if roots.relative:
+        roots = _compile_roots(directories, os.getcwd())
+    return roots
+
+
+@functools.lru_cache(maxsize=VALIDATED_CACHE_SIZE)
+def _validated(path: str, roots: AllowedRoots, cwd: Optional[str]) -> Optional[str]:
+    abs_path = os.path.abspath(path)
+    return abs_path if roots.contains(abs_path) else None
+
+
+def validate_path(
+    path: str, allowed_directories: Union[List[str], AllowedRoots]
+) -> str:
     """
     Valida se um caminho está dentro dos diretórios permitidos.
 
+    A validação é puramente léxica, então o resultado dos caminhos validados
+    recentemente fica num LRU. Passe um ``AllowedRoots`` (ver
+    ``compile_roots``) para não recompilar as raízes a cada chamada.
+
     Args:
         path: Caminho a ser validado
-        allowed_directories: Lista de diretórios permitidos
+        allowed_directories: Lista de diretórios permitidos ou raízes já
+            compiladas
 
     Returns:
         Caminho absoluto validado
@@ -34,24 +117,21 @@ def validate_path(path: str, allowed_directories: List[str]) -> str:
     if not path:
         raise PathValidationError("Caminho não pode estar vazio")
 
+    roots = (
+        allowed_directories
+        if isinstance(allowed_directories, AllowedRoots)
+        else compile_roots(allowed_directories)
+    )
     try:
-        abs_path = os.path.abspath(path)
+        cwd = None if os.path.isabs(path) else os.getcwd()
+        abs_path = _validated(path, roots, cwd)
     except (OSError, ValueError) as e:
         raise PathValidationError(f"Caminho inválido: {e}")
 
-    path_allowed = False
-    for allowed_dir in allowed_directories:
-        try:
-            allowed_abs = os.path.abspath(allowed_dir)
-            if abs_path.startswith(allowed_abs + os.sep) or abs_path == allowed_abs:
-                path_allowed = True
-                break
-        except (OSError, ValueError):
-            continue
-
-    if not path_allowed:
+    if abs_path is None:
         raise PathValidationError(
-            f"Caminho '{abs_path}' não está dentro dos diretórios permitidos: {allowed_directories}"
+            f"Caminho '{os.path.abspath(path)}' não está dentro dos diretórios "
+            f"permitidos: {roots.directories}"
         )
 
     return abs_path
@@ -128,18 +208,13 @@ def match_patterns(path: str, patterns: List[str]) -> bool:
 
     Args:
         path: Caminho a ser verificado
-        patterns: Lista de padrões (suporta wildcards)
+        patterns: Lista de padrões (glob com ``**``, regex com prefixo ``re:``
+            e negação com prefixo ``!``)
 
     Returns:
         True se corresponder a algum padrão, False caso contrário
     """
-    path_name = os.path.basename(path)
-
-    for pattern in patterns:
-        if fnmatch.fnmatch(path_name, pattern) or fnmatch.fnmatch(path, pattern):
-            return True
-
-    return False
+    return compile_patterns(patterns)(os.path.basename(path), path.replace(os.sep, "/"))
 
 
 def get_relative_path(path: str, base_path: str) -> Optional[str]:
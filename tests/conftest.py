@@ -0,0 +1,19 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    """Allowed directory of the storage under test."""
+    return tmp_path.resolve()
+
+
+@pytest.fixture
+def storage(root: Path) -> Iterator[FilesystemStorage]:
+    fs = FilesystemStorage([str(root)])
+    yield fs
+    fs.close()
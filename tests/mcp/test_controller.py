@@ -0,0 +1,229 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from mcp_filesystem.mcp.controller import McpFilesystemController
+from mcp_filesystem.mcp.core.entities import ReadTextFileArgs
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+
+@pytest.fixture
+def controller(root: Path) -> McpFilesystemController:
+    return McpFilesystemController([str(root)], batch_workers=4)
+
+
+def call(controller: McpFilesystemController, tool: str, **args: Any) -> Dict[str, Any]:
+    result = controller.execute_tool(tool, args)
+    assert "error" not in result, result
+    return json.loads(result["content"])
+
+
+def batch(controller: McpFilesystemController, items: List[Dict[str, Any]], **kw):
+    return call(controller, "batch", items=items, **kw)
+
+
+def test_unknown_tool_and_invalid_arguments(controller: McpFilesystemController):
+    assert "error" in controller.execute_tool("nope", {})
+    result = controller.execute_tool("read_text_file", {})
+    assert result["error"].startswith("Erro de validação")
+
+
+def test_writes_to_one_path_run_in_batch_order(
+    controller: McpFilesystemController, root: Path
+):
+    path = str(root / "log.txt")
+    items = [{"tool": "write_file", "args": {"path": path, "content": ""}}]
+    items += [
+        {"tool": "append_file", "args": {"path": path, "content": str(i)}}
+        for i in range(20)
+    ]
+    items.append({"tool": "read_text_file", "args": {"path": path}})
+    result = batch(controller, items)
+    assert result["succeeded"] == 22
+    assert result["results"][-1]["result"] == "".join(map(str, range(20)))
+
+
+def test_reads_see_the_writes_before_them(
+    controller: McpFilesystemController, root: Path
+):
+    path = str(root / "d" / "f.txt")
+    result = batch(
+        controller,
+        [
+            {"tool": "create_directory", "args": {"path": str(root / "d")}},
+            {"tool": "write_file", "args": {"path": path, "content": "1"}},
+            {"tool": "read_text_file", "args": {"path": path}},
+            {"tool": "write_file", "args": {"path": path, "content": "2"}},
+            {"tool": "read_text_file", "args": {"path": path}},
+            {"tool": "list_directory", "args": {"path": str(root / "d")}},
+        ],
+    )
+    results = result["results"]
+    assert [r["index"] for r in results] == list(range(6))
+    assert [results[2]["result"], results[4]["result"]] == ["1", "2"]
+    assert "f.txt" in json.dumps(results[5]["result"])
+
+
+def test_invalid_item_runs_nothing(controller: McpFilesystemController, root: Path):
+    path = str(root / "never.txt")
+    result = controller.execute_tool(
+        "batch",
+        {
+            "items": [
+                {"tool": "write_file", "args": {"path": path, "content": "x"}},
+                {"tool": "read_text_file", "args": {}},
+                {"tool": "batch", "args": {"items": []}},
+            ]
+        },
+    )
+    assert "item 1" in result["error"] and "item 2" in result["error"]
+    assert not Path(path).exists()
+
+
+def test_stop_on_error_skips_later_operations(
+    controller: McpFilesystemController, root: Path
+):
+    missing = str(root / "missing.txt")
+    path = str(root / "after.txt")
+    result = batch(
+        controller,
+        [
+            {"tool": "read_text_file", "args": {"path": missing}},
+            {"tool": "write_file", "args": {"path": missing, "content": "x"}},
+            {"tool": "write_file", "args": {"path": path, "content": "x"}},
+        ],
+        stop_on_error=True,
+    )
+    assert result["results"][0]["status"] == "error"
+    assert result["results"][1]["status"] == "skipped"
+    assert result["failed"] == 1
+    assert result["succeeded"] + result["skipped"] == 2
+
+
+def test_errors_do_not_stop_a_batch_by_default(
+    controller: McpFilesystemController, root: Path
+):
+    result = batch(
+        controller,
+        [
+            {"tool": "read_text_file", "args": {"path": str(root / "missing")}},
+            {"tool": "write_file", "args": {"path": str(root / "a"), "content": "x"}},
+        ],
+    )
+    assert [r["status"] for r in result["results"]] == ["error", "ok"]
+
+
+def test_compact_listing_is_columnar_and_unindented(
+    controller: McpFilesystemController, root: Path
+):
+    (root / "sub").mkdir()
+    (root / "a.txt").write_text("abc")
+    args = {"path": str(root), "format": "compact", "sort": "name"}
+    result = controller.execute_tool("list_directory_with_sizes", args)
+    assert "\n" not in result["content"]
+    listing = json.loads(result["content"])
+    assert listing["total_count"] == 2
+    assert listing["columns"]["name"] == ["a.txt", "sub"]
+    assert listing["columns"]["size"][0] == 3
+    assert listing["columns"]["is_directory"] == [False, True]
+
+
+def test_compact_without_stat_fields_skips_stat(
+    controller: McpFilesystemController, root: Path, monkeypatch: pytest.MonkeyPatch
+):
+    (root / "sub").mkdir()
+    (root / "sub" / "a.py").write_text("x")
+    (root / "b.py").write_text("x")
+
+    def no_stat(*args: Any) -> None:
+        raise AssertionError("stat was not needed")
+
+    monkeypatch.setattr(FilesystemStorage, "_entry_info", no_stat)
+    monkeypatch.setattr(FilesystemStorage, "_get_file_info", no_stat)
+    listing = call(
+        controller,
+        "list_directory",
+        path=str(root),
+        format="compact",
+        fields=["name"],
+        sort="name",
+    )
+    assert listing["columns"] == {"name": ["b.py", "sub"]}
+    found = call(
+        controller,
+        "search_files",
+        path=str(root),
+        pattern="*.py",
+        format="compact",
+        fields=["path"],
+    )
+    assert sorted(found["columns"]["path"]) == ["b.py", os.path.join("sub", "a.py")]
+    assert found["total_matches"] == 2
+
+
+def test_default_format_is_unchanged(controller: McpFilesystemController, root: Path):
+    (root / "a.txt").write_text("abc")
+    result = controller.execute_tool(
+        "search_files", {"path": str(root), "pattern": "*"}
+    )
+    assert "\n" in result["content"]
+    found = json.loads(result["content"])
+    assert [m["name"] for m in found["matches"]] == ["a.txt"]
+    assert found["matches"][0]["size"] == 3
+
+
+def test_get_tools_lists_public_tools_with_schemas(
+    controller: McpFilesystemController,
+):
+    tools = {tool["name"]: tool for tool in controller.get_tools()}
+    assert "batch" in tools
+    assert not any(name.startswith("_") for name in tools)
+    assert set(tools) == set(controller.tools)
+
+    info = tools["read_text_file"]
+    schema = ReadTextFileArgs.model_json_schema()
+    assert info["input_schema"] == schema
+    assert info["description"] == "Sem descrição."
+    assert tools["directory_tree"]["description"].startswith("Mostra a árvore")
+    assert controller.get_tools()[0] is controller.get_tools()[0]
+
+
+def test_execute_tool_serializes_by_result_type(
+    controller: McpFilesystemController, root: Path
+):
+    (root / "a.txt").write_text("abc")
+    (root / "b.bin").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\0" * 8)
+
+    written = controller.execute_tool(
+        "write_file", {"path": str(root / "c.txt"), "content": "x"}
+    )
+    assert isinstance(written["content"], str)
+    assert not written["content"].startswith("{")
+
+    info = controller.execute_tool("get_file_info", {"path": str(root / "a.txt")})
+    assert info["content"].startswith("{\n  ")
+    assert json.loads(info["content"])["size"] == 3
+
+    files = call(controller, "read_multiple_files", paths=[str(root / "a.txt")])
+    assert "abc" in json.dumps(files)
+
+    media = controller.execute_tool("read_media_file", {"path": str(root / "b.bin")})
+    assert media["media"]["mime_type"] == "image/png"
+    assert media["media"]["size"] == 16
+
+
+def test_batch_results_keep_their_fields(
+    controller: McpFilesystemController, root: Path
+):
+    (root / "a.txt").write_text("abc")
+    items = [
+        {"tool": "get_file_info", "args": {"path": str(root / "a.txt")}},
+        {"tool": "read_text_file", "args": {"path": str(root / "a.txt")}},
+    ]
+    result = batch(controller, items)
+    assert result["succeeded"] == 2
+    assert result["results"][0]["result"]["size"] == 3
+    assert result["results"][1]["result"] == "abc"
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from typing import Set
+
+import pytest
+
+from mcp_filesystem.mcp.executor import ExecutorBusyError, ToolExecutor
+
+
+class Gauge:
+    """Blocking tool that records how many calls ran at the same time."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.threads: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return "done"
+
+
+def run_calls(executor: ToolExecutor, calls):
+    async def main():
+        return await asyncio.gather(
+            *(executor.run(name, func) for name, func in calls),
+            return_exceptions=True,
+        )
+
+    try:
+        return asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+
+def test_calls_run_off_the_event_loop_thread():
+    gauge = Gauge(delay=0)
+    results = run_calls(ToolExecutor(workers=2), [("read", gauge)])
+    assert results == ["done"]
+    assert threading.get_ident() not in gauge.threads
+
+
+def test_tool_concurrency_caps_each_tool():
+    gauge = Gauge()
+    executor = ToolExecutor(workers=8, tool_concurrency=2, max_pending=None)
+    results = run_calls(executor, [("search", gauge)] * 6)
+    assert results == ["done"] * 6
+    assert gauge.peak == 2
+
+
+def test_tool_concurrency_is_per_tool():
+    gauge = Gauge()
+    executor = ToolExecutor(workers=8, tool_concurrency=1, max_pending=None)
+    run_calls(executor, [("search", gauge), ("read", gauge), ("grep", gauge)])
+    assert gauge.peak == 3
+
+
+def test_workers_cap_total_concurrency():
+    gauge = Gauge()
+    executor = ToolExecutor(workers=2, tool_concurrency=None, max_pending=None)
+    run_calls(executor, [(f"tool{i}", gauge) for i in range(6)])
+    assert gauge.peak == 2
+
+
+def test_max_pending_rejects_excess_calls():
+    gauge = Gauge()
+    executor = ToolExecutor(workers=4, tool_concurrency=None, max_pending=3)
+    results = run_calls(executor, [("read", gauge)] * 5)
+    assert results.count("done") == 3
+    busy = [r for r in results if isinstance(r, ExecutorBusyError)]
+    assert len(busy) == 2
+    assert executor.pending == 0
+
+
+def test_workers_zero_runs_inline():
+    gauge = Gauge(delay=0)
+    run_calls(ToolExecutor(workers=0), [("read", gauge)])
+    assert gauge.threads == {threading.get_ident()}
+
+
+def test_negative_workers_are_rejected():
+    with pytest.raises(ValueError):
+        ToolExecutor(workers=-1)
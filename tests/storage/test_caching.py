@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from mcp_filesystem.storage.caching import CachingStorage
+from mcp_filesystem.storage.events import ChangeNotifier, EventType, FileEvent
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+
+@pytest.fixture
+def notifier() -> ChangeNotifier:
+    return ChangeNotifier()
+
+
+@pytest.fixture
+def cached(root: Path, notifier: ChangeNotifier) -> Iterator[CachingStorage]:
+    backend = FilesystemStorage([str(root)], notifier=notifier)
+    cache = CachingStorage(backend, [str(root)], 1024 * 1024, notifier=notifier)
+    yield cache
+    cache.close()
+
+
+def test_repeated_reads_hit(cached: CachingStorage, root: Path):
+    path = root / "a.txt"
+    path.write_text("one\ntwo\nthree\n")
+    assert cached.read_text_file(str(path)) == "one\ntwo\nthree\n"
+    assert cached.read_text_file(str(path)) == "one\ntwo\nthree\n"
+    assert cached.read_text_file(str(path), head=2) == "one\ntwo\n"
+    stats = cached.cache_stats()
+    assert stats.enabled and stats.hits >= 1 and stats.misses >= 1
+
+
+def test_external_changes_are_seen(cached: CachingStorage, root: Path):
+    path = root / "a.txt"
+    path.write_text("old")
+    assert cached.read_text_file(str(path)) == "old"
+    path.write_text("newer")
+    assert cached.read_text_file(str(path)) == "newer"
+
+
+def test_events_cover_rewrites_keeping_size_and_mtime(
+    cached: CachingStorage, root: Path, notifier: ChangeNotifier
+):
+    path = root / "a.txt"
+    path.write_text("old")
+    assert cached.read_text_file(str(path)) == "old"
+    stat = path.stat()
+    path.write_text("new")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    notifier.publish(FileEvent(EventType.MODIFIED, str(path)))
+    assert cached.read_text_file(str(path)) == "new"
+
+
+def test_own_writes_are_seen(cached: CachingStorage, root: Path):
+    path = root / "a.txt"
+    path.write_text("old")
+    assert cached.read_text_file(str(path)) == "old"
+    cached.write_file(str(path), "new")
+    assert cached.read_text_file(str(path)) == "new"
+
+
+def test_events_invalidate(
+    cached: CachingStorage, root: Path, notifier: ChangeNotifier
+):
+    path = root / "a.txt"
+    path.write_text("x")
+    cached.read_text_file(str(path))
+    assert cached.cache_stats().entries == 1
+    notifier.publish(FileEvent(EventType.MODIFIED, str(path)))
+    assert cached.cache_stats().entries == 0
+    cached.read_text_file(str(path))
+    notifier.publish(FileEvent(EventType.OVERFLOW, str(root), is_directory=True))
+    assert cached.cache_stats().entries == 0
+
+
+def test_budget_evicts_least_recently_used(root: Path):
+    backend = FilesystemStorage([str(root)])
+    cache = CachingStorage(backend, [str(root)], max_bytes=400, max_entry_bytes=400)
+    for name in "abc":
+        (root / name).write_text(name * 150)
+        cache.read_text_file(str(root / name))
+    stats = cache.cache_stats()
+    assert stats.bytes <= 400
+    assert stats.evictions >= 1
+
+
+def test_read_multiple_files_uses_the_cache(cached: CachingStorage, root: Path):
+    (root / "a.txt").write_text("a")
+    (root / "b.txt").write_text("b")
+    paths = [str(root / "a.txt"), str(root / "b.txt")]
+    first = cached.read_multiple_files(paths)
+    assert cached.read_multiple_files(paths) == first
+    assert first["files"] == {paths[0]: "a", paths[1]: "b"}
+    assert cached.cache_stats().hits >= 2
@@ -0,0 +1,87 @@
+import os
+import stat
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from mcp_filesystem.storage import copying
+from mcp_filesystem.storage.copying import FileCopier
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+METHODS = [
+    copying.METHOD_CLONE,
+    copying.METHOD_COPY_FILE_RANGE,
+    copying.METHOD_SENDFILE,
+    copying.METHOD_READ_WRITE,
+]
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("size", [0, 1, 3 * 1024 * 1024 + 5])
+def test_every_method_copies_exactly(
+    tmp_path: Path, monkeypatch, method: str, size: int
+):
+    monkeypatch.setattr(copying, "COPY_CHUNK", 1024 * 1024)
+    data = os.urandom(size)
+    (tmp_path / "src").write_bytes(data)
+    copier = FileCopier()
+    src_fd = os.open(tmp_path / "src", os.O_RDONLY)
+    dst_fd = os.open(tmp_path / "dst", os.O_WRONLY | os.O_CREAT)
+    try:
+        devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+        for other in METHODS:
+            if other != method:
+                copier._disabled.add((other,) + devices)
+        copied: List[int] = []
+        used = copier.copy(src_fd, dst_fd, size, copied.append)
+    finally:
+        os.close(src_fd)
+        os.close(dst_fd)
+    assert (tmp_path / "dst").read_bytes() == data
+    assert sum(copied) == size
+    # Unsupported kernel paths fall back to the next method.
+    assert used == method or METHODS.index(used) > METHODS.index(method)
+
+
+def test_copy_file_keeps_metadata(storage: FilesystemStorage, root: Path):
+    source = root / "a.txt"
+    source.write_text("contents")
+    os.chmod(source, 0o640)
+    os.utime(source, ns=(1_000_000_000, 2_000_000_000))
+    result = storage.copy_file(str(source), str(root / "b.txt"))
+    copy = root / "b.txt"
+    assert copy.read_text() == "contents"
+    assert stat.S_IMODE(copy.stat().st_mode) == 0o640
+    assert copy.stat().st_mtime_ns == 2_000_000_000
+    assert (result.files, result.bytes) == (1, len("contents"))
+
+
+def test_copy_file_overwrite(storage: FilesystemStorage, root: Path):
+    (root / "a.txt").write_text("new")
+    (root / "b.txt").write_text("old")
+    with pytest.raises(FileExistsError):
+        storage.copy_file(str(root / "a.txt"), str(root / "b.txt"))
+    storage.copy_file(str(root / "a.txt"), str(root / "b.txt"), overwrite=True)
+    assert (root / "b.txt").read_text() == "new"
+
+
+def test_copy_tree(storage: FilesystemStorage, root: Path):
+    source = root / "src"
+    (source / "sub" / "deep").mkdir(parents=True)
+    (source / "a.txt").write_text("a")
+    (source / "sub" / "deep" / "b.txt").write_text("bb")
+    (source / "link").symlink_to("a.txt")
+    (root / "dest").mkdir()
+    result = storage.copy_file(str(source), str(root / "dest"))
+    copy = root / "dest" / "src"
+    assert (copy / "sub" / "deep" / "b.txt").read_text() == "bb"
+    assert os.readlink(copy / "link") == "a.txt"
+    assert (result.files, result.directories, result.symlinks) == (2, 3, 1)
+    assert result.bytes == 3 and result.errors == {}
+
+
+def test_copy_into_itself_is_rejected(storage: FilesystemStorage, root: Path):
+    (root / "src").mkdir()
+    with pytest.raises(ValueError, match="into itself"):
+        storage.copy_file(str(root / "src"), str(root / "src" / "inner"))
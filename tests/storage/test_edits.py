@@ -0,0 +1,143 @@
+import random
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from mcp_filesystem.storage.edits import (
+    EditError,
+    apply_replacements,
+    find_anchors,
+    plan_edits,
+    preview_diff,
+)
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+
+def brute_force_positions(text: str, anchor: str) -> List[int]:
+    return [i for i in range(len(text)) if text.startswith(anchor, i)]
+
+
+def edit(old: str, new: str, **kw: Any) -> Dict[str, Any]:
+    return {"old_text": old, "new_text": new, **kw}
+
+
+def apply(text: str, edits: List[Dict[str, Any]]) -> str:
+    return apply_replacements(text, plan_edits(text, edits))
+
+
+def test_find_anchors_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(300):
+        text = "".join(rng.choice("ab\n") for _ in range(rng.randint(0, 40)))
+        anchors = [
+            "".join(rng.choice("ab\n") for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        found = find_anchors(text, anchors)
+        for anchor in anchors:
+            assert found[anchor] == brute_force_positions(text, anchor), (
+                text,
+                anchors,
+            )
+
+
+def test_unique_anchor_is_required():
+    assert apply("one two three", [edit("two", "2")]) == "one 2 three"
+    with pytest.raises(EditError, match="occurs 2 times"):
+        apply("x x", [edit("x", "y")])
+    with pytest.raises(EditError, match="not found"):
+        apply("abc", [edit("z", "y")])
+
+
+def test_occurrence_and_replace_all():
+    assert apply("x x x", [edit("x", "y", occurrence=2)]) == "x y x"
+    assert apply("x x x", [edit("x", "y", replace_all=True)]) == "y y y"
+    assert apply("aaaa", [edit("aa", "b", replace_all=True)]) == "bb"
+    with pytest.raises(EditError, match="occurrence 4"):
+        apply("x x x", [edit("x", "y", occurrence=4)])
+
+
+def test_line_ranges_select_occurrences():
+    text = "x\nx\nx\n"
+    assert apply(text, [edit("x", "y", start_line=2, end_line=2)]) == "x\ny\nx\n"
+    assert apply(text, [edit("x", "y", start_line=3)]) == "x\nx\ny\n"
+    assert apply(text, [edit("x", "y", end_line=2, occurrence=2)]) == "x\ny\nx\n"
+    with pytest.raises(EditError, match="in lines 1-2"):
+        apply(text, [edit("x", "y", end_line=2)])
+
+
+def test_edits_match_the_original_text():
+    assert apply("a b", [edit("a", "b"), edit("b", "c")]) == "b c"
+
+
+def test_overlapping_edits_are_rejected():
+    with pytest.raises(EditError, match="overlap"):
+        apply("abcdef", [edit("abcd", "x"), edit("cdef", "y")])
+    with pytest.raises(EditError, match="overlap"):
+        apply("abc", [edit("abc", "x"), edit("b", "y")])
+
+
+def patched(original: str, diff: str, tmp_path: Path) -> str:
+    source = tmp_path / "original"
+    source.write_text(original)
+    result = tmp_path / "result"
+    subprocess.run(
+        ["patch", "--quiet", "--force", "-o", str(result), str(source)],
+        input=diff.encode(),
+        check=True,
+    )
+    return result.read_text()
+
+
+@pytest.mark.skipif(shutil.which("patch") is None, reason="GNU patch not installed")
+def test_preview_diff_applies_with_patch(tmp_path: Path):
+    rng = random.Random(11)
+    words = ["alpha", "beta", "gamma", "delta", "", "x"]
+    for round_number in range(150):
+        lines = [rng.choice(words) for _ in range(rng.randint(1, 30))]
+        text = "\n".join(f"{i} {w}" for i, w in enumerate(lines))
+        if rng.random() < 0.7:
+            text += "\n"
+        targets = sorted(
+            rng.sample(range(len(lines)), rng.randint(1, min(4, len(lines))))
+        )
+        edits = []
+        for i in targets:
+            old = f"{i} {lines[i]}"
+            if i + 1 < len(lines) and rng.random() < 0.2:
+                old += "\n"  # the edit removes a line break
+            new = rng.choice(["", "new", "two\nlines", f"{i} {lines[i]}!"])
+            edits.append(edit(old, new, start_line=i + 1, end_line=i + 2, occurrence=1))
+        try:
+            replacements = plan_edits(text, edits)
+        except EditError:
+            continue  # e.g. two edits overlapping through a removed newline
+        expected = apply_replacements(text, replacements)
+        diff = preview_diff(text, replacements, "a/f", "b/f", context=rng.randint(0, 3))
+        if expected == text:
+            assert diff == ""
+            continue
+        assert patched(text, diff, tmp_path) == expected, (round_number, diff)
+
+
+def test_preview_diff_caps_hunks():
+    text = "".join(f"line {i}\n" for i in range(100))
+    edits = [edit(f"line {i}\n", f"LINE {i}\n") for i in range(0, 100, 10)]
+    diff = preview_diff(text, plan_edits(text, edits), max_hunks=2)
+    assert diff.count("@@ -") == 2
+
+
+def test_edit_file_dry_run_and_apply(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_text("a\nb\nc\n")
+    preview = storage.edit_file(str(path), [edit("b", "B")], dry_run=True)
+    assert "-b\n+B" in preview
+    assert path.read_text() == "a\nb\nc\n"
+    storage.edit_file(str(path), [edit("b", "B"), edit("c", "C")])
+    assert path.read_text() == "a\nB\nC\n"
+    with pytest.raises(EditError):
+        storage.edit_file(str(path), [edit("missing", "x")])
+    assert path.read_text() == "a\nB\nC\n"
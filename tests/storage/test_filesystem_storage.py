@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.utils.path_validation import PathValidationError
+
+
+@pytest.fixture
+def tree(root: Path) -> Path:
+    (root / "Beta").mkdir()
+    (root / "alpha").mkdir()
+    (root / "alpha" / "inner.py").write_text("x" * 3)
+    (root / "b.txt").write_text("x" * 20)
+    (root / "A.txt").write_text("x" * 10)
+    return root
+
+
+def test_list_directory_puts_directories_first(storage: FilesystemStorage, tree: Path):
+    names = [e.name for e in storage.list_directory(str(tree))]
+    assert names == ["alpha", "Beta", "A.txt", "b.txt"]
+
+
+def test_list_directory_sort_modes(storage: FilesystemStorage, tree: Path):
+    by_name = storage.list_directory(str(tree), sort="name")
+    assert [e.name for e in by_name] == ["A.txt", "Beta", "alpha", "b.txt"]
+    files = [
+        e.name
+        for e in storage.list_directory(str(tree), sort="size")
+        if not e.is_directory
+    ]
+    assert files == ["A.txt", "b.txt"]
+
+
+def test_list_directory_filter(storage: FilesystemStorage, tree: Path):
+    names = [e.name for e in storage.list_directory(str(tree), filter="*.txt")]
+    assert names == ["A.txt", "b.txt"]
+
+
+def test_names_only_skips_stat_fields(storage: FilesystemStorage, tree: Path):
+    entries = storage.list_directory(str(tree), names_only=True)
+    assert {e.name: e.is_directory for e in entries} == {
+        "alpha": True,
+        "Beta": True,
+        "A.txt": False,
+        "b.txt": False,
+    }
+    assert all(e.size is None and e.modified is None for e in entries)
+
+
+def test_list_directory_reports_sizes(storage: FilesystemStorage, tree: Path):
+    sizes = {e.name: e.size for e in storage.list_directory(str(tree))}
+    assert sizes["A.txt"] == 10
+    assert sizes["b.txt"] == 20
+
+
+def test_dangling_symlink_is_listed(storage: FilesystemStorage, tree: Path):
+    os.symlink(tree / "nowhere", tree / "dangling")
+    names = [e.name for e in storage.list_directory(str(tree))]
+    assert "dangling" in names
+
+
+def test_list_directory_rejects_a_file(storage: FilesystemStorage, tree: Path):
+    with pytest.raises(NotADirectoryError):
+        storage.list_directory(str(tree / "A.txt"))
+
+
+def test_paths_outside_the_allowed_directories_are_rejected(
+    storage: FilesystemStorage, tree: Path
+):
+    with pytest.raises(PathValidationError):
+        storage.list_directory(str(tree.parent))
+
+
+def test_search_files_recursive(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(str(tree), "*.py", recursive=True)
+    assert [m.path for m in result.matches] == [str(tree / "alpha" / "inner.py")]
+    assert result.matches[0].size == 3
+    assert storage.search_files(str(tree), "*.py").matches == []
+
+
+def test_search_files_names_only(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(str(tree), "*.txt", names_only=True)
+    assert sorted(m.name for m in result.matches) == ["A.txt", "b.txt"]
+    assert all(m.size is None for m in result.matches)
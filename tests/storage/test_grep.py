@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage import grep
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.grep import compile_query, scan_file
+
+TEXT = "alpha\nbeta needle\ngamma\nneedle twice needle\n\nlast NEEDLE"
+
+
+@pytest.fixture
+def sample(root: Path) -> Path:
+    path = root / "sample.txt"
+    path.write_text(TEXT)
+    return path
+
+
+def expected_lines(text: str, word: str):
+    return [
+        (number, line)
+        for number, line in enumerate(text.split("\n"), start=1)
+        if word in line
+    ]
+
+
+def test_one_match_per_line_with_line_numbers(sample: Path):
+    matches = scan_file(str(sample), compile_query("needle"))
+    assert [(m.line_number, m.line) for m in matches] == expected_lines(TEXT, "needle")
+    assert matches[0].byte_offset == TEXT.index("needle")
+
+
+def test_line_numbers_with_tiny_count_chunks(sample: Path, monkeypatch):
+    monkeypatch.setattr(grep, "COUNT_CHUNK_BYTES", 3)
+    matches = scan_file(str(sample), compile_query("needle"))
+    assert [m.line_number for m in matches] == [2, 4]
+
+
+def test_ignore_case_and_regex(sample: Path):
+    matches = scan_file(str(sample), compile_query("needle", ignore_case=True))
+    assert [m.line_number for m in matches] == [2, 4, 6]
+    matches = scan_file(str(sample), compile_query(r"^g\w+$", regex=True))
+    assert [m.line for m in matches] == ["gamma"]
+
+
+def test_context_lines(sample: Path):
+    (match,) = scan_file(str(sample), compile_query("gamma"), context_lines=1)
+    assert match.before == ["beta needle"]
+    assert match.after == ["needle twice needle"]
+
+
+def test_limit_and_binary_files(root: Path, sample: Path):
+    assert len(scan_file(str(sample), compile_query("needle"), limit=1)) == 1
+    binary = root / "blob.bin"
+    binary.write_bytes(b"needle\0\1\2")
+    assert scan_file(str(binary), compile_query("needle")) == []
+
+
+def test_grep_files_walks_and_filters(storage: FilesystemStorage, root: Path):
+    (root / "sub").mkdir()
+    (root / "a.txt").write_text("needle\n")
+    (root / "sub" / "b.py").write_text("x\nneedle\n")
+    (root / "sub" / "c.txt").write_text("nothing\n")
+    result = storage.grep_files(str(root), "needle")
+    assert sorted((m.path, m.line_number) for m in result.matches) == [
+        (str(root / "a.txt"), 1),
+        (str(root / "sub" / "b.py"), 2),
+    ]
+    result = storage.grep_files(str(root), "needle", include="*.py")
+    assert [m.path for m in result.matches] == [str(root / "sub" / "b.py")]
+    result = storage.grep_files(str(root), "needle", max_results=1)
+    assert result.truncated_reason == "max_results"
+
+
+def test_grep_files_times_out_with_nothing_to_scan(
+    storage: FilesystemStorage, root: Path
+):
+    for i in range(50):
+        (root / f"{i}.txt").write_text("needle\n")
+    result = storage.grep_files(str(root), "needle", include="*.none", timeout=0)
+    assert result.matches == []
+    assert result.truncated_reason == "timeout"
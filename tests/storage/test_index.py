@@ -0,0 +1,157 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from mcp_filesystem.storage import index as index_module
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.index import FileIndex
+
+
+@pytest.fixture
+def tree(root: Path) -> Path:
+    for d in ("a", "a/b", "c"):
+        (root / d).mkdir()
+    for f in ("top.txt", "a/one.txt", "a/b/two.txt", "c/three.log"):
+        (root / f).write_text(f)
+    return root
+
+
+@pytest.fixture
+def index(tree: Path, tmp_path_factory: pytest.TempPathFactory) -> Iterator[FileIndex]:
+    db = tmp_path_factory.mktemp("db") / "index.sqlite"
+    idx = FileIndex(str(db), [str(tree)])
+    idx.build()
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def indexed(tree: Path, index: FileIndex) -> Iterator[FilesystemStorage]:
+    fs = FilesystemStorage([str(tree)], index=index)
+    yield fs
+    fs.close()
+
+
+def walk(index: FileIndex, directory: Path):
+    rows = index.walk_files(str(directory))
+    assert rows is not None
+    return sorted(os.path.relpath(row[0], directory) for row in rows)
+
+
+def test_build_indexes_every_entry(tree: Path, index: FileIndex):
+    assert walk(index, tree) == ["a/b/two.txt", "a/one.txt", "c/three.log", "top.txt"]
+    assert index.status()["directories"] == 4  # the root included
+
+
+def test_rebuild_reuses_unchanged_directories(tree: Path, index: FileIndex):
+    counters = index.build()
+    assert counters["scanned_dirs"] == 0
+    assert counters["reused_dirs"] == 4
+    (tree / "c" / "new.txt").write_text("x")
+    counters = index.build()
+    assert counters["scanned_dirs"] == 1
+
+
+def test_build_in_small_batches_matches_one_batch(
+    tree: Path, tmp_path_factory: pytest.TempPathFactory, monkeypatch
+):
+    monkeypatch.setattr(index_module, "BATCH_DIRS", 1)
+    idx = FileIndex(str(tmp_path_factory.mktemp("db") / "i.sqlite"), [str(tree)])
+    try:
+        assert idx.build()["scanned_dirs"] == 4
+        assert walk(idx, tree) == [
+            "a/b/two.txt",
+            "a/one.txt",
+            "c/three.log",
+            "top.txt",
+        ]
+    finally:
+        idx.close()
+
+
+def test_walk_files_sees_changes_made_without_events(tree: Path, index: FileIndex):
+    (tree / "a" / "one.txt").unlink()
+    (tree / "a" / "b" / "new.txt").write_text("new")
+    (tree / "d").mkdir()
+    (tree / "d" / "deep.txt").write_text("deep")
+    assert walk(index, tree) == [
+        "a/b/new.txt",
+        "a/b/two.txt",
+        "c/three.log",
+        "d/deep.txt",
+        "top.txt",
+    ]
+
+
+def test_children_rescan_a_changed_directory(tree: Path, index: FileIndex):
+    (tree / "c" / "three.log").unlink()
+    (tree / "c" / "four.log").write_text("4")
+    rows = index.children(str(tree / "c"))
+    assert rows is not None
+    assert [row[2] for row in rows] == ["four.log"]
+
+
+def test_unindexed_directory_is_not_answered(tree: Path, index: FileIndex):
+    assert index.walk_files("/") is None
+    assert index.children(str(tree / "missing")) is None
+
+
+def test_search_reports_current_sizes(tree: Path, indexed: FilesystemStorage):
+    (tree / "a" / "one.txt").write_text("much longer than before")
+    result = indexed.search_files(str(tree), "one.txt", recursive=True)
+    assert [m.size for m in result.matches] == [len("much longer than before")]
+
+
+def test_listings_report_sizes_after_in_place_writes(
+    tree: Path, index: FileIndex, indexed: FilesystemStorage
+):
+    with open(tree / "top.txt", "r+") as f:
+        f.write("x" * 5000)
+    index.build()
+    sizes = {e.name: e.size for e in indexed.list_directory(str(tree))}
+    assert sizes["top.txt"] == 5000
+    listing = indexed.list_directory_with_sizes(str(tree), sort="size")
+    assert listing.entries[-1].name == "top.txt"
+    assert listing.entries[-1].size == 5000
+    page = indexed.list_directory_page(str(tree), limit=10, sort="name")
+    assert [e.size for e in page.entries if e.name == "top.txt"] == [5000]
+
+
+def test_listings_skip_entries_deleted_since_the_build(
+    tree: Path, indexed: FilesystemStorage
+):
+    # Keep the directory's mtime, so the index does not rescan it.
+    before = os.stat(tree)
+    (tree / "top.txt").unlink()
+    os.utime(tree, ns=(before.st_atime_ns, before.st_mtime_ns))
+    names = [e.name for e in indexed.list_directory(str(tree), sort="name")]
+    assert names == ["a", "c"]
+
+
+def test_search_skips_files_deleted_since_the_build(
+    tree: Path, indexed: FilesystemStorage
+):
+    (tree / "a" / "b" / "two.txt").unlink()
+    result = indexed.search_files(str(tree), "*.txt", recursive=True)
+    assert sorted(m.name for m in result.matches) == ["one.txt", "top.txt"]
+
+
+def test_get_file_info_of_deleted_file_raises(tree: Path, indexed: FilesystemStorage):
+    (tree / "top.txt").unlink()
+    with pytest.raises(FileNotFoundError):
+        indexed.get_file_info(str(tree / "top.txt"))
+
+
+def test_storage_writes_update_the_index(tree: Path, indexed: FilesystemStorage):
+    indexed.write_file(str(tree / "c" / "written.txt"), "w")
+    indexed.move_file(str(tree / "a"), str(tree / "moved"))
+    assert indexed.index is not None
+    assert walk(indexed.index, tree) == [
+        "c/three.log",
+        "c/written.txt",
+        "moved/b/two.txt",
+        "moved/one.txt",
+        "top.txt",
+    ]
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage import line_index
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+TEXT = "".join(f"line {i} ção\n" for i in range(1, 201)) + "last without newline"
+
+
+def naive_lines(text: str, start: int, end: int) -> str:
+    return "".join(text.splitlines(keepends=True)[start - 1 : end])
+
+
+@pytest.fixture(params=[7, 64, 64 * 1024], ids=lambda size: f"block{size}")
+def checkpoint_bytes(request, monkeypatch) -> int:
+    monkeypatch.setattr(line_index, "CHECKPOINT_BYTES", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "start, end", [(1, 1), (1, 3), (50, 60), (199, 201), (201, 201), (150, 500)]
+)
+def test_line_ranges_match_a_naive_split(
+    storage: FilesystemStorage, root: Path, checkpoint_bytes: int, start, end
+):
+    path = root / "f.txt"
+    path.write_text(TEXT)
+    got = storage.read_text_file(str(path), start_line=start, end_line=end)
+    assert got == naive_lines(TEXT, start, end)
+
+
+def test_line_range_past_the_end_is_empty(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_text("a\nb\n")
+    assert storage.read_text_file(str(path), start_line=5, end_line=9) == ""
+    assert storage.read_text_file(str(path), start_line=2) == "b\n"
+
+
+def test_cached_index_follows_file_changes(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_text("a\nb\nc\n")
+    assert storage.read_text_file(str(path), start_line=2, end_line=2) == "b\n"
+    path.write_text("x\ny\n")
+    assert storage.read_text_file(str(path), start_line=2, end_line=3) == "y\n"
+
+
+def test_line_range_normalizes_line_endings(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_bytes(b"a\r\nb\r\nc\r\n")
+    assert storage.read_text_file(str(path), start_line=2, end_line=3) == "b\nc\n"
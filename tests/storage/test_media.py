@@ -0,0 +1,58 @@
+import base64
+import os
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage import media
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.media import encode_file_base64, sniff_mime_type
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.mark.parametrize("block", [3, 6, media.ENCODE_BLOCK_BYTES])
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 5, 6, 7, 100])
+def test_block_encoding_matches_b64encode(
+    tmp_path: Path, monkeypatch, block: int, size: int
+):
+    monkeypatch.setattr(media, "ENCODE_BLOCK_BYTES", block)
+    data = os.urandom(size)
+    path = tmp_path / "blob"
+    path.write_bytes(data)
+    assert encode_file_base64(str(path)) == (base64.b64encode(data).decode(), size)
+
+
+def test_sniff_mime_type():
+    assert sniff_mime_type(PNG_HEADER, "x.bin") == "image/png"
+    assert sniff_mime_type(b"RIFF\0\0\0\0WEBPVP8 ", "x") == "image/webp"
+    assert sniff_mime_type(b"\0\0\0\x18ftypmp42", "x") == "video/mp4"
+    assert sniff_mime_type(b'<?xml version="1.0"?><svg>', "x") == "image/svg+xml"
+    assert sniff_mime_type(b"plain", "notes.txt") == "text/plain"
+    assert sniff_mime_type(b"\0\1", "unknown") == "application/octet-stream"
+
+
+def test_read_media_file(storage: FilesystemStorage, root: Path):
+    data = PNG_HEADER + os.urandom(50)
+    (root / "image").write_bytes(data)
+    result = storage.read_media_file(str(root / "image"))
+    assert result.mime_type == "image/png"
+    assert result.size == len(data)
+    assert base64.b64decode(result.data) == data
+    assert not result.downscaled
+
+
+def test_media_size_cap(root: Path):
+    (root / "big.bin").write_bytes(b"x" * 100)
+    storage = FilesystemStorage([str(root)], max_media_bytes=50)
+    with pytest.raises(ValueError, match="media limit"):
+        storage.read_media_file(str(root / "big.bin"))
+    with pytest.raises(ValueError, match="media limit"):
+        storage.read_media_file(str(root / "big.bin"), max_bytes=1000)
+
+
+def test_downscale_large_images(storage: FilesystemStorage, root: Path):
+    image_module = pytest.importorskip("PIL.Image")
+    image_module.new("RGB", (400, 200)).save(root / "wide.png")
+    result = storage.read_media_file(str(root / "wide.png"), max_dimension=100)
+    assert result.downscaled and result.mime_type == "image/png"
@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.pagination import InvalidCursorError, ListingSessions
+
+
+@pytest.fixture
+def tree(root: Path) -> Path:
+    for i in range(25):
+        (root / f"f{i:02d}.txt").write_text("x" * (25 - i))
+    (root / "sub").mkdir()
+    return root
+
+
+def all_pages(
+    storage: FilesystemStorage, path: Path, limit: int, sort: str = "default", **kw
+) -> List[str]:
+    names: List[str] = []
+    cursor: Optional[str] = None
+    while True:
+        page = storage.list_directory_page(
+            str(path), limit, cursor=cursor, sort=sort, **kw
+        )
+        assert len(page.entries) <= limit
+        names.extend(e.name for e in page.entries)
+        cursor = page.next_cursor
+        if cursor is None:
+            return names
+
+
+@pytest.mark.parametrize("sort", ["default", "name", "size", "modified"])
+def test_pages_concatenate_to_the_full_listing(
+    storage: FilesystemStorage, tree: Path, sort: str
+):
+    full = [e.name for e in storage.list_directory(str(tree), sort=sort)]
+    assert all_pages(storage, tree, 4, sort) == full
+
+
+def test_unsorted_pages_cover_every_entry_once(storage: FilesystemStorage, tree: Path):
+    names = all_pages(storage, tree, 7, "none")
+    assert sorted(names) == sorted(p.name for p in tree.iterdir())
+
+
+def test_last_page_has_no_cursor(storage: FilesystemStorage, tree: Path):
+    page = storage.list_directory_page(str(tree), 100)
+    assert len(page.entries) == 26
+    assert page.next_cursor is None
+
+
+def test_cursor_survives_an_evicted_session(storage: FilesystemStorage, tree: Path):
+    first = storage.list_directory_page(str(tree), 10, sort="name")
+    assert first.next_cursor is not None
+    storage._listings = ListingSessions()
+    rest = all_pages(storage, tree, 10, "name")[10:]
+    resumed = storage.list_directory_page(
+        str(tree), 100, cursor=first.next_cursor, sort="name"
+    )
+    assert [e.name for e in resumed.entries] == rest
+
+
+def test_resumed_listing_skips_nothing_after_a_deletion(
+    storage: FilesystemStorage, tree: Path
+):
+    first = storage.list_directory_page(str(tree), 5, sort="name")
+    assert first.next_cursor is not None
+    storage._listings = ListingSessions()
+    (tree / "f02.txt").unlink()
+    resumed = storage.list_directory_page(
+        str(tree), 1, cursor=first.next_cursor, sort="name"
+    )
+    assert [e.name for e in resumed.entries] == ["f05.txt"]
+
+
+def test_same_cursor_twice_gives_the_same_page(storage: FilesystemStorage, tree: Path):
+    cursor = storage.list_directory_page(str(tree), 5).next_cursor
+    again = [
+        [e.name for e in storage.list_directory_page(str(tree), 5, cursor).entries]
+        for _ in range(2)
+    ]
+    assert again[0] == again[1]
+
+
+def test_cursor_of_another_listing_is_rejected(storage: FilesystemStorage, tree: Path):
+    cursor = storage.list_directory_page(str(tree), 5, sort="name").next_cursor
+    with pytest.raises(InvalidCursorError):
+        storage.list_directory_page(str(tree), 5, cursor=cursor, sort="size")
+    with pytest.raises(InvalidCursorError):
+        storage.list_directory_page(str(tree), 5, cursor="not a cursor")
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.readers import truncation_marker
+
+
+def write(path: Path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_reads_every_file_in_request_order(storage: FilesystemStorage, root: Path):
+    paths = [write(root / f"{i}.txt", f"file {i}") for i in range(20)]
+    result = storage.read_multiple_files(paths)
+    assert list(result["files"]) == paths
+    assert result["files"][paths[7]] == "file 7"
+    assert result["errors"] == {}
+
+
+def test_errors_are_reported_per_file(storage: FilesystemStorage, root: Path):
+    ok = write(root / "ok.txt", "ok")
+    (root / "dir").mkdir()
+    result = storage.read_multiple_files([ok, str(root / "missing"), str(root / "dir")])
+    assert result["files"] == {ok: "ok"}
+    assert set(result["errors"]) == {str(root / "missing"), str(root / "dir")}
+
+
+def test_per_file_cap_truncates_with_marker(storage: FilesystemStorage, root: Path):
+    path = write(root / "a.txt", "0123456789")
+    result = storage.read_multiple_files([path], max_file_bytes=4)
+    assert result["files"][path] == "0123" + truncation_marker(4, 10)
+
+
+def test_per_file_cap_never_splits_a_character(storage: FilesystemStorage, root: Path):
+    path = write(root / "a.txt", "aé")  # "é" takes bytes 1-2
+    result = storage.read_multiple_files([path], max_file_bytes=2)
+    assert result["files"][path].startswith("a\n")
+
+
+def test_total_budget_is_shared_in_order(storage: FilesystemStorage, root: Path):
+    first = write(root / "1.txt", "a" * 6)
+    second = write(root / "2.txt", "b" * 6)
+    third = write(root / "3.txt", "c" * 6)
+    result = storage.read_multiple_files([first, second, third], max_total_bytes=10)
+    assert result["files"][first] == "a" * 6
+    assert result["files"][second] == "b" * 4 + truncation_marker(4, 6)
+    assert third not in result["files"]
+    assert "budget" in result["errors"][third]
+
+
+def test_line_endings_are_normalized_like_text_mode(
+    storage: FilesystemStorage, root: Path
+):
+    crlf = root / "crlf.txt"
+    crlf.write_bytes(b"one\r\ntwo\r\n")
+    cr = root / "cr.txt"
+    cr.write_bytes(b"one\rtwo\r")
+    result = storage.read_multiple_files([str(crlf), str(cr)])
+    for path in (crlf, cr):
+        with open(path, encoding="utf-8") as file:
+            assert result["files"][str(path)] == file.read() == "one\ntwo\n"
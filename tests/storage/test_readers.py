@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage.readers import read_byte_range, read_tail_lines
+
+SAMPLES = [
+    "",
+    "\n",
+    "one line",
+    "one line\n",
+    "a\nb\nc",
+    "a\nb\nc\n",
+    "a\n\n\nb\n\n",
+    "ção\nçãé\n日本語\n🙂 x\n",
+    "crlf\r\nline\r\nend\r\n",
+    "x" * 300 + "\n" + "y" * 300,
+]
+
+
+def naive_tail(text: str, lines: int) -> str:
+    text = text.replace("\r\n", "\n")
+    kept = text.splitlines(keepends=True)[-lines:] if lines > 0 else []
+    return "".join(kept)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 64 * 1024])
+def test_tail_matches_the_last_lines(tmp_path: Path, text: str, block_size: int):
+    path = tmp_path / "f.txt"
+    path.write_bytes(text.encode("utf-8"))
+    for lines in range(0, 6):
+        assert read_tail_lines(str(path), lines, block_size) == naive_tail(
+            text, lines
+        ), lines
+
+
+def test_tail_of_a_file_larger_than_a_block(tmp_path: Path):
+    path = tmp_path / "big.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(100_000)))
+    assert read_tail_lines(str(path), 2) == "line 99998\nline 99999\n"
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_byte_ranges_drop_only_cut_characters(tmp_path: Path, text: str):
+    data = text.encode("utf-8")
+    path = tmp_path / "f.txt"
+    path.write_bytes(data)
+    for offset in range(len(data) + 1):
+        for length in (1, 2, 4, 7, None):
+            window = read_byte_range(str(path), offset, length).encode("utf-8")
+            end = len(data) if length is None else min(len(data), offset + length)
+            assert window in data[offset:end], (offset, length)
+            assert len(data[offset:end]) - len(window) <= 6
+
+
+def test_byte_range_keeps_whole_characters(tmp_path: Path):
+    path = tmp_path / "f.txt"
+    path.write_text("aé日b")  # a=0, é=1-2, 日=3-5, b=6
+    assert read_byte_range(str(path), 0, 3) == "aé"
+    assert read_byte_range(str(path), 2, 5) == "日b"
+    assert read_byte_range(str(path), 4) == "b"
+    assert read_byte_range(str(path), 1, 1) == ""
@@ -0,0 +1,104 @@
+import errno
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage import filesystem_storage
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.progress import OperationCancelled, reporting_to
+from mcp_filesystem.storage.removal import remove_tree
+
+
+def make_tree(base: Path, width: int = 4, depth: int = 3) -> int:
+    """Create a tree and return how many entries it holds below ``base``."""
+    base.mkdir()
+    count = 0
+    if depth:
+        for i in range(width):
+            count += 1 + make_tree(base / f"d{i}", width, depth - 1)
+    for i in range(width):
+        (base / f"f{i}.txt").write_text("x")
+        count += 1
+    return count
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_remove_tree_deletes_everything(tmp_path: Path, workers: int):
+    entries = make_tree(tmp_path / "tree")
+    removed = remove_tree(str(tmp_path / "tree"), workers)
+    assert not (tmp_path / "tree").exists()
+    assert removed == entries + 1  # the root included
+
+
+def test_symlinks_are_removed_not_followed(tmp_path: Path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    (tmp_path / "tree").mkdir()
+    (tmp_path / "tree" / "link").symlink_to(outside)
+    remove_tree(str(tmp_path / "tree"))
+    assert (outside / "keep.txt").read_text() == "keep"
+    (tmp_path / "dirlink").symlink_to(outside)
+    with pytest.raises(OSError, match="symbolic link"):
+        remove_tree(str(tmp_path / "dirlink"))
+    assert outside.exists()
+
+
+def test_cancelled_removal_stops(tmp_path: Path):
+    make_tree(tmp_path / "tree")
+    cancelled = threading.Event()
+    cancelled.set()
+    with reporting_to(None, cancelled):
+        with pytest.raises(OperationCancelled):
+            remove_tree(str(tmp_path / "tree"))
+
+
+def test_delete_file(storage: FilesystemStorage, root: Path):
+    make_tree(root / "tree", width=2, depth=2)
+    with pytest.raises(OSError):
+        storage.delete_file(str(root / "tree"))
+    storage.delete_file(str(root / "tree"), recursive=True)
+    assert not (root / "tree").exists()
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make every rename fail as if source and destination were on two devices."""
+
+    def rename(source, destination):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    monkeypatch.setattr(filesystem_storage.os, "rename", rename)
+
+
+def test_move_across_devices(storage: FilesystemStorage, root: Path, cross_device):
+    make_tree(root / "tree", width=2, depth=2)
+    (root / "tree" / "link").symlink_to("f0.txt")
+    storage.move_file(str(root / "tree"), str(root / "moved"))
+    assert not (root / "tree").exists()
+    assert (root / "moved" / "d1" / "d0" / "f1.txt").read_text() == "x"
+    assert os.readlink(root / "moved" / "link") == "f0.txt"
+    (root / "file.txt").write_text("data")
+    storage.move_file(str(root / "file.txt"), str(root / "moved"))
+    assert (root / "moved" / "file.txt").read_text() == "data"
+    assert not (root / "file.txt").exists()
+
+
+def test_failed_cross_device_move_keeps_the_source(
+    storage: FilesystemStorage, root: Path, cross_device, monkeypatch
+):
+    make_tree(root / "tree", width=2, depth=1)
+    copy_one = storage._copy_one
+
+    def flaky(source, *args):
+        if source.endswith("f1.txt"):
+            raise OSError(errno.EIO, "I/O error")
+        copy_one(source, *args)
+
+    monkeypatch.setattr(storage, "_copy_one", flaky)
+    with pytest.raises(OSError, match="left in place"):
+        storage.move_file(str(root / "tree"), str(root / "moved"))
+    assert (root / "tree" / "f1.txt").exists()
+    assert not (root / "moved").exists()
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+
+
+@pytest.fixture
+def tree(root: Path) -> Path:
+    for d in ("a/b/c", "node_modules/pkg", "src"):
+        (root / d).mkdir(parents=True)
+    for f in (
+        "top.py",
+        "a/one.py",
+        "a/b/two.py",
+        "a/b/c/three.py",
+        "node_modules/pkg/dep.py",
+        "src/main.py",
+    ):
+        (root / f).write_text("pass\n")
+    return root
+
+
+def rel(root: Path, result) -> list:
+    return sorted(str(Path(m.path).relative_to(root)) for m in result.matches)
+
+
+def test_max_results_truncates(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(str(tree), "*.py", recursive=True, max_results=2)
+    assert len(result.matches) == 2
+    assert result.truncated and result.truncated_reason == "max_results"
+
+
+def test_exact_max_results_is_not_truncated(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(str(tree), "*.py", recursive=True, max_results=6)
+    assert len(result.matches) == 6
+    assert not result.truncated and result.truncated_reason is None
+
+
+def test_max_depth_limits_the_walk(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(str(tree), "*.py", recursive=True, max_depth=1)
+    assert rel(tree, result) == ["a/one.py", "src/main.py", "top.py"]
+
+
+def test_exclude_prunes_directories(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(
+        str(tree), "*.py", recursive=True, exclude=["node_modules", "b"]
+    )
+    assert rel(tree, result) == ["a/one.py", "src/main.py", "top.py"]
+
+
+def test_zero_timeout_stops_without_matches(storage: FilesystemStorage, tree: Path):
+    result = storage.search_files(str(tree), "*.nothing", recursive=True, timeout=0)
+    assert result.matches == []
+    assert result.truncated_reason == "timeout"
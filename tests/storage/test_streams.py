@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.streams import InvalidStreamError, parse_stream_uri
+
+TEXT = "ascii ção 日本語 🙂 " * 40
+
+
+def read_all(storage: FilesystemStorage, path: Path, chunk_size: int) -> str:
+    stream = storage.open_file_stream(str(path), chunk_size)
+    return "".join(
+        storage.read_file_chunk(stream.handle, i) for i in range(stream.chunk_count)
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 64, 4096])
+def test_chunks_concatenate_to_the_file(
+    storage: FilesystemStorage, root: Path, chunk_size: int
+):
+    path = root / "f.txt"
+    path.write_text(TEXT)
+    assert read_all(storage, path, chunk_size) == TEXT
+
+
+def test_chunk_count_and_range(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_bytes(b"x" * 10)
+    stream = storage.open_file_stream(str(path), 4)
+    assert stream.chunk_count == 3
+    with pytest.raises(ValueError):
+        storage.read_file_chunk(stream.handle, 3)
+
+
+def test_changed_file_invalidates_the_stream(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_text("a" * 10)
+    stream = storage.open_file_stream(str(path), 4)
+    path.write_text("b" * 12)
+    with pytest.raises(InvalidStreamError):
+        storage.read_file_chunk(stream.handle, 0)
+
+
+def test_closed_stream_is_unknown(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_text("abc")
+    stream = storage.open_file_stream(str(path), 4)
+    storage.close_file_stream(stream.handle)
+    with pytest.raises(InvalidStreamError):
+        storage.read_file_chunk(stream.handle, 0)
+    with pytest.raises(InvalidStreamError):
+        storage.close_file_stream(stream.handle)
+
+
+def test_resource_uri_round_trip(storage: FilesystemStorage, root: Path):
+    path = root / "f.txt"
+    path.write_text("abc")
+    stream = storage.open_file_stream(str(path), 4)
+    uri = stream.resource_uri.replace("{index}", "0")
+    assert parse_stream_uri(uri) == (stream.handle, 0)
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from mcp_filesystem.storage.events import EventType, FileEvent
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.trigram import TrigramIndex, plan_query, trigrams_of
+
+
+@pytest.fixture
+def tree(root: Path) -> Path:
+    (root / "sub").mkdir()
+    (root / "a.txt").write_text("hello world\n")
+    (root / "sub" / "b.txt").write_text("another line\n")
+    (root / "blob.bin").write_bytes(b"hello\0world")
+    return root
+
+
+@pytest.fixture
+def index(
+    tree: Path, tmp_path_factory: pytest.TempPathFactory
+) -> Iterator[TrigramIndex]:
+    db = tmp_path_factory.mktemp("db") / "trigram.sqlite"
+    idx = TrigramIndex(str(db), [str(tree)], max_file_bytes=64)
+    idx.build()
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def indexed(tree: Path, index: TrigramIndex) -> Iterator[FilesystemStorage]:
+    fs = FilesystemStorage([str(tree)], content_index=index)
+    yield fs
+    fs.close()
+
+
+def candidates(index: TrigramIndex, tree: Path, pattern: str, regex: bool = False):
+    plan = plan_query(pattern, regex)
+    assert plan is not None
+    found = index.candidates(str(tree), plan)
+    assert found is not None
+    return [str(Path(p).relative_to(tree)) for p in found]
+
+
+def test_plan_query():
+    assert plan_query("ab") is None
+    assert plan_query("abcd") == [trigrams_of(b"abcd")]
+    assert plan_query("foo|bar", regex=True) == [
+        trigrams_of(b"foo"),
+        trigrams_of(b"bar"),
+    ]
+    assert plan_query("a.*b", regex=True) is None
+    assert plan_query("(", regex=True) is None
+
+
+def test_candidates_narrow_to_files_with_the_trigrams(index: TrigramIndex, tree: Path):
+    assert candidates(index, tree, "world") == ["a.txt"]
+    assert candidates(index, tree, "WORLD") == ["a.txt"]
+    assert candidates(index, tree, "line|world", regex=True) == ["a.txt", "sub/b.txt"]
+    assert candidates(index, tree, "missing") == []
+
+
+def test_large_files_are_always_candidates(index: TrigramIndex, tree: Path):
+    (tree / "big.txt").write_text("x" * 100)
+    assert candidates(index, tree, "missing") == ["big.txt"]
+
+
+def test_changes_without_events_are_candidates(index: TrigramIndex, tree: Path):
+    (tree / "sub" / "new.txt").write_text("a needle\n")
+    (tree / "sub" / "b.txt").unlink()
+    (tree / "a.txt").rename(tree / "sub" / "moved.txt")
+    assert candidates(index, tree, "needle") == ["sub/new.txt"]
+    assert candidates(index, tree, "another") == []
+    assert candidates(index, tree, "world") == ["sub/moved.txt"]
+
+
+def test_removed_directories_are_forgotten(index: TrigramIndex, tree: Path):
+    (tree / "sub" / "b.txt").unlink()
+    (tree / "sub").rmdir()
+    assert candidates(index, tree, "another") == []
+
+
+def test_in_place_rewrites_are_candidates_once_reported(
+    index: TrigramIndex, tree: Path
+):
+    with open(tree / "a.txt", "a") as file:
+        file.write("needle\n")
+    index.handle_event(FileEvent(EventType.MODIFIED, str(tree / "a.txt")))
+    assert candidates(index, tree, "needle") == ["a.txt"]
+
+
+def test_build_rereads_files_rewritten_in_place(index: TrigramIndex, tree: Path):
+    with open(tree / "a.txt", "a") as file:
+        file.write("a much longer needle\n")
+    counters = index.build()
+    assert counters["indexed_files"] == 1
+    assert candidates(index, tree, "needle") == ["a.txt"]
+
+
+def test_queries_only_list_changed_directories(
+    index: TrigramIndex, tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    listed: List[str] = []
+    scandir = os.scandir
+
+    def counting_scandir(path: Any) -> Any:
+        listed.append(str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    candidates(index, tree, "world")
+    assert listed == []
+    (tree / "sub" / "new.txt").write_text("new")
+    candidates(index, tree, "world")
+    assert listed == [str(tree / "sub")]
+
+
+def test_index_from_before_directory_mtimes_is_rebuilt(
+    tree: Path, tmp_path_factory: pytest.TempPathFactory
+):
+    db = tmp_path_factory.mktemp("db") / "old.sqlite"
+    conn = sqlite3.connect(db)
+    conn.executescript(
+        "CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, "
+        "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, kind INTEGER NOT NULL, "
+        "trigrams BLOB);"
+        "CREATE TABLE postings (trigram INTEGER NOT NULL, file_id INTEGER NOT NULL, "
+        "PRIMARY KEY (trigram, file_id)) WITHOUT ROWID;"
+    )
+    conn.close()
+    idx = TrigramIndex(str(db), [str(tree)])
+    try:
+        idx.build()
+        assert candidates(idx, tree, "world") == ["a.txt"]
+    finally:
+        idx.close()
+
+
+def test_searches_find_files_changed_outside_the_server(
+    indexed: FilesystemStorage, tree: Path
+):
+    with open(tree / "a.txt", "a") as file:
+        file.write("needle\n")
+    # What a watcher publishes for the in-place write.
+    indexed.notifier.publish(FileEvent(EventType.MODIFIED, str(tree / "a.txt")))
+    (tree / "sub" / "new.txt").write_text("a needle\n")
+    expected = [str(tree / "a.txt"), str(tree / "sub" / "new.txt")]
+    grepped = indexed.grep_files(str(tree), "needle")
+    assert sorted(m.path for m in grepped.matches) == expected
+    found = indexed.search_files(str(tree), "*", recursive=True, content="needle")
+    assert sorted(m.path for m in found.matches) == expected
+
+
+def test_storage_writes_reach_the_index(indexed: FilesystemStorage, tree: Path):
+    indexed.write_file(str(tree / "w.txt"), "written needle")
+    result = indexed.grep_files(str(tree), "written")
+    assert [m.path for m in result.matches] == [str(tree / "w.txt")]
@@ -0,0 +1,99 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.streams import InvalidStreamError
+from mcp_filesystem.storage.uploads import Uploads
+
+
+def temp_files(directory: Path):
+    return sorted(p.name for p in directory.iterdir() if p.name.endswith(".tmp"))
+
+
+def test_chunks_are_committed_atomically(storage: FilesystemStorage, root: Path):
+    path = root / "out.txt"
+    path.write_text("previous")
+    upload = storage.open_file_upload(str(path))
+    chunks = ["ção ", "日本", "🙂"]
+    for i, chunk in enumerate(chunks):
+        storage.write_file_chunk(upload.handle, chunk, index=i)
+        assert path.read_text() == "previous"
+    done = storage.commit_file_upload(
+        upload.handle, expected_bytes=len("".join(chunks).encode())
+    )
+    assert done.committed and done.chunks == 3
+    assert path.read_text(encoding="utf-8") == "ção 日本🙂"
+    assert temp_files(root) == []
+    with pytest.raises(InvalidStreamError):
+        storage.write_file_chunk(upload.handle, "late")
+
+
+def test_out_of_order_chunk_is_rejected(storage: FilesystemStorage, root: Path):
+    upload = storage.open_file_upload(str(root / "out.txt"))
+    storage.write_file_chunk(upload.handle, "a", index=0)
+    with pytest.raises(ValueError, match="Expected chunk 1"):
+        storage.write_file_chunk(upload.handle, "c", index=2)
+    storage.write_file_chunk(upload.handle, "b", index=1)
+    with pytest.raises(ValueError, match="expected 5"):
+        storage.commit_file_upload(upload.handle, expected_bytes=5)
+    storage.commit_file_upload(upload.handle)
+    assert (root / "out.txt").read_text() == "ab"
+
+
+def test_abort_removes_the_temp_file(storage: FilesystemStorage, root: Path):
+    upload = storage.open_file_upload(str(root / "out.txt"))
+    storage.write_file_chunk(upload.handle, "data")
+    storage.abort_file_upload(upload.handle)
+    assert temp_files(root) == []
+    assert not (root / "out.txt").exists()
+
+
+def test_evicted_upload_fails_cleanly(storage: FilesystemStorage, root: Path):
+    storage._uploads = Uploads(max_uploads=1)
+    first = storage.open_file_upload(str(root / "first.txt"))
+    storage.open_file_upload(str(root / "second.txt"))
+    assert len(temp_files(root)) == 1
+    with pytest.raises(InvalidStreamError):
+        storage.write_file_chunk(first.handle, "x")
+
+
+def test_discard_waits_for_the_chunk_being_written(
+    storage: FilesystemStorage, root: Path
+):
+    handle = storage.open_file_upload(str(root / "out.txt")).handle
+    upload = storage._uploads.get(handle)
+    with upload.lock:
+        discarding = threading.Thread(target=upload.discard)
+        discarding.start()
+        discarding.join(timeout=0.1)
+        assert discarding.is_alive()
+        assert temp_files(root) != []
+    discarding.join(timeout=5)
+    assert temp_files(root) == []
+    with pytest.raises(InvalidStreamError):
+        storage.write_file_chunk(handle, "x")
+
+
+def test_missing_temp_file_is_reported(storage: FilesystemStorage, root: Path):
+    handle = storage.open_file_upload(str(root / "out.txt")).handle
+    (root / temp_files(root)[0]).unlink()
+    with pytest.raises(InvalidStreamError):
+        storage.write_file_chunk(handle, "x")
+
+
+def test_close_removes_pending_uploads(root: Path):
+    storage = FilesystemStorage([str(root)])
+    for name in ("a.txt", "b.txt"):
+        storage.open_file_upload(str(root / name))
+    assert len(temp_files(root)) == 2
+    storage.close()
+    assert temp_files(root) == []
+
+
+def test_append_file(storage: FilesystemStorage, root: Path):
+    path = root / "sub" / "log.txt"
+    storage.append_file(str(path), "a")
+    storage.append_file(str(path), "ç")
+    assert path.read_text(encoding="utf-8") == "aç"
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+from typing import Dict, Union
+
+import pytest
+
+from mcp_filesystem.mcp.core.entities import TreeFile, TreeNode
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.usage import scan_usage
+from mcp_filesystem.utils.matcher import compile_patterns
+
+
+def children_by_name(node: TreeNode) -> Dict[str, Union[TreeNode, TreeFile]]:
+    assert node.children is not None
+    return {child.name: child for child in node.children}
+
+
+def subdirectory(node: TreeNode, name: str) -> TreeNode:
+    child = children_by_name(node)[name]
+    assert isinstance(child, TreeNode)
+    return child
+
+
+def leaf(node: TreeNode, name: str) -> TreeFile:
+    child = children_by_name(node)[name]
+    assert isinstance(child, TreeFile)
+    return child
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_scan_usage_sums_totals_bottom_up(root: Path, workers: int):
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a" / "one.txt").write_bytes(b"x" * 10)
+    (root / "a" / "b" / "two.txt").write_bytes(b"x" * 20)
+    (root / "three.txt").write_bytes(b"x" * 30)
+
+    scan = scan_usage(str(root), workers)
+    assert scan.root.size == 60
+    assert scan.root.files == 3
+    assert scan.root.directories == 2
+    (a,) = [c for c in scan.root.children if c.is_directory]
+    assert (a.size, a.files, a.directories) == (30, 2, 1)
+    assert not scan.truncated
+    assert not scan.errors
+
+
+def test_directory_tree_counts_hard_links_once(root: Path, storage: FilesystemStorage):
+    (root / "a").mkdir()
+    (root / "b").mkdir()
+    (root / "a" / "data.bin").write_bytes(b"x" * 100)
+    os.link(root / "a" / "data.bin", root / "b" / "data.bin")
+
+    tree = storage.directory_tree(str(root), max_depth=2, include_files=True)
+    assert tree.root.size == 100
+    assert tree.root.files == 1
+    assert tree.hardlinks_skipped == 1
+
+    leaves = [leaf(subdirectory(tree.root, d), "data.bin") for d in ("a", "b")]
+    assert [f.size for f in leaves] == [100, 100]
+    assert sorted(f.hardlink for f in leaves) == [False, True]
+
+
+def test_directory_tree_skips_excluded_entries(root: Path, storage: FilesystemStorage):
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "pkg" / "big.js").write_bytes(b"x" * 1000)
+    (root / "src").mkdir()
+    (root / "src" / "main.py").write_bytes(b"x" * 10)
+
+    tree = storage.directory_tree(
+        str(root), max_depth=2, include_files=True, exclude=["node_modules"]
+    )
+    assert set(children_by_name(tree.root)) == {"src"}
+    assert tree.root.size == 10
+    assert tree.root.directories == 1
+
+    scan = scan_usage(str(root), excluded=compile_patterns(["*.js"]))
+    assert scan.root.size == 10
+    assert scan.root.directories == 3
+
+
+def test_directory_tree_ranks_and_limits_children(
+    root: Path, storage: FilesystemStorage
+):
+    for i, size in enumerate([5, 50, 20, 1]):
+        (root / f"f{i}.txt").write_bytes(b"x" * size)
+
+    tree = storage.directory_tree(
+        str(root), max_depth=1, include_files=True, max_entries=2
+    )
+    assert tree.root.children is not None
+    assert [c.name for c in tree.root.children] == ["f1.txt", "f2.txt"]
+    assert tree.root.omitted == 2
+    assert tree.root.size == 76
+
+
+def test_directory_tree_stops_at_max_depth(root: Path, storage: FilesystemStorage):
+    (root / "a" / "b" / "c").mkdir(parents=True)
+    (root / "a" / "b" / "c" / "deep.txt").write_bytes(b"x" * 7)
+
+    tree = storage.directory_tree(str(root), max_depth=1)
+    a = subdirectory(tree.root, "a")
+    assert a.children is None
+    assert (a.size, a.files, a.directories) == (7, 1, 2)
+
+
+def test_scan_usage_times_out_as_truncated(root: Path):
+    for i in range(20):
+        (root / f"d{i}").mkdir()
+        (root / f"d{i}" / "f.txt").write_text("x")
+
+    scan = scan_usage(str(root), 2, timeout=0)
+    assert scan.truncated
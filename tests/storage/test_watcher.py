@@ -0,0 +1,62 @@
+import time
+from pathlib import Path
+from typing import List
+
+from mcp_filesystem.storage.events import ChangeNotifier, EventType, FileEvent
+from mcp_filesystem.storage.watcher import PollingWatcher, create_watcher
+
+
+def recorder(notifier: ChangeNotifier) -> List[FileEvent]:
+    events: List[FileEvent] = []
+    notifier.subscribe(events.append)
+    return events
+
+
+def test_notifier_survives_a_failing_subscriber():
+    notifier = ChangeNotifier()
+
+    def broken(event: FileEvent) -> None:
+        raise RuntimeError("boom")
+
+    notifier.subscribe(broken)
+    events = recorder(notifier)
+    notifier.publish(FileEvent(EventType.CREATED, "/x"))
+    assert [e.path for e in events] == ["/x"]
+
+
+def test_polling_watcher_reports_changes(root: Path):
+    (root / "kept.txt").write_text("a")
+    (root / "gone.txt").write_text("a")
+    notifier = ChangeNotifier()
+    events = recorder(notifier)
+    watcher = PollingWatcher([str(root)], notifier, interval=3600)
+    watcher.start()
+    try:
+        (root / "kept.txt").write_text("longer")
+        (root / "gone.txt").unlink()
+        (root / "sub").mkdir()
+        watcher.poll()
+    finally:
+        watcher.stop()
+    assert sorted((e.type, e.path, e.is_directory) for e in events) == [
+        (EventType.CREATED, str(root / "sub"), True),
+        (EventType.DELETED, str(root / "gone.txt"), False),
+        (EventType.MODIFIED, str(root / "kept.txt"), False),
+    ]
+
+
+def test_default_watcher_reports_new_files(root: Path):
+    notifier = ChangeNotifier()
+    events = recorder(notifier)
+    watcher = create_watcher([str(root)], notifier, poll_interval=0.05)
+    watcher.start()
+    try:
+        (root / "new.txt").write_text("x")
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if any(e.path == str(root / "new.txt") for e in events):
+                break
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+    assert any(e.path == str(root / "new.txt") for e in events)
@@ -0,0 +1,119 @@
+import os
+import stat
+import threading
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.storage import writer
+from mcp_filesystem.storage.filesystem_storage import FilesystemStorage
+from mcp_filesystem.storage.writer import AtomicWriter, Durability
+
+
+def leftovers(directory: Path):
+    return [p.name for p in directory.iterdir() if p.name.endswith(writer.TEMP_SUFFIX)]
+
+
+@pytest.mark.parametrize("durability", list(Durability))
+def test_write_replaces_the_file(tmp_path: Path, durability: Durability):
+    path = tmp_path / "f.txt"
+    path.write_text("old contents")
+    AtomicWriter(durability).write(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert leftovers(tmp_path) == []
+
+
+def test_write_keeps_permissions_and_symlinks(tmp_path: Path):
+    target = tmp_path / "target.txt"
+    target.write_text("old")
+    os.chmod(target, 0o640)
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+    AtomicWriter().write(str(link), b"new")
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+
+
+def test_failed_write_leaves_the_original(tmp_path: Path, monkeypatch):
+    path = tmp_path / "f.txt"
+    path.write_text("original")
+
+    def broken(fd: int, data: bytes) -> None:
+        os.write(fd, data[:1])
+        raise OSError("disk full")
+
+    monkeypatch.setattr(writer, "write_all", broken)
+    with pytest.raises(OSError, match="disk full"):
+        AtomicWriter().write(str(path), b"replacement")
+    assert path.read_text() == "original"
+    assert leftovers(tmp_path) == []
+
+
+def test_failed_rename_removes_the_temp_file(tmp_path: Path):
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "inside").write_text("x")
+    with pytest.raises(OSError):
+        AtomicWriter(Durability.DATA).write(str(tmp_path / "dir"), b"x")
+    assert leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize("durability", [Durability.DATA, Durability.FULL])
+def test_concurrent_synced_writes_share_groups(tmp_path: Path, durability: Durability):
+    atomic = AtomicWriter(durability)
+    count = 32
+    barrier = threading.Barrier(count)
+
+    def work(i: int) -> None:
+        barrier.wait()
+        atomic.write(str(tmp_path / f"{i}.txt"), str(i).encode())
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all((tmp_path / f"{i}.txt").read_text() == str(i) for i in range(count))
+    assert atomic.grouped_writes == count
+    assert 1 <= atomic.groups <= count
+    assert leftovers(tmp_path) == []
+
+
+def test_failed_flush_fails_only_its_write(tmp_path: Path, monkeypatch):
+    atomic = AtomicWriter(Durability.DATA)
+    group = []
+    for name in ("good.txt", "bad.txt"):
+        (tmp_path / name).write_text("old")
+        fd, temp_path, path = atomic.create_temp(str(tmp_path / name))
+        writer.write_all(fd, b"new")
+        group.append(writer._PendingWrite(fd, temp_path, path))
+    good, bad = group
+    synced = []
+
+    def flaky_sync(fd: int) -> None:
+        synced.append(fd)
+        if fd == bad.fd:
+            raise OSError("writeback failed")
+
+    monkeypatch.setattr(writer, "_fdatasync", flaky_sync)
+    atomic._flush_group(group)
+    assert synced == [good.fd, bad.fd]
+    assert good.error is None
+    assert isinstance(bad.error, OSError)
+    assert (tmp_path / "good.txt").read_text() == "new"
+    assert (tmp_path / "bad.txt").read_text() == "old"
+    assert leftovers(tmp_path) == []
+
+
+def test_append_creates_and_extends(tmp_path: Path):
+    path = tmp_path / "log.txt"
+    atomic = AtomicWriter(Durability.FULL)
+    assert atomic.append(str(path), b"a") is True
+    assert atomic.append(str(path), b"b") is False
+    assert path.read_bytes() == b"ab"
+
+
+def test_storage_write_file_is_atomic(storage: FilesystemStorage, root: Path):
+    storage.write_file(str(root / "f.txt"), "ção")
+    assert (root / "f.txt").read_text(encoding="utf-8") == "ção"
+    assert leftovers(root) == []
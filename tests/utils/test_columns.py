@@ -0,0 +1,65 @@
+import os
+
+from mcp_filesystem.mcp.core.entities import FileInfo
+from mcp_filesystem.utils.columns import (
+    LISTING_COLUMNS,
+    SEARCH_COLUMNS,
+    needs_stat,
+    resolve_columns,
+    to_columns,
+)
+
+
+def info(path: str, size: int = 0, is_directory: bool = False) -> FileInfo:
+    return FileInfo(
+        path=path,
+        name=os.path.basename(path),
+        size=size,
+        is_directory=is_directory,
+        created=1.0,
+        modified=2.0,
+        permissions="-rw-r--r--",
+    )
+
+
+def test_resolve_columns_defaults_and_names_only():
+    assert resolve_columns(None, LISTING_COLUMNS, False) == list(LISTING_COLUMNS)
+    assert resolve_columns(None, LISTING_COLUMNS, True) == ["name", "is_directory"]
+    assert resolve_columns([], SEARCH_COLUMNS, True) == ["path", "is_directory"]
+
+
+def test_resolve_columns_keeps_requested_order_without_repeats():
+    fields = ["size", "name", "size", "path"]
+    assert resolve_columns(fields, LISTING_COLUMNS, True) == ["size", "name", "path"]
+
+
+def test_needs_stat():
+    assert not needs_stat(["name", "path", "is_directory"])
+    for field in ("size", "created", "modified", "permissions"):
+        assert needs_stat(["name", field])
+
+
+def test_to_columns_builds_one_list_per_field():
+    entries = [info("/base/a.txt", 3), info("/base/sub", 0, True)]
+    columns = to_columns(entries, ["name", "size", "is_directory"], "/base")
+    assert columns == {
+        "name": ["a.txt", "sub"],
+        "size": [3, 0],
+        "is_directory": [False, True],
+    }
+
+
+def test_to_columns_makes_paths_relative_to_base():
+    entries = [
+        info("/base/a.txt"),
+        info("/base/sub/b.txt"),
+        info("/basement/c.txt"),
+        info("/other/d.txt"),
+    ]
+    columns = to_columns(entries, ["path"], "/base/")
+    assert columns["path"] == [
+        "a.txt",
+        os.path.join("sub", "b.txt"),
+        "/basement/c.txt",
+        "/other/d.txt",
+    ]
@@ -0,0 +1,112 @@
+import fnmatch
+import re
+
+import pytest
+
+from mcp_filesystem.utils.matcher import compile_patterns, glob_to_regex
+
+NAMES = [
+    "",
+    "a",
+    "main.py",
+    "main.pyc",
+    "MAIN.PY",
+    ".hidden",
+    "a.b.c",
+    "test_x.py",
+    "x]y",
+    "[abc]",
+    "a+b(c)",
+    "é.txt",
+    "file?.txt",
+    "back\\slash",
+    "line\nbreak",
+    "^caret",
+]
+
+PATTERNS = [
+    "*",
+    "*.py",
+    "*.PY",
+    "main.py",
+    "?ain.py",
+    "*.*.*",
+    ".*",
+    "test_*.py",
+    "[!m]*",
+    "[a-c]*",
+    "[]]*",
+    "x[]]y",
+    "[[]abc]",
+    "*[",
+    "a+b(c)",
+    "*.txt",
+    "file[?].txt",
+    "back\\slash",
+    "line*",
+    "*[!.]*",
+    "[\\]*",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_single_glob_matches_like_fnmatchcase(pattern: str):
+    matcher = compile_patterns([pattern])
+    for name in NAMES:
+        assert matcher(name) == fnmatch.fnmatchcase(name, pattern), name
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [["*.py", "*.txt"], ["main.py", "a"], ["*.py", "[a-c]*", "re:^MAIN"]],
+)
+def test_pattern_sets_match_any_pattern(patterns):
+    matcher = compile_patterns(patterns)
+    for name in NAMES:
+        expected = any(
+            (
+                re.search(p[3:], name)
+                if p.startswith("re:")
+                else fnmatch.fnmatchcase(name, p)
+            )
+            for p in patterns
+        )
+        assert matcher(name) == bool(expected), name
+
+
+def test_negations_exclude():
+    matcher = compile_patterns(["*.py", "!test_*"])
+    assert matcher("main.py")
+    assert not matcher("test_x.py")
+    assert compile_patterns(["!*.pyc"])("main.py")
+    assert not compile_patterns(["!*.pyc"])("main.pyc")
+
+
+def test_path_patterns_use_the_relative_path():
+    matcher = compile_patterns(["src/**/*.py"])
+    assert matcher.needs_path
+    assert matcher("a.py", "src/a.py")
+    assert matcher("a.py", "src/pkg/deep/a.py")
+    assert not matcher("a.py", "lib/a.py")
+    assert not compile_patterns(["src/*.py"])("a.py", "src/pkg/a.py")
+
+
+PATHS = ["foo.py", "a/foo.py", "a/b/foo.py", "a/xfoo.py", "a/b/c.txt", "a/b"]
+
+
+@pytest.mark.parametrize(
+    "patterns", [["*/foo.py"], ["*/foo.py", "*/c.txt"], ["*/b"], ["*/b", "*/foo.py"]]
+)
+def test_star_suffix_path_patterns_do_not_cross_slashes(patterns):
+    matcher = compile_patterns(patterns)
+    for path in PATHS:
+        name = path.rsplit("/", 1)[-1]
+        expected = any(re.fullmatch(glob_to_regex(p), path) for p in patterns)
+        assert matcher(name, path) == expected, path
+    assert matcher("foo.py", "a/foo.py") == ("*/foo.py" in patterns)
+    assert not matcher("foo.py", "a/b/foo.py")
+
+
+def test_invalid_regex_raises():
+    with pytest.raises(re.error):
+        compile_patterns(["re:("])
@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from mcp_filesystem.utils.path_validation import (
+    PathValidationError,
+    compile_roots,
+    validate_path,
+)
+
+
+@pytest.fixture
+def roots(tmp_path: Path):
+    for name in ("a", "ab", "a/nested", "other"):
+        (tmp_path / name).mkdir()
+    return [
+        str(tmp_path / "a"),
+        str(tmp_path / "a" / "nested"),
+        str(tmp_path / "other"),
+    ]
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_paths_inside_a_root_are_allowed(tmp_path: Path, roots, compiled: bool):
+    allowed = compile_roots(roots) if compiled else roots
+    for path in ("a", "a/x/y.txt", "a/nested/z", "other/", "ab/../a/f"):
+        assert validate_path(str(tmp_path / path), allowed) == os.path.abspath(
+            tmp_path / path
+        )
+
+
+def test_sibling_prefixes_and_traversal_are_rejected(tmp_path: Path, roots):
+    for path in ("ab", "ab/x", "a/../ab", "", "/"):
+        with pytest.raises(PathValidationError):
+            validate_path(str(tmp_path / path) if path else path, roots)
+    with pytest.raises(PathValidationError):
+        validate_path(str(tmp_path), roots)
+
+
+def test_relative_paths_follow_the_working_directory(
+    tmp_path: Path, roots, monkeypatch
+):
+    monkeypatch.chdir(tmp_path / "a")
+    assert validate_path("x.txt", roots) == str(tmp_path / "a" / "x.txt")
+    monkeypatch.chdir(tmp_path / "ab")
+    with pytest.raises(PathValidationError):
+        validate_path("x.txt", roots)
+
+
+def test_relative_roots_follow_the_working_directory(tmp_path: Path, monkeypatch):
+    (tmp_path / "one" / "data").mkdir(parents=True)
+    (tmp_path / "two").mkdir()
+    monkeypatch.chdir(tmp_path / "one")
+    assert validate_path(str(tmp_path / "one" / "data" / "f"), ["data"])
+    monkeypatch.chdir(tmp_path / "two")
+    with pytest.raises(PathValidationError):
+        validate_path(str(tmp_path / "one" / "data" / "f"), ["data"])